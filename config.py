@@ -216,8 +216,10 @@ PARALLEL_EXECUTION = True
 N_PROCESSES = cpu_count()
 
 # Format in which results are saved.
-# Result readers and writers are located in module ./icarus/results/readwrite.py
-# Currently only PICKLE is supported
+# Result readers and writers are located in modules
+# ./icarus/results/readwrite.py and ./icarus/results/columnar.py
+# Supported formats are PICKLE, LOG, NPZ and PARQUET (requires pyarrow).
+# NPZ and PARQUET store results in columns that can be read selectively
 RESULTS_FORMAT = 'PICKLE'
 
 # Number of times each experiment is replicated
@@ -26,8 +26,10 @@ N_PROCESSES = cpu_count()
 CACHING_GRANULARITY = 'OBJECT'
 
 # Format in which results are saved.
-# Result readers and writers are located in module ./icarus/results/readwrite.py
-# Currently only PICKLE is supported 
+# Result readers and writers are located in modules
+# ./icarus/results/readwrite.py and ./icarus/results/columnar.py
+# Supported formats are PICKLE, LOG, NPZ and PARQUET (requires pyarrow).
+# NPZ and PARQUET store results in columns that can be read selectively
 RESULTS_FORMAT = 'PICKLE'
 
 # Number of times each experiment is replicated
@@ -36,6 +38,24 @@ N_REPLICATIONS = 1
 M_REPLICATIONS = 8
 M_BEGIN = 0
 
+# If set, workloads are generated once, written to this directory and then
+# replayed from memory-mapped files by all experiments with the same topology
+# and workload parameters
+# WORKLOAD_CACHE_DIR = 'workloads'
+
+# Number of networks (topologies with caches and contents placed and their
+# shortest paths) kept in memory by each process and reused by the following
+# experiments on the same network. Set to 0 to rebuild them every time
+# SCENARIO_CACHE_SIZE = 4
+
+# If set, the simulation of each experiment is profiled and profiles are
+# written to PROFILE_DIR (default: profiles), named after the sequence number
+# and description of the experiment. Use CPROFILE for cProfile statistics or
+# SAMPLE for a low-overhead sampling profiler writing collapsed call stacks.
+# It can also be set from the command line with -c PROFILE=SAMPLE
+# PROFILE = 'SAMPLE'
+# PROFILE_DIR = 'profiles'
+
 # List of metrics to be measured in the experiments
 # The implementation of data collectors are located in ./icaurs/execution/collectors.py
 DATA_COLLECTORS = ['WEIGHT']
@@ -97,6 +117,8 @@ STRATEGIES = [
      'WLRU',
      'WLFU',
      'GRD',
+     # 'GDSF',
+     # 'WLRU-K',
 	 'NOCACHE',
 	 # 'PD',
              ]
@@ -189,6 +211,30 @@ CACHE_POLICY = {
 			 'n_measured': N_MEASURED_REQUESTS/10,
 		 }
 	 },
+    'GDSF': {
+         'strategy':{
+             'name':'GRD',
+         },
+		 'cache_policy':{
+			 'name':'GDSF',
+		 },
+		 'workload':{
+			 'n_warmup': N_WARMUP_REQUESTS/10,
+			 'n_measured': N_MEASURED_REQUESTS/10,
+		 }
+	 },
+    'WLRU-K': {
+         'strategy':{
+             'name':'GRD',
+         },
+		 'cache_policy':{
+			 'name':'WEIGHTED_LRU_K',
+		 },
+		 'workload':{
+			 'n_warmup': N_WARMUP_REQUESTS/10,
+			 'n_measured': N_MEASURED_REQUESTS/10,
+		 }
+	 },
 	'PD': {
 		 'strategy':{
 			 'name':'PD',
@@ -13,7 +13,7 @@ import pandas as pd
 
 from icarus.util import Settings, Tree, config_logging, step_cdf
 from icarus.tools import means_confidence_interval
-from icarus.results import plot_lines, plot_bar_chart
+from icarus.results import read_results_columns
 from icarus.registry import RESULTS_READER
 
 
@@ -47,17 +47,28 @@ def run(results):
 	plotdir : str
 		The directory into which graphs will be saved
 	"""
-	resultset = RESULTS_READER['PICKLE'](results)
-	data = pd.DataFrame()
-	for result in resultset:
-		param, res = result
-		one = {}
-		for k in res_paths['param']:
-			one[k]=[param.getval(res_paths['param'][k])]
-		for k in res_paths['res']:
-			one[k]=[res.getval(res_paths['res'][k])]
-		data = pd.DataFrame(one).append(data)
-		data.to_csv('multi_data.csv', index=0)
+	if results.endswith('.npz') or results.endswith('.parquet'):
+		# Columnar results: only read the required columns
+		columns = {}
+		for k, path in res_paths['param'].items():
+			columns[k] = '.'.join(('params',) + path)
+		for k, path in res_paths['res'].items():
+			columns[k] = '.'.join(('results',) + path)
+		data = read_results_columns(results, list(columns.values()))
+		data = pd.DataFrame({k: data[c][::-1] for k, c in columns.items()})
+	else:
+		resultset = RESULTS_READER['PICKLE'](results)
+		rows = []
+		for result in resultset:
+			param, res = result
+			one = {}
+			for k in res_paths['param']:
+				one[k] = param.getval(res_paths['param'][k])
+			for k in res_paths['res']:
+				one[k] = res.getval(res_paths['res'][k])
+			rows.append(one)
+		data = pd.DataFrame(rows[::-1])
+	data.to_csv('multi_data.csv', index=0)
 
 
 def main():
@@ -23,6 +23,7 @@ __modules_to_register = [
      'icarus.models.cache',
      'icarus.models.strategy',
      'icarus.execution.collectors',
+     'icarus.execution.profiling',
      'icarus.results.readwrite',
      'icarus.scenarios.topology',
      'icarus.scenarios.contentplacement',
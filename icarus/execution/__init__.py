@@ -3,3 +3,4 @@
 from .network import *
 from .collectors import *
 from .engine import *
+from .profiling import *
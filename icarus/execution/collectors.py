@@ -151,6 +151,27 @@ class DataCollector(object):
         """
         pass
 
+    def handles(self, event):
+        """Return whether the collector handles an event, i.e. whether it
+        overrides the method of `DataCollector` notifying it.
+
+        Parameters
+        ----------
+        event : str
+            The name of the method notifying the event, e.g. *request_hop*
+
+        Returns
+        -------
+        handles : bool
+            *True* if the collector handles the event, *False* otherwise
+        """
+        for cls in type(self).__mro__:
+            if cls is DataCollector:
+                return False
+            if event in cls.__dict__:
+                return True
+        return False
+
 # Note: The implementation of CollectorProxy could be improved to avoid having
 # to rewrite almost identical methods, for example by playing with __dict__
 # attribute. However, it was implemented this way to make it more readable and
@@ -178,7 +199,7 @@ class CollectorProxy(DataCollector):
             List of instances of DataCollector that will be notified of events
         """
         self.view = view
-        self.collectors = {e: [c for c in collectors if e in type(c).__dict__]
+        self.collectors = {e: [c for c in collectors if c.handles(e)]
                            for e in self.EVENTS}
 
     @inheritdoc(DataCollector)
@@ -220,6 +241,10 @@ class CollectorProxy(DataCollector):
     def results(self):
         return Tree(**{c.name: c.results() for c in self.collectors['results']})
 
+    @inheritdoc(DataCollector)
+    def handles(self, event):
+        return len(self.collectors[event]) > 0
+
 
 @register_data_collector('LINK_LOAD')
 class LinkLoadCollector(DataCollector):
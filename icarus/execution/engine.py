@@ -5,17 +5,32 @@ experiments needs to be run, instantiates all the required classes and executes
 the experiment by iterating through the event provided by an event generator
 and providing them to a strategy instance.
 """
+import os
+import gzip
+import pickle
+import random
+import logging
+import itertools
+
 from icarus.execution import NetworkModel, NetworkView, NetworkController, CollectorProxy
 from icarus.registry import DATA_COLLECTOR, STRATEGY
+from icarus.util import PhaseTimer
 
+import numpy as np
 import networkx as nx
 import fnss
 
 
 __all__ = ['exec_experiment',
 		   'exec_offline_experiment',
+		   'save_warmup_snapshot',
+		   'load_warmup_snapshot',
 		   ]
 
+
+logger = logging.getLogger('engine')
+
+
 def symmetrify_paths(shortest_paths):
 	"""Make paths symmetric
 
@@ -41,7 +56,73 @@ def symmetrify_paths(shortest_paths):
 			shortest_paths[u][v] = list(reversed(shortest_paths[v][u]))
 	return shortest_paths
 
-def exec_experiment(topology, workload, netconf, strategy, cache_policy, collectors):
+def save_warmup_snapshot(path, model, strategy):
+	"""Save the state of a network model and a strategy at the end of the
+	warmup phase.
+
+	The snapshot stores the caches of all nodes, including the metadata of
+	their replacement policies, all the attributes of the strategy except its
+	view and controller, and the state of the random number generators of the
+	`random` and `numpy.random` modules. The snapshot is written to a
+	temporary file first and then renamed, so that concurrent processes never
+	read a partially written snapshot.
+
+	Parameters
+	----------
+	path : str
+		The path of the snapshot file
+	model : NetworkModel
+		The network model
+	strategy : Strategy
+		The strategy instance
+
+	Returns
+	-------
+	saved : bool
+		*True* if the snapshot was saved, *False* if the state cannot be
+		serialized, e.g. because the caches are wrapped by functions such as
+		`ttl_cache` or `tinylfu_cache`
+	"""
+	state = {'cache': model.cache,
+			 'strategy': {k: v for k, v in vars(strategy).items()
+						  if k not in ('view', 'controller')},
+			 'random': random.getstate(),
+			 'np_random': np.random.get_state()}
+	try:
+		data = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+	except (pickle.PicklingError, AttributeError, TypeError) as e:
+		logger.warning('Cannot save warmup snapshot %s: %s', path, e)
+		return False
+	tmp_path = '%s.%d.tmp' % (path, os.getpid())
+	with gzip.open(tmp_path, 'wb', compresslevel=1) as f:
+		f.write(data)
+	os.rename(tmp_path, path)
+	return True
+
+def load_warmup_snapshot(path, model, strategy):
+	"""Restore the state of a network model and a strategy from a snapshot
+	saved by `save_warmup_snapshot`.
+
+	Parameters
+	----------
+	path : str
+		The path of the snapshot file
+	model : NetworkModel
+		The network model, which must have been built from the same topology
+		and cache policy of the model whose state was saved
+	strategy : Strategy
+		The strategy instance
+	"""
+	with gzip.open(path, 'rb') as f:
+		state = pickle.load(f)
+	model.cache.clear()
+	model.cache.update(state['cache'])
+	vars(strategy).update(state['strategy'])
+	random.setstate(state['random'])
+	np.random.set_state(state['np_random'])
+
+def exec_experiment(topology, workload, netconf, strategy, cache_policy,
+					collectors, warmup_snapshot=None, timer=None):
 	"""Execute the simulation of a specific scenario.
 
 	Parameters
@@ -66,37 +147,84 @@ def exec_experiment(topology, workload, netconf, strategy, cache_policy, collect
 		The collectors to be used. It is a dictionary in which keys are the
 		names of collectors to use and values are dictionaries of attributes
 		for the collector they refer to.
+	warmup_snapshot : str, optional
+		Path of a warmup snapshot file. If the file exists, the state of the
+		caches and of the strategy is loaded from it and the warmup events
+		of the workload are skipped. Otherwise, the state reached at the end
+		of the warmup phase is saved to it. It requires the workload to have
+		a *n_warmup* attribute.
+	timer : PhaseTimer, optional
+		Timer measuring the setup of the network and strategy (*SETUP*), the
+		warmup phase (*WARMUP*), if the workload has a *n_warmup* attribute,
+		and the rest of the workload (*MEASURED*)
 
 	Returns
 	-------
 	results : Tree
 		A tree with the aggregated simulation results from all collectors
+
+	Notes
+	-----
+	Warmup events are still drawn from the workload when loading a snapshot,
+	so that the measured events are the same as if the warmup phase had been
+	simulated. They are only not processed by the strategy, and are counted
+	as *SKIPPED_EVENTS* rather than *EVENTS* of the warmup phase.
 	"""
-	model = NetworkModel(topology, cache_policy, **netconf)
-	view = NetworkView(model)
-	controller = NetworkController(model)
+	if timer is None:
+		timer = PhaseTimer()
+	with timer.phase('SETUP'):
+		model = NetworkModel(topology, cache_policy, **netconf)
+		view = NetworkView(model)
+		controller = NetworkController(model)
 
-	collectors_inst = [DATA_COLLECTOR[name](view, **params)
-					   for name, params in collectors.items()]
-	collector = CollectorProxy(view, collectors_inst)
-	controller.attach_collector(collector)
+		collectors_inst = [DATA_COLLECTOR[name](view, **params)
+						   for name, params in collectors.items()]
+		collector = CollectorProxy(view, collectors_inst)
+		controller.attach_collector(collector)
 
-	strategy_name = strategy['name']
-	strategy_args = {k: v for k, v in strategy.items() if k != 'name'}
-	strategy_inst = STRATEGY[strategy_name](view, controller, **strategy_args)
+		strategy_name = strategy['name']
+		strategy_args = {k: v for k, v in strategy.items() if k != 'name'}
+		strategy_inst = STRATEGY[strategy_name](view, controller, **strategy_args)
 
-	for time, event in workload:
-		strategy_inst.process_event(time, **event)
+	# Unlogged events at the beginning of the workload only need to warm up
+	# caches, so they are processed without notifying collectors
+	controller.start_warmup()
+	events = iter(workload)
+	n_warmup = getattr(workload, 'n_warmup', None)
+	if warmup_snapshot is not None and n_warmup is None:
+		logger.warning('Workload %s has no warmup phase, ignoring warmup '
+					   'snapshot', type(workload).__name__)
+	elif n_warmup is not None:
+		warmup = itertools.islice(events, int(n_warmup))
+		with timer.phase('WARMUP') as phase:
+			if warmup_snapshot is not None and os.path.isfile(warmup_snapshot):
+				phase['SKIPPED_EVENTS'] = sum(1 for _ in warmup)
+				load_warmup_snapshot(warmup_snapshot, model, strategy_inst)
+			else:
+				phase['EVENTS'] = _process_events(strategy_inst, warmup)
+				if warmup_snapshot is not None:
+					save_warmup_snapshot(warmup_snapshot, model, strategy_inst)
+	with timer.phase('MEASURED') as phase:
+		phase['EVENTS'] = _process_events(strategy_inst, events)
 	return collector.results()
 
+def _process_events(strategy, events):
+	"""Process a sequence of events with a strategy and return their number"""
+	n = 0
+	for n, (time, event) in enumerate(events, 1):
+		strategy.process_event(time, **event)
+	return n
+
 def exec_offline_experiment(topology, workload, netconf, strategy, ):
 	# Filter inputs
 	if not isinstance(topology, fnss.Topology):
 		raise ValueError('The topology argument must be an instance of '
 						 'fnss.Topology or any of its subclasses.')
 
-	# Shortest paths of the network
-	shortest_path = symmetrify_paths(nx.all_pairs_dijkstra_path(topology))
+	# Shortest paths of the network, unless already computed
+	shortest_path = netconf.get('shortest_path')
+	if shortest_path is None:
+		shortest_path = symmetrify_paths(nx.all_pairs_dijkstra_path(topology))
 	content_source = {}
 	# Dictionary mapping the reverse, i.e. nodes to set of contents stored
 	source_node = {}
@@ -123,7 +251,7 @@ def exec_offline_experiment(topology, workload, netconf, strategy, ):
 			if cache_size[node] < 1:
 				cache_size[node] = 1
 
-	popularity = workload.get_popularity_all()
+	popularity = dict(zip(workload.receivers, workload.get_popularity_matrix()))
 
 	strategy_name = strategy['name']
 	strategy_inst = STRATEGY[strategy_name](shortest_path, link_weight, cache_size, workload.contents, content_source, popularity)
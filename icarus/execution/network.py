@@ -13,6 +13,7 @@ The `NetworkController` is also responsible to notify a `DataCollectorProxy`
 of all relevant events.
 """
 import logging
+from array import array
 
 import networkx as nx
 import fnss
@@ -54,6 +55,66 @@ def symmetrify_paths(shortest_paths):
 	return shortest_paths
 
 
+class Route(object):
+	"""Precompiled route between two nodes
+
+	A route stores, along with the nodes of a shortest path, everything that
+	on-path strategies need to know about them, so that a request or a
+	content can be forwarded over it without looking up paths, link weights
+	and caches hop by hop.
+
+	Attributes
+	----------
+	nodes : tuple
+		The nodes of the path, origin and destination included
+	hops : tuple
+		The *(u, v, i)* hops from the origin to the destination, where *i* is
+		the position of *v* in *nodes*
+	return_hops : tuple
+		The *(u, v, i)* hops from the destination back to the origin
+	cache_mask : tuple
+		Whether the node at each position of *nodes* has a cache, as booleans
+	cache_positions : array
+		The positions of *nodes* having a cache, in increasing order
+	return_weight : array
+		The weight accumulated by a content delivered from the destination to
+		the node at each position of *nodes* over the return hops, or *None* if
+		some links on the path have no weight
+	"""
+
+	__slots__ = ['nodes', 'hops', 'return_hops', 'cache_mask',
+				 'cache_positions', 'return_weight']
+
+	def __init__(self, path, cache, link_weight):
+		"""Constructor
+
+		Parameters
+		----------
+		path : list
+			List of nodes of the path
+		cache : dict
+			Dictionary keyed by nodes having a cache
+		link_weight : dict
+			Dictionary of link weights keyed by *(u, v)* tuples
+		"""
+		n = len(path)
+		self.nodes = tuple(path)
+		self.hops = tuple((path[i - 1], path[i], i) for i in range(1, n))
+		self.return_hops = tuple((path[i + 1], path[i], i)
+								 for i in range(n - 2, -1, -1))
+		self.cache_mask = tuple(v in cache for v in path)
+		self.cache_positions = array('l', (i for i in range(n)
+											if path[i] in cache))
+		if all((u, v) in link_weight for u, v, _ in self.return_hops):
+			self.return_weight = array('d', [0]) * n
+			weight = 0
+			for u, v, i in self.return_hops:
+				weight += link_weight[(u, v)]
+				self.return_weight[i] = weight
+		else:
+			self.return_weight = None
+
+
 class NetworkView(object):
 	"""Network view
 
@@ -131,6 +192,33 @@ class NetworkView(object):
 		"""
 		return self.model.shortest_path[s][t]
 
+	def route(self, s, t):
+		"""Return the precompiled route from *s* to *t*
+
+		The route follows the shortest path from *s* to *t*. Routes are
+		compiled the first time they are requested and reused until the
+		network controller changes paths or caches.
+
+		Parameters
+		----------
+		s : any hashable type
+			Origin node
+		t : any hashable type
+			Destination node
+
+		Returns
+		-------
+		route : Route
+			The route from *s* to *t*
+		"""
+		try:
+			return self.model.route[(s, t)]
+		except KeyError:
+			route = Route(self.model.shortest_path[s][t], self.model.cache,
+						  self.model.link_weight)
+			self.model.route[(s, t)] = route
+			return route
+
 	def all_pairs_shortest_paths(self):
 		"""Return all pairs shortest paths
 
@@ -343,7 +431,8 @@ class NetworkModel(object):
 	calls to the network controller.
 	"""
 
-	def __init__(self, topology, cache_policy, shortest_path=None):
+	def __init__(self, topology, cache_policy, shortest_path=None,
+				 shared_topology=False):
 		"""Constructor
 
 		Parameters
@@ -356,6 +445,9 @@ class NetworkModel(object):
 			policy
 		shortest_path : dict of dict, optional
 			The all-pair shortest paths of the network
+		shared_topology : bool, optional
+			If True, the topology is shared with other network models and is
+			copied before being modified
 		"""
 		# Filter inputs
 		if not isinstance(topology, fnss.Topology):
@@ -368,6 +460,7 @@ class NetworkModel(object):
 
 		# Network topology
 		self.topology = topology
+		self.shared_topology = shared_topology
 
 		# Dictionary mapping each content object to its source
 		# dict of location of contents keyed by content ID
@@ -424,6 +517,10 @@ class NetworkModel(object):
 		# Hashrouting with edge cache)
 		self.local_cache = {}
 
+		# Routes compiled so far, keyed by (origin, destination). They must
+		# be discarded whenever paths, link weights or caches change
+		self.route = {}
+
 		# Keep track of nodes and links removed to simulate failures
 		self.removed_nodes = {}
 		# This keeps track of neighbors of a removed node at the time of removal.
@@ -436,6 +533,27 @@ class NetworkModel(object):
 		self.removed_caches = {}
 		self.removed_local_caches = {}
 
+	def own_topology(self):
+		"""Replace a shared topology with a private copy of it, so that it
+		can be modified without affecting other network models
+		"""
+		if self.shared_topology:
+			self.topology = self.topology.copy()
+			self.shared_topology = False
+
+
+# Methods of NetworkController which may be overridden on the instance, in
+# warmup mode or when no collector handles the events they report
+_FAST_METHODS = ('start_session', 'end_session', 'forward_request_hop',
+				 'forward_content_hop', 'forward_request_path',
+				 'forward_content_path', 'get_content', 'has_content',
+				 'put_content')
+
+
+def _noop(*args, **kwargs):
+	"""Do nothing. Replaces controller methods with no events to report"""
+	pass
+
 
 class NetworkController(object):
 	"""Network controller
@@ -456,20 +574,116 @@ class NetworkController(object):
 		self.session = None
 		self.model = model
 		self.collector = None
+		self._bind_methods()
+
+	def _content_methods(self):
+		"""Return versions of the `get_content`, `has_content` and
+		`put_content` methods operating directly on caches, without
+		reporting any event"""
+		cache = self.model.cache
+		content_source = self.model.content_source
+
+		def get_content(node):
+			content = self.session['content']
+			if node in cache:
+				return cache[node].get(content)
+			return content_source.get(content) == node
+
+		def has_content(node):
+			content = self.session['content']
+			if node in cache:
+				return cache[node].has(content)
+			return content_source.get(content) == node
+
+		def put_content(node, **kwargs):
+			if node in cache:
+				return cache[node].put(self.session['content'], **kwargs)
+
+		return get_content, has_content, put_content
+
+	def _bind_methods(self):
+		"""Replace the methods reporting only events that the attached
+		collector does not handle with faster versions not reporting them"""
+		for name in _FAST_METHODS:
+			self.__dict__.pop(name, None)
+		collector = self.collector
+		if collector is None or not collector.handles('request_hop'):
+			self.forward_request_hop = _noop
+			self.forward_request_path = _noop
+		if collector is None or not collector.handles('content_hop'):
+			self.forward_content_hop = _noop
+			self.forward_content_path = _noop
+		if collector is None or not any(collector.handles(e) for e in
+										('cache_hit', 'cache_miss', 'server_hit')):
+			self.get_content, self.has_content, self.put_content = \
+				self._content_methods()
+
+	def start_warmup(self):
+		"""Switch the controller to warmup mode.
+
+		In warmup mode no events are reported to the collector, methods
+		forwarding requests and contents are no-ops and methods accessing
+		contents operate directly on caches, so that processing an event only
+		drives the caches. The session is reused across events instead of
+		being reallocated. The controller switches back to the normal mode by
+		itself at the start of the first session which needs to be logged, or
+		when `end_warmup` is called.
+		"""
+		if self.warmup:
+			return
+		session = dict(timestamp=None, receiver=None, content=None, log=False)
+
+		def start_session(timestamp, receiver, content, log):
+			if log:
+				self.end_warmup()
+				self.start_session(timestamp, receiver, content, log)
+				return
+			session['timestamp'] = timestamp
+			session['receiver'] = receiver
+			session['content'] = content
+			self.session = session
+
+		self.start_session = start_session
+		self.end_session = _noop
+		self.forward_request_hop = _noop
+		self.forward_content_hop = _noop
+		self.forward_request_path = _noop
+		self.forward_content_path = _noop
+		self.get_content, self.has_content, self.put_content = \
+			self._content_methods()
+
+	def end_warmup(self):
+		"""Switch the controller back from warmup mode to normal mode, if
+		in warmup mode."""
+		if self.warmup:
+			self._bind_methods()
+			self.session = None
+
+	@property
+	def warmup(self):
+		"""*True* if the controller is in warmup mode, *False* otherwise"""
+		return 'start_session' in self.__dict__
 
 	def attach_collector(self, collector):
 		"""Attach a data collector to which all events will be reported.
 
+		Methods reporting only events that the collector does not handle
+		become no-ops or skip reporting them.
+
 		Parameters
 		----------
 		collector : DataCollector
 			The data collector
 		"""
 		self.collector = collector
+		if not self.warmup:
+			self._bind_methods()
 
 	def detach_collector(self):
 		"""Detach the data collector."""
 		self.collector = None
+		if not self.warmup:
+			self._bind_methods()
 
 	def start_session(self, timestamp, receiver, content, log):
 		"""Instruct the controller to start a new session (i.e. the retrieval
@@ -700,9 +914,11 @@ class NetworkController(object):
 		up, vp : any hashable type
 			Endpoints of link after rewiring
 		"""
+		self.model.own_topology()
 		link = self.model.topology.edge[u][v]
 		self.model.topology.remove_edge(u, v)
 		self.model.topology.add_edge(up, vp, **link)
+		self.model.route.clear()
 		if recompute_paths:
 			shortest_path = nx.all_pairs_dijkstra_path(self.model.topology)
 			self.model.shortest_path = symmetrify_paths(shortest_path)
@@ -729,8 +945,10 @@ class NetworkController(object):
 		recompute_paths: bool, optional
 			If True, recompute all shortest paths
 		"""
+		self.model.own_topology()
 		self.model.removed_links[(u, v)] = self.model.topology.edge[u][v]
 		self.model.topology.remove_edge(u, v)
+		self.model.route.clear()
 		if recompute_paths:
 			shortest_path = nx.all_pairs_dijkstra_path(self.model.topology)
 			self.model.shortest_path = symmetrify_paths(shortest_path)
@@ -747,7 +965,9 @@ class NetworkController(object):
 		recompute_paths: bool, optional
 			If True, recompute all shortest paths
 		"""
+		self.model.own_topology()
 		self.model.topology.add_edge(u, v, **self.model.removed_links.pop((u, v)))
+		self.model.route.clear()
 		if recompute_paths:
 			shortest_path = nx.all_pairs_dijkstra_path(self.model.topology)
 			self.model.shortest_path = symmetrify_paths(shortest_path)
@@ -785,6 +1005,7 @@ class NetworkController(object):
 		recompute_paths: bool, optional
 			If True, recompute all shortest paths
 		"""
+		self.model.own_topology()
 		self.model.removed_nodes[v] = self.model.topology.node[v]
 		# First need to remove all links the removed node as endpoint
 		neighbors = self.model.topology.edge[v]
@@ -800,6 +1021,7 @@ class NetworkController(object):
 			self.model.removed_sources[v] = self.model.source_node.pop(v)
 			for content in self.model.removed_sources[v]:
 				self.model.countent_source.pop(content)
+		self.model.route.clear()
 		if recompute_paths:
 			shortest_path = nx.all_pairs_dijkstra_path(self.model.topology)
 			self.model.shortest_path = symmetrify_paths(shortest_path)
@@ -814,6 +1036,7 @@ class NetworkController(object):
 		recompute_paths: bool, optional
 			If True, recompute all shortest paths
 		"""
+		self.model.own_topology()
 		self.model.topology.add_node(v, **self.model.removed_nodes.pop(v))
 		for u in self.model.disconnected_neighbors[v]:
 			if (v, u) in self.model.removed_links:
@@ -827,6 +1050,7 @@ class NetworkController(object):
 			self.model.source_node[v] = self.model.removed_sources.pop(v)
 			for content in self.model.source_node[v]:
 				self.model.countent_source[content] = v
+		self.model.route.clear()
 		if recompute_paths:
 			shortest_path = nx.all_pairs_dijkstra_path(self.model.topology)
 			self.model.shortest_path = symmetrify_paths(shortest_path)
@@ -861,6 +1085,7 @@ class NetworkController(object):
 			local_maxlen = iround(c.maxlen * (ratio))
 			if local_maxlen > 0:
 				self.model.local_cache[v] = type(c)(local_maxlen)
+		self.model.route.clear()
 
 	def get_content_local_cache(self, node):
 		"""Get content from local cache of node (if any)
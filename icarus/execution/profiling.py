@@ -0,0 +1,132 @@
+"""Profilers of the execution of experiments.
+
+A profiler records where the time of an experiment is spent between calls to
+its *start* and *stop* methods and writes its records to a file with the
+*write* method. Profilers are selected by the *PROFILE* setting.
+"""
+import os
+import signal
+import cProfile
+import collections
+
+from icarus.registry import register_profiler
+
+
+__all__ = [
+	'CProfiler',
+	'SamplingProfiler',
+		   ]
+
+
+@register_profiler('CPROFILE')
+class CProfiler(object):
+	"""Deterministic profiler based on cProfile.
+
+	It records every function call and writes its statistics in the *pstats*
+	format, which can be read with the pstats module or with tools such as
+	snakeviz. It can slow down the experiment considerably.
+	"""
+
+	extension = '.pstats'
+
+	def __init__(self):
+		"""Constructor"""
+		self.profile = cProfile.Profile()
+
+	def start(self):
+		"""Start profiling"""
+		self.profile.enable()
+
+	def stop(self):
+		"""Stop profiling"""
+		self.profile.disable()
+
+	def write(self, path):
+		"""Write the statistics recorded
+
+		Parameters
+		----------
+		path : str
+			The path of the file to write, without extension
+
+		Returns
+		-------
+		path : str
+			The path of the file written
+		"""
+		path += self.extension
+		self.profile.dump_stats(path)
+		return path
+
+
+@register_profiler('SAMPLE')
+class SamplingProfiler(object):
+	"""Statistical profiler sampling the call stack at regular intervals of
+	CPU time.
+
+	Samples are triggered by the SIGPROF signal, so its overhead is small and
+	independent of the number of function calls, but it can only run in the
+	main thread of a process and on platforms supporting interval timers,
+	i.e. not on Windows. Samples are written in the collapsed stack format,
+	with one line per distinct call stack followed by its number of samples,
+	which can be rendered with flame graph tools such as flamegraph.pl or
+	speedscope.
+	"""
+
+	extension = '.collapsed'
+
+	def __init__(self, interval=0.005):
+		"""Constructor
+
+		Parameters
+		----------
+		interval : float, optional
+			The CPU time between two samples, in seconds
+		"""
+		if not hasattr(signal, 'setitimer'):
+			raise ValueError('The sampling profiler is not supported on this '
+							 'platform')
+		self.interval = interval
+		self.stacks = collections.Counter()
+		self._handler = None
+
+	def _sample(self, signum, frame):
+		"""Record the call stack of the interrupted frame"""
+		stack = []
+		while frame is not None:
+			code = frame.f_code
+			stack.append('%s (%s:%d)' % (code.co_name,
+										 os.path.basename(code.co_filename),
+										 code.co_firstlineno))
+			frame = frame.f_back
+		self.stacks[';'.join(reversed(stack))] += 1
+
+	def start(self):
+		"""Start profiling"""
+		self._handler = signal.signal(signal.SIGPROF, self._sample)
+		signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+	def stop(self):
+		"""Stop profiling"""
+		signal.setitimer(signal.ITIMER_PROF, 0, 0)
+		signal.signal(signal.SIGPROF, self._handler if self._handler is not None
+					  else signal.SIG_DFL)
+
+	def write(self, path):
+		"""Write the samples recorded
+
+		Parameters
+		----------
+		path : str
+			The path of the file to write, without extension
+
+		Returns
+		-------
+		path : str
+			The path of the file written
+		"""
+		path += self.extension
+		with open(path, 'w') as f:
+			for stack, count in sorted(self.stacks.items()):
+				f.write('%s %d\n' % (stack, count))
+		return path
@@ -236,3 +236,23 @@ class TestCacheHitRatioCollector(unittest.TestCase):
 
         res = c.results()
         self.assertEqual({1: 0.5, 2: 0.25}, res['PER_CONTENT'])
+
+
+class TestCollectorProxy(unittest.TestCase):
+
+    def test_subscriptions(self):
+        class LatencySubclass(collectors.LatencyCollector):
+            pass
+        view = object()
+        hop = collectors.RequestHopCollector(view)
+        latency = LatencySubclass(view)
+        self.assertTrue(hop.handles('content_hop'))
+        self.assertFalse(hop.handles('request_hop'))
+        self.assertTrue(latency.handles('request_hop'))
+        self.assertFalse(latency.handles('cache_hit'))
+        proxy = collectors.CollectorProxy(view, [hop, latency])
+        self.assertEqual([hop, latency], proxy.collectors['content_hop'])
+        self.assertEqual([latency], proxy.collectors['request_hop'])
+        self.assertTrue(proxy.handles('request_hop'))
+        self.assertFalse(proxy.handles('cache_hit'))
+        self.assertFalse(proxy.handles('server_hit'))
@@ -0,0 +1,99 @@
+from __future__ import division
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+import networkx as nx
+import fnss
+
+from icarus.scenarios import IcnTopology
+from icarus.execution import exec_experiment
+from icarus.util import PhaseTimer
+
+
+class RandomWorkload(object):
+    """Minimal workload drawing events from the global random generator"""
+
+    def __init__(self, contents, n_warmup, n_measured):
+        self.contents = contents
+        self.n_warmup = n_warmup
+        self.n_measured = n_measured
+
+    def __iter__(self):
+        for i in range(self.n_warmup + self.n_measured):
+            yield i, {'receiver': 0, 'content': random.choice(self.contents),
+                      'log': i >= self.n_warmup}
+
+
+class TestWarmupSnapshot(unittest.TestCase):
+
+    @classmethod
+    def build_topology(cls):
+        topology = IcnTopology()
+        topology.add_path([0, 1, 2, 3, 4])
+        nx.set_edge_attributes(topology, 'util',
+                               {e: 10 * (i + 1) for i, e in enumerate(topology.edges())})
+        fnss.add_stack(topology, 4, 'source', {'contents': list(range(20))})
+        fnss.add_stack(topology, 0, 'receiver', {})
+        for v in (1, 2, 3):
+            fnss.add_stack(topology, v, 'router', {'cache_size': 3})
+        return topology
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.snapshot = os.path.join(self.tmp_dir, 'warmup.pkl.gz')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def run_experiment(self, warmup_snapshot=None):
+        random.seed(1)
+        workload = RandomWorkload(list(range(20)), 200, 300)
+        return exec_experiment(self.build_topology(), workload, {},
+                               {'name': 'Q', 'alpha': 0.5}, {'name': 'LRU'},
+                               {'CACHE_HIT_RATIO': {}, 'WEIGHT': {}},
+                               warmup_snapshot=warmup_snapshot)
+
+    def test_save_load(self):
+        expected = self.run_experiment()
+        saved = self.run_experiment(self.snapshot)
+        self.assertTrue(os.path.isfile(self.snapshot))
+        loaded = self.run_experiment(self.snapshot)
+        self.assertEqual(expected, saved)
+        self.assertEqual(expected, loaded)
+
+    def test_timer(self):
+        random.seed(1)
+        timer = PhaseTimer()
+        workload = RandomWorkload(list(range(20)), 200, 300)
+        exec_experiment(self.build_topology(), workload, {}, {'name': 'LCE'},
+                        {'name': 'LRU'}, {'CACHE_HIT_RATIO': {}}, timer=timer)
+        results = timer.results()
+        self.assertEqual(['SETUP', 'WARMUP', 'MEASURED'],
+                         [k for k in results.keys() if k != 'PROCESS_PEAK_RSS'])
+        self.assertEqual(200, results['WARMUP']['EVENTS'])
+        self.assertEqual(300, results['MEASURED']['EVENTS'])
+
+    def test_timer_snapshot(self):
+        self.run_experiment(self.snapshot)
+        random.seed(1)
+        timer = PhaseTimer()
+        workload = RandomWorkload(list(range(20)), 200, 300)
+        exec_experiment(self.build_topology(), workload, {},
+                        {'name': 'Q', 'alpha': 0.5}, {'name': 'LRU'},
+                        {'CACHE_HIT_RATIO': {}}, warmup_snapshot=self.snapshot,
+                        timer=timer)
+        results = timer.results()
+        self.assertNotIn('EVENTS', results['WARMUP'])
+        self.assertEqual(200, results['WARMUP']['SKIPPED_EVENTS'])
+        self.assertEqual(300, results['MEASURED']['EVENTS'])
+
+    def test_unpicklable_cache(self):
+        random.seed(1)
+        workload = RandomWorkload(list(range(20)), 200, 300)
+        exec_experiment(self.build_topology(), workload, {},
+                        {'name': 'LCE'}, {'name': 'TINY_LFU'},
+                        {'CACHE_HIT_RATIO': {}}, warmup_snapshot=self.snapshot)
+        self.assertFalse(os.path.isfile(self.snapshot))
@@ -4,7 +4,8 @@ import unittest
 import fnss
 
 from icarus.scenarios import IcnTopology
-from icarus.execution.collectors import DummyCollector
+from icarus.execution.collectors import DummyCollector, CollectorProxy, \
+    RequestHopCollector
 
 import icarus.execution.network as network
 
@@ -91,6 +92,19 @@ class TestNetworkMVC(unittest.TestCase):
         self.assertEqual([0, 1, 2, 3, 4], self.view.shortest_path(0, 4))
         self.assertEqual(1, self.view.cache_nodes(size=True)[2])
 
+    def test_remove_link_shared_topology(self):
+        model = network.NetworkModel(self.topology, cache_policy={'name': 'FIFO'},
+                                     shared_topology=True)
+        view = network.NetworkView(model)
+        controller = network.NetworkController(model)
+        controller.remove_link(2, 3, recompute_paths=True)
+        self.assertEqual([0, 1, 5, 6, 7, 8, 3, 4], view.shortest_path(0, 4))
+        self.assertIsNot(self.topology, view.topology())
+        self.assertTrue(self.topology.has_edge(2, 3))
+        self.assertFalse(view.topology().has_edge(2, 3))
+        controller.restore_link(2, 3, recompute_paths=True)
+        self.assertEqual([0, 1, 2, 3, 4], view.shortest_path(0, 4))
+
     def test_joint_remove_restore_node_link(self):
         self.assertEqual([0, 1, 2, 3, 4], self.view.shortest_path(0, 4))
         self.controller.remove_link(2, 3, recompute_paths=True)
@@ -113,3 +127,71 @@ class TestNetworkMVC(unittest.TestCase):
         self.controller.rewire_link(1, 3, 1, 5, recompute_paths=True)
         self.assertEqual([0, 1, 2, 3, 4], self.view.shortest_path(0, 4))
         self.assertEqual(1, self.topology.edge[2][3]['a'])
+
+    def test_route(self):
+        route = self.view.route(0, 4)
+        self.assertEqual((0, 1, 2, 3, 4), route.nodes)
+        self.assertEqual(((0, 1, 1), (1, 2, 2), (2, 3, 3), (3, 4, 4)),
+                         route.hops)
+        self.assertEqual(((4, 3, 3), (3, 2, 2), (2, 1, 1), (1, 0, 0)),
+                         route.return_hops)
+        self.assertEqual((False, True, True, True, False), route.cache_mask)
+        self.assertEqual([1, 2, 3], list(route.cache_positions))
+        self.assertIsNone(route.return_weight)
+        self.assertIs(route, self.view.route(0, 4))
+
+    def test_route_weight(self):
+        self.view.model.link_weight.update({(u, v): 10 * (u + v)
+                                            for u in range(5) for v in range(5)})
+        route = self.view.route(4, 0)
+        self.assertEqual([160, 90, 40, 10, 0], list(route.return_weight))
+
+    def test_route_remove_restore_node(self):
+        self.assertEqual((0, 1, 2, 3, 4), self.view.route(0, 4).nodes)
+        self.controller.remove_node(2, recompute_paths=True)
+        self.assertEqual((0, 1, 5, 6, 7, 8, 3, 4), self.view.route(0, 4).nodes)
+        self.controller.restore_node(2, recompute_paths=True)
+        self.assertEqual((0, 1, 2, 3, 4), self.view.route(0, 4).nodes)
+        self.assertEqual([1, 2, 3], list(self.view.route(0, 4).cache_positions))
+
+    def test_warmup(self):
+        self.controller.start_warmup()
+        self.assertTrue(self.controller.warmup)
+        self.controller.start_session(1, 0, 3, False)
+        self.controller.forward_request_hop(0, 1)
+        self.assertFalse(self.controller.get_content(1))
+        self.assertTrue(self.controller.get_content(4))
+        self.controller.forward_content_hop(1, 0)
+        self.controller.put_content(1)
+        self.controller.end_session()
+        self.assertFalse(hasattr(self.collector, 'session'))
+        self.assertTrue(self.view.cache_lookup(1, 3))
+        # The first logged session switches back to normal mode
+        self.controller.start_session(2, 0, 3, True)
+        self.assertFalse(self.controller.warmup)
+        self.controller.forward_request_hop(0, 1)
+        self.assertTrue(self.controller.get_content(1))
+        self.assertEqual([(0, 1)], self.collector.session['request_hops'])
+        self.assertEqual(1, self.collector.session['serving_node'])
+        self.controller.end_session()
+
+    def test_unhandled_events(self):
+        view = self.view
+        view.model.link_weight[(4, 3)] = 1
+        proxy = CollectorProxy(view, [RequestHopCollector(view)])
+        self.controller.attach_collector(proxy)
+        self.assertIn('forward_request_hop', self.controller.__dict__)
+        self.assertIn('get_content', self.controller.__dict__)
+        self.assertNotIn('forward_content_hop', self.controller.__dict__)
+        self.controller.start_session(1, 0, 3, True)
+        self.controller.forward_request_hop(0, 1)
+        self.assertFalse(self.controller.get_content(1))
+        self.assertTrue(self.controller.get_content(4))
+        self.controller.forward_content_hop(4, 3)
+        self.controller.put_content(3)
+        self.controller.end_session()
+        self.assertTrue(self.view.cache_lookup(3, 3))
+        self.assertEqual(1, proxy.results()['WEIGHT']['ALL'])
+        self.controller.attach_collector(self.collector)
+        self.assertNotIn('forward_request_hop', self.controller.__dict__)
+        self.assertNotIn('get_content', self.controller.__dict__)
@@ -0,0 +1,48 @@
+import os
+import pstats
+import shutil
+import signal
+import tempfile
+import unittest
+
+from icarus.execution import CProfiler, SamplingProfiler
+
+
+def busy(n):
+    return sum(i * i for i in range(n))
+
+
+class TestProfilers(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, '1-experiment')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_cprofile(self):
+        profiler = CProfiler()
+        profiler.start()
+        busy(1000)
+        profiler.stop()
+        path = profiler.write(self.path)
+        self.assertEqual(self.path + '.pstats', path)
+        stats = pstats.Stats(path)
+        self.assertTrue(any(func[2] == 'busy' for func in stats.stats))
+
+    @unittest.skipIf(not hasattr(signal, 'setitimer'),
+                     "Interval timers not supported")
+    def test_sample(self):
+        profiler = SamplingProfiler(interval=0.001)
+        profiler.start()
+        busy(10**6)
+        profiler.stop()
+        path = profiler.write(self.path)
+        self.assertEqual(self.path + '.collapsed', path)
+        with open(path) as f:
+            lines = f.read().splitlines()
+        self.assertGreater(len(lines), 0)
+        stack, count = lines[0].rsplit(' ', 1)
+        self.assertGreater(int(count), 0)
+        self.assertTrue(any('busy (test_profiling.py' in line for line in lines))
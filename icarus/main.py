@@ -7,9 +7,9 @@ configuration file.
 
 Usage:
 
-  icarus run -r RESULTS [-c CONFIG_OVERRIDE] [-v] config
+  icarus run -r RESULTS [-c CONFIG_OVERRIDE] [--resume] [-v] config
   icarus results print [--json] RESULTS
-  icarus results merge -o OUTPUT INPUT_1 ... INPUT_N
+  icarus results merge [-f FORMAT] -o OUTPUT INPUT_1 ... INPUT_N
 
 """
 import click
@@ -32,11 +32,12 @@ def main():
 @main.command(context_settings=CONTEXT_SETTINGS)
 @click.option('--results', '-r', required=True, help='The file on which results will be saved')
 @click.option('--config-override', '-c', multiple=True, help='Override specific key=value parameter of configuration file')
+@click.option('--resume', is_flag=True, help='Resume an interrupted run, skipping experiments already completed')
 @click.argument('config', nargs=1, required=True)
-def run(results, config_override, config):
+def run(results, config_override, resume, config):
     """Run a set of simulations."""
     config_override = dict(c.split("=") for c in config_override) or None
-    icarus.run(config, results, config_override)
+    icarus.run(config, results, config_override, resume)
 
 @main.group(context_settings=CONTEXT_SETTINGS)
 def results():
@@ -45,10 +46,23 @@ def results():
 
 @results.command('merge', context_settings=CONTEXT_SETTINGS)
 @click.option('--output', '-o', nargs=1, required=True, help='The output file')
+@click.option('--format', '-f', 'results_format', default='PICKLE', help='The format of input and output files')
 @click.argument('inputs', nargs=-1, required=True)
-def merge_results(output, inputs):
+def merge_results(output, results_format, inputs):
     """Merge multiple results files into one."""
-    write(sum((read(i) for i in inputs[1:]), read(inputs[0])), output)
+    if results_format == 'NPZ':
+        icarus.results.merge_results_npz(inputs, output)
+        return
+    read_format = icarus.registry.RESULTS_READER[results_format]
+    rs = read_format(inputs[0])
+    for i in inputs[1:]:
+        rs_i = read_format(i)
+        if rs_i.attr != rs.attr:
+            raise ValueError('The resultsets cannot be merged because '
+                             'they have different global attributes')
+        for params, results in rs_i:
+            rs.add(params, results)
+    icarus.registry.RESULTS_WRITER[results_format](rs, output)
 
 @results.command('print', context_settings=CONTEXT_SETTINGS)
 @click.option('--json', '-j', is_flag=True, help='Print results in JSON format')
@@ -9,18 +9,22 @@ import random
 import abc
 import copy
 import math
+import heapq
+from array import array
 
 import numpy as np
 
 from icarus.util import inheritdoc, apportionment
-from icarus.registry import register_cache_policy
+from icarus.registry import register_cache_policy, CACHE_POLICY
 
 
 __all__ = [
 		'LinkedSet',
+		'ArrayLinkedSet',
 		'Cache',
 		'NullCache',
 		'BeladyMinCache',
+		'WeightedBeladyMinCache',
 		'LruCache',
 		'SegmentedLruCache',
 		'InCacheLfuCache',
@@ -30,12 +34,19 @@ __all__ = [
 		'RandEvictionCache',
 		'insert_after_k_hits_cache',
 		'rand_insert_cache',
+		'tinylfu_cache',
 		'keyval_cache',
 		'ttl_cache',
-		'GreedyCache'
+		'GreedyCache',
+		'GreedyDualSizeFrequencyCache',
+		'WeightedLruKCache'
 		   ]
 
 
+# Integer types of items which can be used as array indices, e.g. contents
+_INT_TYPES = (int, np.integer)
+
+
 class LinkedSet(object):
 	"""A doubly-linked set, i.e., a set whose entries are ordered and stored
 	as a doubly-linked list.
@@ -49,6 +60,7 @@ class LinkedSet(object):
 	"""
 	class _Node(object):
 		"""Class implementing a node of the linked list"""
+		__slots__ = ('val', 'up', 'down')
 
 		def __init__(self, val, up=None, down=None):
 			"""Constructor
@@ -451,6 +463,331 @@ class LinkedSet(object):
 		self._map.clear()
 
 
+class _IntKeyTable(object):
+	"""Table mapping items to non-negative integer values, e.g. counters.
+
+	Values of items identified by non-negative integers, which is the case of
+	contents of all the workloads generated by Icarus, are stored in a
+	contiguous array indexed by item, with a memory footprint of one machine
+	word per item. Values of all other items are stored in a dictionary.
+	Items never assigned a value map to 0.
+	"""
+
+	# Largest integer item stored in the array. Larger items are stored in the
+	# dictionary to prevent allocating arrays of unreasonable size
+	MAX_ARRAY_KEY = 2 ** 24
+
+	def __init__(self):
+		"""Constructor"""
+		self._array = array('l')
+		self._dict = {}
+
+	def __getitem__(self, k):
+		if isinstance(k, _INT_TYPES) and 0 <= k < len(self._array):
+			return self._array[k]
+		return self._dict.get(k, 0)
+
+	def __setitem__(self, k, v):
+		if isinstance(k, _INT_TYPES) and 0 <= k <= self.MAX_ARRAY_KEY:
+			a = self._array
+			if k >= len(a):
+				a.extend([0] * (max(k + 1, 2 * len(a)) - len(a)))
+			a[k] = v
+		else:
+			self._dict[k] = v
+
+	def __delitem__(self, k):
+		if isinstance(k, _INT_TYPES) and 0 <= k < len(self._array):
+			self._array[k] = 0
+		else:
+			self._dict.pop(k, None)
+
+	def clear(self):
+		"""Reset all values to 0"""
+		self._array = array('l')
+		self._dict.clear()
+
+
+class ArrayLinkedSet(LinkedSet):
+	"""A doubly-linked set whose links are stored in contiguous arrays.
+
+	This class provides the same interface and time complexity of
+	`LinkedSet` but, instead of allocating a node object per item, it assigns
+	each item a slot and stores the links to the slots above and below it in
+	two preallocated arrays of machine words. Items are mapped to their slot
+	by a table which, for items identified by non-negative integers (i.e. the
+	contents of all workloads generated by Icarus), is itself an array.
+	Slots of removed items are reused by later insertions.
+
+	This makes the memory footprint per item several times smaller than the
+	one of `LinkedSet`, which makes a difference when simulating large caches
+	at many nodes, at the cost of allocating a table as large as the greatest
+	integer item stored.
+	"""
+
+	def __init__(self, iterable=[], capacity=0):
+		"""Constructor
+
+		Parameters
+		----------
+		iterable : iterable type
+			An iterable type to inizialize the data structure.
+			It must contain only one instance of each element
+		capacity : int, optional
+			The number of slots to preallocate, e.g. the size of the cache.
+			More slots are allocated if needed.
+		"""
+		capacity = int(capacity)
+		self._val = [None] * capacity
+		self._up = array('l', [-1]) * capacity
+		self._down = array('l', [-1]) * capacity
+		# Map item -> slot + 1, with 0 meaning that the item is not in the set
+		self._slot = _IntKeyTable()
+		self._free = list(range(capacity - 1, -1, -1))
+		self._top = -1
+		self._bottom = -1
+		self._len = 0
+		if iterable:
+			if len(set(iterable)) < len(iterable):
+				raise ValueError('The iterable parameter contains repeated '
+								 'elements')
+			for i in iterable:
+				self.append_bottom(i)
+
+	@inheritdoc(LinkedSet)
+	def __len__(self):
+		return self._len
+
+	@inheritdoc(LinkedSet)
+	def __iter__(self):
+		val = self._val
+		down = self._down
+		cur = self._top
+		while cur >= 0:
+			yield val[cur]
+			cur = down[cur]
+
+	@inheritdoc(LinkedSet)
+	def __reversed__(self):
+		val = self._val
+		up = self._up
+		cur = self._bottom
+		while cur >= 0:
+			yield val[cur]
+			cur = up[cur]
+
+	@inheritdoc(LinkedSet)
+	def __contains__(self, k):
+		a = self._slot._array
+		if type(k) is int and 0 <= k < len(a):
+			return a[k] != 0
+		return self._slot[k] != 0
+
+	@property
+	@inheritdoc(LinkedSet)
+	def top(self):
+		return self._val[self._top] if self._top >= 0 else None
+
+	@property
+	@inheritdoc(LinkedSet)
+	def bottom(self):
+		return self._val[self._bottom] if self._bottom >= 0 else None
+
+	def _get_slot(self, k):
+		"""Return the slot of an item, raising KeyError if not in the set"""
+		a = self._slot._array
+		s = (a[k] if type(k) is int and 0 <= k < len(a) else self._slot[k]) - 1
+		if s < 0:
+			raise KeyError('Item %s not in the set' % str(k))
+		return s
+
+	def _new_slot(self, k):
+		"""Assign a free slot to a new item and return it"""
+		if k in self:
+			raise KeyError('Item %s already in the set' % str(k))
+		if self._free:
+			s = self._free.pop()
+			self._val[s] = k
+		else:
+			s = len(self._val)
+			self._val.append(k)
+			self._up.append(-1)
+			self._down.append(-1)
+		a = self._slot._array
+		if type(k) is int and 0 <= k < len(a):
+			a[k] = s + 1
+		else:
+			self._slot[k] = s + 1
+		self._len += 1
+		return s
+
+	def _release_slot(self, s):
+		"""Free the slot of an item, which must be already unlinked, and
+		return the item"""
+		k = self._val[s]
+		self._val[s] = None
+		a = self._slot._array
+		if type(k) is int and 0 <= k < len(a):
+			a[k] = 0
+		else:
+			del self._slot[k]
+		self._free.append(s)
+		self._len -= 1
+		return k
+
+	def _link(self, s, up, down):
+		"""Link a slot between two slots, with -1 denoting the ends"""
+		self._up[s] = up
+		self._down[s] = down
+		if up >= 0:
+			self._down[up] = s
+		else:
+			self._top = s
+		if down >= 0:
+			self._up[down] = s
+		else:
+			self._bottom = s
+
+	def _unlink(self, s):
+		"""Unlink a slot from its neighbours"""
+		up = self._up[s]
+		down = self._down[s]
+		if up >= 0:
+			self._down[up] = down
+		else:
+			self._top = down
+		if down >= 0:
+			self._up[down] = up
+		else:
+			self._bottom = up
+
+	@inheritdoc(LinkedSet)
+	def pop_top(self):
+		if self._top < 0:
+			return None
+		s = self._top
+		self._unlink(s)
+		return self._release_slot(s)
+
+	@inheritdoc(LinkedSet)
+	def pop_bottom(self):
+		s = self._bottom
+		if s < 0:
+			return None
+		up = self._up[s]
+		if up >= 0:
+			self._down[up] = -1
+		else:
+			self._top = -1
+		self._bottom = up
+		return self._release_slot(s)
+
+	@inheritdoc(LinkedSet)
+	def append_top(self, k):
+		s = self._new_slot(k)
+		top = self._top
+		self._up[s] = -1
+		self._down[s] = top
+		if top >= 0:
+			self._up[top] = s
+		else:
+			self._bottom = s
+		self._top = s
+
+	@inheritdoc(LinkedSet)
+	def append_bottom(self, k):
+		self._link(self._new_slot(k), self._bottom, -1)
+
+	@inheritdoc(LinkedSet)
+	def move_up(self, k):
+		s = self._get_slot(k)
+		up = self._up[s]
+		if up < 0:  # already on top or there is only one element
+			return
+		self._unlink(s)
+		self._link(s, self._up[up], up)
+
+	@inheritdoc(LinkedSet)
+	def move_down(self, k):
+		s = self._get_slot(k)
+		down = self._down[s]
+		if down < 0:  # already at the bottom or there is only one element
+			return
+		self._unlink(s)
+		self._link(s, down, self._down[down])
+
+	@inheritdoc(LinkedSet)
+	def move_to_top(self, k):
+		# This is the most frequent operation of LRU caches, hence links are
+		# updated inline rather than calling _unlink and _link
+		s = self._get_slot(k)
+		up_links = self._up
+		down_links = self._down
+		up = up_links[s]
+		if up < 0:  # already on top or there is only one element
+			return
+		down = down_links[s]
+		down_links[up] = down
+		if down >= 0:
+			up_links[down] = up
+		else:
+			self._bottom = up
+		up_links[s] = -1
+		down_links[s] = self._top
+		up_links[self._top] = s
+		self._top = s
+
+	@inheritdoc(LinkedSet)
+	def move_to_bottom(self, k):
+		s = self._get_slot(k)
+		if self._down[s] < 0:  # already at bottom or there is only one element
+			return
+		self._unlink(s)
+		self._link(s, self._bottom, -1)
+
+	@inheritdoc(LinkedSet)
+	def insert_above(self, i, k):
+		if k in self:
+			raise KeyError('Item %s already in the set' % str(k))
+		t = self._get_slot(i)
+		self._link(self._new_slot(k), self._up[t], t)
+
+	@inheritdoc(LinkedSet)
+	def insert_below(self, i, k):
+		if k in self:
+			raise KeyError('Item %s already in the set' % str(k))
+		t = self._get_slot(i)
+		self._link(self._new_slot(k), t, self._down[t])
+
+	@inheritdoc(LinkedSet)
+	def index(self, k):
+		s = self._get_slot(k)
+		index = 0
+		cur = self._top
+		while cur != s:
+			cur = self._down[cur]
+			index += 1
+		return index
+
+	@inheritdoc(LinkedSet)
+	def remove(self, k):
+		s = self._get_slot(k)
+		self._unlink(s)
+		self._release_slot(s)
+
+	@inheritdoc(LinkedSet)
+	def clear(self):
+		capacity = len(self._val)
+		self._val = [None] * capacity
+		self._up = array('l', [-1]) * capacity
+		self._down = array('l', [-1]) * capacity
+		self._slot.clear()
+		self._free = list(range(capacity - 1, -1, -1))
+		self._top = -1
+		self._bottom = -1
+		self._len = 0
+
+
 class Cache(object):
 	"""Base implementation of a cache object"""
 
@@ -611,6 +948,81 @@ class Cache(object):
 		"""
 		raise NotImplementedError('This method is not implemented')
 
+	def process_batch(self, keys, weights=None, times=None):
+		"""Process a batch of requests, in order.
+
+		Each item is looked up in the cache with *get* and, in case of a
+		miss, inserted with *put*, i.e. the cache serves the requests as a
+		cache placed in front of a server would. This is equivalent to
+		calling these methods in a loop, but subclasses can override it to
+		amortise the per-request overhead of replaying long traces.
+
+		Parameters
+		----------
+		keys : array-like
+			The items requested
+		weights : array-like, optional
+			The weight of each request, passed as *weight* argument to *get*
+			and *put*
+		times : array-like, optional
+			The time of each request, passed as *t* argument to *get* and
+			*put*
+
+		Returns
+		-------
+		hits : ndarray
+			Boolean array whose entries are *True* if the corresponding
+			request was a hit
+		evicted : ndarray
+			Array of objects containing the item evicted by each request or
+			*None* if no contents were evicted.
+		"""
+		keys, weights, times = _batch_args(keys, weights, times)
+		hits = [False] * len(keys)
+		evicted = [None] * len(keys)
+		get = self.get
+		put = self.put
+		for i, k in enumerate(keys):
+			kwargs = {}
+			if weights is not None:
+				kwargs['weight'] = weights[i]
+			if times is not None:
+				kwargs['t'] = times[i]
+			if get(k, **kwargs):
+				hits[i] = True
+			else:
+				evicted[i] = put(k, **kwargs)
+		return _batch_result(hits, evicted)
+
+
+def _batch_args(keys, weights=None, times=None):
+	"""Validate the arguments of *Cache.process_batch* and convert them to
+	lists, which are faster to iterate over than NumPy arrays"""
+	keys = keys.tolist() if isinstance(keys, np.ndarray) else list(keys)
+	if weights is not None:
+		weights = np.asarray(weights, dtype=np.float64).tolist()
+		if len(weights) != len(keys):
+			raise ValueError('weights must have the same length as keys')
+	if times is not None:
+		times = np.asarray(times, dtype=np.float64).tolist()
+		if len(times) != len(keys):
+			raise ValueError('times must have the same length as keys')
+	return keys, weights, times
+
+
+def _batch_result(hits, evicted):
+	"""Convert the lists of hits and evicted items of a batch to arrays"""
+	evicted_array = np.empty(len(evicted), dtype=object)
+	evicted_array[:] = evicted
+	return np.array(hits, dtype=bool), evicted_array
+
+
+def _is_wrapped(cache):
+	"""Return whether the *get* or *put* methods of a cache instance have been
+	replaced, e.g. by *insert_after_k_hits_cache*, in which case they must be
+	called by *process_batch*"""
+	return 'get' in cache.__dict__ or 'put' in cache.__dict__
+
 
 @register_cache_policy('NULL')
 class NullCache(Cache):
@@ -738,6 +1150,41 @@ class NullCache(Cache):
 	def clear(self):
 		pass
 
+def _next_use_positions(trace):
+	"""Return the position of the next request for the same item of each
+	request of a trace.
+
+	Parameters
+	----------
+	trace : iterable
+		Trace of requests
+
+	Returns
+	-------
+	next_use : array
+		Array whose i-th element is the position of the first request after
+		position i for the item requested at position i, or the length of the
+		trace if that item is not requested again
+	"""
+	if not isinstance(trace, np.ndarray):
+		trace = list(trace)
+	n = len(trace)
+	next_use = np.full(n, n, dtype=np.int32 if n < 2 ** 31 - 1 else np.int64)
+	if n == 0:
+		return next_use
+	keys = np.asarray(trace)
+	if keys.ndim != 1 or keys.dtype.kind not in 'iub':
+		# Generic items are mapped to integer identifiers first
+		index = {}
+		keys = np.fromiter((index.setdefault(k, len(index)) for k in trace),
+						   dtype=np.int64, count=n)
+	# A stable sort groups requests for the same item by increasing position
+	order = np.argsort(keys, kind='mergesort')
+	same = keys[order[:-1]] == keys[order[1:]]
+	next_use[order[:-1][same]] = order[1:][same]
+	return next_use
+
+
 @register_cache_policy('MIN')
 class BeladyMinCache(Cache):
 	"""Belady's MIN cache replacement policy
@@ -749,6 +1196,13 @@ class BeladyMinCache(Cache):
 	This policy is not implementable in practice because it requires knowledge
 	of future requests, however it is very useful as a theoretical performance
 	upper bound.
+
+	The position of the next request of each request of the trace is computed
+	once at construction time and stored in an array. Items in cache are kept
+	in a max-heap keyed by the position of their next request, so that each
+	request is processed in *O(log n)* time. Items must be requested with
+	*get* in the same order as they appear in the trace and may only be
+	inserted right after being requested.
 	"""
 
 	@inheritdoc(Cache)
@@ -765,12 +1219,18 @@ class BeladyMinCache(Cache):
 		self._maxlen = int(maxlen)
 		if self._maxlen <= 0:
 			raise ValueError('maxlen must be positive')
-		self._next = defaultdict(deque)
-		for i, k in enumerate(trace):
-			self._next[k].append(i)
-		for k in self._next.values():
-			k.append(np.infty)
+		self._next_use = _next_use_positions(trace)
+		# Position in the trace of the next request to process
+		self._pos = 0
+		# Item last requested and position of its next request
+		self._last = None
+		self._last_next = None
+		# Dict mapping items in cache to (next request, insertion order)
 		self._cache = {}
+		# Max-heap of (-next request, insertion order, item) entries. Entries
+		# made stale by a hit are discarded lazily
+		self._heap = []
+		self._seq = 0
 
 	@inheritdoc(Cache)
 	def __len__(self):
@@ -791,21 +1251,68 @@ class BeladyMinCache(Cache):
 
 	@inheritdoc(Cache)
 	def get(self, k, *args, **kwargs):
-		self._next[k].popleft()
-		return k in self._cache
+		nxt = self._next_use.item(self._pos)
+		self._pos += 1
+		self._last = k
+		self._last_next = nxt
+		if k not in self._cache:
+			return False
+		seq = self._cache[k][1]
+		self._cache[k] = (nxt, seq)
+		self._push(k, nxt, seq)
+		return True
 
 	def put(self, k, *args, **kwargs):
-		if len(self) < self.maxlen:
-			self._cache[k] = self._next[k]
+		"""Insert an item in the cache if not already inserted.
+
+		The item is inserted only if the cache is not full or if it will be
+		requested again before the item of the cache requested next the
+		latest, which is evicted.
+
+		Parameters
+		----------
+		k : any hashable type
+			The item to be inserted. It must be the item last requested
+
+		Returns
+		-------
+		evicted : any hashable type
+			The evicted object or *None* if no contents were evicted.
+		"""
+		if k in self._cache:
+			return None
+		if k != self._last:
+			raise ValueError('Item %s can only be inserted right after being '
+							 'requested' % str(k))
+		nxt = self._last_next
+		if len(self._cache) < self._maxlen:
+			self._insert(k, nxt)
 			return None
-		next_cache = max(self._cache, key=lambda k: self._cache[k][0])
-		if self._next[k][0] < self._next[next_cache][0]:
-			self._cache.pop(next_cache)
-			self._cache[k] = self._next[k]
-			return next_cache
+		heap = self._heap
+		while self._cache.get(heap[0][2]) != (-heap[0][0], heap[0][1]):
+			heapq.heappop(heap)
+		if nxt < -heap[0][0]:
+			evicted = heapq.heappop(heap)[2]
+			del self._cache[evicted]
+			self._insert(k, nxt)
+			return evicted
 		else:
 			return None
 
+	def _insert(self, k, nxt):
+		"""Insert an item in the cache"""
+		self._seq += 1
+		self._cache[k] = (nxt, self._seq)
+		self._push(k, nxt, self._seq)
+
+	def _push(self, k, nxt, seq):
+		"""Push an entry in the heap, compacting it if most entries are
+		stale"""
+		heapq.heappush(self._heap, (-nxt, seq, k))
+		if len(self._heap) > 2 * len(self._cache) + 64:
+			self._heap = [(-nxt, seq, k) for k, (nxt, seq) in self._cache.items()]
+			heapq.heapify(self._heap)
+
 	@inheritdoc(Cache)
 	def remove(self, k, *args, **kwargs):
 		if k not in self._cache:
@@ -816,6 +1323,119 @@ class BeladyMinCache(Cache):
 	@inheritdoc(Cache)
 	def clear(self):
 		self._cache.clear()
+		self._heap = []
+
+
+@register_cache_policy('WEIGHTED_MIN')
+class WeightedBeladyMinCache(BeladyMinCache):
+	"""Cost-aware variant of Belady's MIN cache replacement policy
+
+	This offline policy is a cost-aware heuristic approximating the optimal
+	offline replacement when misses have heterogeneous costs, e.g. the weight
+	of the path between a cache and the node serving a request in case of a
+	miss. It is not optimal, so the weight it saves is not an upper bound of
+	the weight saved by online policies. Each request of the trace is
+	associated with a weight, i.e. the cost saved if it is served by this
+	cache.
+
+	Each time an item is inserted into a full cache, it evicts the item with
+	the lowest ratio *w / d*, where *w* is the weight of the next request for
+	that item and *d* is the distance in the trace to that request, i.e. the
+	item saving the least cost per unit of time it occupies the cache. Items
+	never requested again are always evicted first. With uniform weights,
+	this policy is equivalent to Belady's MIN.
+
+	Computing the optimal offline eviction schedule for heterogeneous costs
+	requires solving a min-cost flow problem, which is not viable for traces
+	of millions of requests, hence this heuristic. Since the ratio of an item
+	only increases as time passes, items are kept in a min-heap keyed by the
+	ratio computed at their last evaluation, which is a lower bound of the
+	current one. When evicting, only the entries reaching the top of the heap
+	are evaluated again. The same constraints of
+	`BeladyMinCache` on the order of *get* and *put* operations apply.
+	"""
+
+	def __init__(self, maxlen, trace, weights, **kwargs):
+		"""Constructor
+
+		Parameters
+		----------
+		maxlen : int
+			The maximum number of items the cache can store
+		trace : iterable
+			Trace of requests that the cache will be subject to
+		weights : array-like
+			Weight of each request of the trace, i.e. cost saved if that
+			request is a cache hit
+		"""
+		super(WeightedBeladyMinCache, self).__init__(maxlen, trace, **kwargs)
+		self._weights = np.asarray(weights, dtype=np.float64)
+		if self._weights.shape != self._next_use.shape:
+			raise ValueError('weights must have the same length as trace')
+		if np.any(self._weights < 0):
+			raise ValueError('weights must be non-negative')
+
+	def _ratio(self, nxt):
+		"""Return the ratio between weight and distance of the next request
+		at a given position, evaluated at the current position of the trace"""
+		if nxt >= len(self._next_use):
+			return 0.0
+		return self._weights.item(nxt) / (nxt - self._pos + 1)
+
+	def put(self, k, *args, **kwargs):
+		"""Insert an item in the cache if not already inserted.
+
+		The item is inserted only if the cache is not full or if its ratio of
+		weight to distance of the next request is greater than the lowest one
+		of the items in the cache, which is evicted.
+
+		Parameters
+		----------
+		k : any hashable type
+			The item to be inserted. It must be the item last requested
+
+		Returns
+		-------
+		evicted : any hashable type
+			The evicted object or *None* if no contents were evicted.
+		"""
+		if k in self._cache:
+			return None
+		if k != self._last:
+			raise ValueError('Item %s can only be inserted right after being '
+							 'requested' % str(k))
+		nxt = self._last_next
+		if len(self._cache) < self._maxlen:
+			self._insert(k, nxt)
+			return None
+		heap = self._heap
+		while True:
+			key, seq, c = heap[0]
+			if self._cache.get(c) != (key[1], seq):
+				heapq.heappop(heap)
+				continue
+			ratio = self._ratio(key[1])
+			if ratio > key[0]:
+				# Stale lower bound, evaluate again
+				heapq.heapreplace(heap, ((ratio, key[1]), seq, c))
+				continue
+			break
+		if self._ratio(nxt) > key[0]:
+			heapq.heappop(heap)
+			del self._cache[c]
+			self._insert(k, nxt)
+			return c
+		else:
+			return None
+
+	def _push(self, k, nxt, seq):
+		"""Push an entry in the heap, compacting it if most entries are
+		stale"""
+		heapq.heappush(self._heap, ((self._ratio(nxt), nxt), seq, k))
+		if len(self._heap) > 2 * len(self._cache) + 64:
+			self._heap = [((self._ratio(nxt), nxt), seq, k)
+						  for k, (nxt, seq) in self._cache.items()]
+			heapq.heapify(self._heap)
 
 
 @register_cache_policy('LRU')
@@ -833,9 +1453,19 @@ class LruCache(Cache):
 	item is requested is not dependent on previous requests).
 	"""
 
-	@inheritdoc(Cache)
-	def __init__(self, maxlen, **kwargs):
-		self._cache = LinkedSet()
+	def __init__(self, maxlen, array_backed=False, **kwargs):
+		"""Constructor
+
+		Parameters
+		----------
+		maxlen : int
+			The maximum number of items the cache can store
+		array_backed : bool, optional
+			If *True*, store the items in an `ArrayLinkedSet`, which has a
+			smaller memory footprint if items are integers
+		"""
+		self._cache = ArrayLinkedSet(capacity=int(maxlen)) if array_backed \
+					  else LinkedSet()
 		self._maxlen = int(maxlen)
 		if self._maxlen <= 0:
 			raise ValueError('maxlen must be positive')
@@ -912,6 +1542,39 @@ class LruCache(Cache):
 		self._cache.append_top(k)
 		return self._cache.pop_bottom() if len(self._cache) > self._maxlen else None
 
+	@inheritdoc(Cache)
+	def process_batch(self, keys, weights=None, times=None):
+		if _is_wrapped(self):
+			return Cache.process_batch(self, keys, weights, times)
+		keys = _batch_args(keys, weights, times)[0]
+		hits = [False] * len(keys)
+		evicted = [None] * len(keys)
+		cache = self._cache
+		move_to_top = cache.move_to_top
+		append_top = cache.append_top
+		pop_bottom = cache.pop_bottom
+		maxlen = self._maxlen
+		for i, k in enumerate(keys):
+			if k in cache:
+				move_to_top(k)
+				hits[i] = True
+			else:
+				append_top(k)
+				if len(cache) > maxlen:
+					evicted[i] = pop_bottom()
+		return _batch_result(hits, evicted)
+
+	def _victim(self):
+		"""Return the item that would be evicted if a new item was inserted,
+		without changing the internal state of the cache
+
+		Returns
+		-------
+		victim : any hashable type
+			The item to be evicted or *None* if the cache is not full
+		"""
+		return self._cache.bottom if len(self._cache) >= self._maxlen else None
+
 	@inheritdoc(Cache)
 	def remove(self, k, *args, **kwargs):
 		if k not in self._cache:
@@ -941,7 +1604,8 @@ class SegmentedLruCache(Cache):
 	and recency of item reference.
 	"""
 
-	def __init__(self, maxlen, segments=2, alloc=None, *args, **kwargs):
+	def __init__(self, maxlen, segments=2, alloc=None, array_backed=False,
+				 *args, **kwargs):
 		"""Constructor
 
 		Parameters
@@ -953,6 +1617,9 @@ class SegmentedLruCache(Cache):
 		alloc : list
 			List of floats, summing to 1. Indicates the fraction of overall
 			caching space to be allocated to each segment.
+		array_backed : bool, optional
+			If *True*, store the items of each segment in an `ArrayLinkedSet`,
+			which has a smaller memory footprint if items are integers
 		"""
 		self._maxlen = int(maxlen)
 		if self._maxlen <= 0:
@@ -967,7 +1634,8 @@ class SegmentedLruCache(Cache):
 		else:
 			alloc = [1 / segments for _ in range(segments)]
 		self._segment_maxlen = apportionment(maxlen, alloc)
-		self._segment = [LinkedSet() for _ in range(segments)]
+		self._segment = [ArrayLinkedSet(capacity=int(l)) if array_backed
+						 else LinkedSet() for l in self._segment_maxlen]
 		# This map is a dictionary mapping each item in the cache with the
 		# segment in which it is located. This is not strictly necessary to
 		# locate an item as we could have used the map in each segment.
@@ -1044,6 +1712,19 @@ class SegmentedLruCache(Cache):
 			self._cache.pop(evicted)
 			return evicted
 
+	def _victim(self):
+		"""Return the item that would be evicted if a new item was inserted,
+		without changing the internal state of the cache
+
+		Returns
+		-------
+		victim : any hashable type
+			The item to be evicted or *None* if the cache is not full
+		"""
+		if len(self._segment[-1]) < self._segment_maxlen[-1]:
+			return None
+		return self._segment[-1].bottom
+
 	@inheritdoc(Cache)
 	def remove(self, k, *args, **kwargs):
 		if k not in self._cache:
@@ -1169,6 +1850,22 @@ class InCacheLfuCache(Cache):
 
 
 
+class _FreqBucket(object):
+	"""Bucket of a frequency-bucket list, storing all items requested the
+	same number of times. Items are kept in a min-heap keyed by the time of
+	their first request. Entries of items which left the bucket are discarded
+	lazily.
+	"""
+	__slots__ = ('freq', 'items', 'heap', 'up', 'down')
+
+	def __init__(self, freq, up=None, down=None):
+		self.freq = freq
+		self.items = set()
+		self.heap = []
+		self.up = up
+		self.down = down
+
+
 @register_cache_policy('PERFECT_LFU')
 class PerfectLfuCache(Cache):
 	"""Perfect Least Frequently Used (LFU) cache implementation
@@ -1177,24 +1874,38 @@ class PerfectLfuCache(Cache):
 	counters are increased when the associated item is requested. Upon
 	insertion of a new item, the cache evicts the one which was requested the
 	least times in the past, i.e. the one whose associated value has the
-	smallest value.
+	smallest value. Ties are broken in favour of evicting the item first
+	requested earliest.
+
+	Items with the same frequency and time of first request, which only
+	occurs if items are put in the cache without being requested first, are
+	evicted in insertion order, starting from the item being inserted. The
+	previous implementation broke these ties in arbitrary set iteration
+	order, so results of experiments with such ties can differ from those of
+	earlier versions.
 
 	This is an implementation of a Perfect-LFU, i.e. a cache that keeps
 	counters for every item, even for those not in the cache.
 
 	In contrast to LRU, Perfect-LFU has been shown to perform optimally under
-	IRM demands. However, its implementation is computationally expensive since
-	it cannot be implemented in such a way that both search and replacement
-	tasks can be executed in constant time. This makes it particularly unfit
-	for large caches and line speed operations.
+	IRM demands. This implementation stores items in cache in a doubly-linked
+	list of frequency buckets sorted by frequency, so that a request moves an
+	item to the adjacent bucket and the item to evict is always found in the
+	bottom bucket. Counters of integer items are stored in compact arrays.
 	"""
 
 	@inheritdoc(Cache)
 	def __init__(self, maxlen, *args, **kwargs):
-		# Dict storing counter for all contents, not only those in cache
-		self._counter = {}
-		# Set storing only items currently in cache
-		self._cache = set()
+		# Counters and time of first request for all contents, not only those
+		# in cache
+		self._freq = _IntKeyTable()
+		self._first = _IntKeyTable()
+		# Dict mapping items currently in cache to their frequency bucket
+		self._cache = {}
+		# Dict mapping frequencies to buckets and least frequent bucket
+		self._bucket = {}
+		self._bottom = None
+		self._seq = 0
 		self.t = 0
 		self._maxlen = int(maxlen)
 		if self._maxlen <= 0:
@@ -1211,7 +1922,8 @@ class PerfectLfuCache(Cache):
 
 	@inheritdoc(Cache)
 	def dump(self):
-		return sorted(self._cache, key=lambda x: self._counter[x], reverse=True)
+		return sorted(self._cache, key=lambda x: (self._freq[x], self._first[x]),
+					  reverse=True)
 
 	@inheritdoc(Cache)
 	def has(self, k, *args, **kwargs):
@@ -1220,37 +1932,73 @@ class PerfectLfuCache(Cache):
 	@inheritdoc(Cache)
 	def get(self, k, *args, **kwargs):
 		self.t += 1
-		if k in self._counter:
-			freq, t = self._counter[k]
-			self._counter[k] = freq + 1, t
+		freq = self._freq[k]
+		if freq > 0:
+			self._freq[k] = freq + 1
 		else:
-			self._counter[k] = 1, self.t
-		if self.has(k):
+			self._freq[k] = 1
+			self._first[k] = self.t
+		if k in self._cache:
+			self._promote(k)
 			return True
-		else:
-			return False
+		return False
 
 	@inheritdoc(Cache)
 	def put(self, k, *args, **kwargs):
-		if not self.has(k):
-			if k in self._counter:
-				freq, t = self._counter[k]
-				self._counter[k] = (freq + 1, t)
+		if k in self._cache:
+			return None
+		freq = self._freq[k]
+		if freq > 0:
+			freq += 1
+		else:
+			# If I always call a get before a put, this line should never
+			# be executed
+			freq = 1
+			self._first[k] = self.t
+		self._freq[k] = freq
+		t = self._first[k]
+		evicted = None
+		if len(self._cache) >= self._maxlen:
+			bottom = self._bottom
+			if (freq, t) <= (bottom.freq, self._peek(bottom)):
+				# The new item is the least frequently used
+				return k
+			evicted = self._peek_item(bottom)
+			self._discard(evicted)
+		self._insert(k, freq, t)
+		return evicted
+
+	@inheritdoc(Cache)
+	def process_batch(self, keys, weights=None, times=None):
+		if _is_wrapped(self):
+			return Cache.process_batch(self, keys, weights, times)
+		keys = _batch_args(keys, weights, times)[0]
+		hits = [False] * len(keys)
+		evicted = [None] * len(keys)
+		cache = self._cache
+		freq_table = self._freq
+		promote = self._promote
+		put = self.put
+		for i, k in enumerate(keys):
+			# Same as get, inlined
+			self.t += 1
+			freq = freq_table[k]
+			if freq > 0:
+				freq_table[k] = freq + 1
 			else:
-				# If I always call a get before a put, this line should never
-				# be executed
-				self._counter[k] = (1, self.t)
-			self._cache.add(k)
-			if len(self._cache) > self._maxlen:
-				evicted = min(self._cache, key=lambda x: self._counter[x])
-				self._cache.remove(evicted)
-				return evicted
-		return None
+				freq_table[k] = 1
+				self._first[k] = self.t
+			if k in cache:
+				promote(k)
+				hits[i] = True
+			else:
+				evicted[i] = put(k)
+		return _batch_result(hits, evicted)
 
 	@inheritdoc(Cache)
 	def remove(self, k, *args, **kwargs):
 		if k in self._cache:
-			self._cache.pop(k)
+			self._discard(k)
 			return True
 		else:
 			return False
@@ -1258,7 +2006,87 @@ class PerfectLfuCache(Cache):
 	@inheritdoc(Cache)
 	def clear(self):
 		self._cache.clear()
-		self._counter.clear()
+		self._bucket.clear()
+		self._bottom = None
+		self._freq.clear()
+		self._first.clear()
+
+	def _push(self, bucket, k, t):
+		"""Add an item to a bucket"""
+		self._seq += 1
+		bucket.items.add(k)
+		heapq.heappush(bucket.heap, (t, self._seq, k))
+		self._cache[k] = bucket
+
+	def _peek(self, bucket):
+		"""Return the earliest time of first request of items in a bucket"""
+		heap = bucket.heap
+		while heap[0][2] not in bucket.items:
+			heapq.heappop(heap)
+		return heap[0][0]
+
+	def _peek_item(self, bucket):
+		"""Return the item of a bucket requested first"""
+		self._peek(bucket)
+		return bucket.heap[0][2]
+
+	def _link_above(self, bucket, freq):
+		"""Create a new bucket right above a given bucket, or at the bottom of
+		the list if *bucket* is None"""
+		if bucket is None:
+			new = _FreqBucket(freq, up=self._bottom)
+			if self._bottom is not None:
+				self._bottom.down = new
+			self._bottom = new
+		else:
+			new = _FreqBucket(freq, up=bucket.up, down=bucket)
+			if bucket.up is not None:
+				bucket.up.down = new
+			bucket.up = new
+		self._bucket[freq] = new
+		return new
+
+	def _insert(self, k, freq, t):
+		"""Insert an item not in cache in the bucket of its frequency"""
+		bucket = self._bucket.get(freq)
+		if bucket is None:
+			# Look for the most frequent bucket below freq. Items entering
+			# the cache are normally among the least frequent, so this is
+			# normally found close to the bottom of the list
+			below = self._bottom
+			if below is not None and below.freq > freq:
+				below = None
+			while below is not None and below.up is not None \
+					and below.up.freq < freq:
+				below = below.up
+			bucket = self._link_above(below, freq)
+		self._push(bucket, k, t)
+
+	def _discard(self, k):
+		"""Remove an item from the cache and its bucket"""
+		bucket = self._cache.pop(k)
+		bucket.items.remove(k)
+		if not bucket.items:
+			if bucket.down is None:
+				self._bottom = bucket.up
+			else:
+				bucket.down.up = bucket.up
+			if bucket.up is not None:
+				bucket.up.down = bucket.down
+			del self._bucket[bucket.freq]
+		elif len(bucket.heap) > 2 * len(bucket.items) + 8:
+			bucket.heap = [e for e in bucket.heap if e[2] in bucket.items]
+			heapq.heapify(bucket.heap)
+
+	def _promote(self, k):
+		"""Move a cached item to the bucket of the next frequency"""
+		bucket = self._cache[k]
+		freq = bucket.freq + 1
+		up = bucket.up
+		if up is None or up.freq != freq:
+			up = self._link_above(bucket, freq)
+		self._discard(k)
+		self._push(up, k, self._first[k])
 
 
 @register_cache_policy('FIFO')
@@ -1338,6 +2166,38 @@ class FifoCache(Cache):
 			self._cache.remove(evicted)
 		return evicted
 
+	@inheritdoc(Cache)
+	def process_batch(self, keys, weights=None, times=None):
+		if _is_wrapped(self):
+			return Cache.process_batch(self, keys, weights, times)
+		keys = _batch_args(keys, weights, times)[0]
+		hits = [False] * len(keys)
+		evicted = [None] * len(keys)
+		cache = self._cache
+		d = self._d
+		maxlen = self._maxlen
+		for i, k in enumerate(keys):
+			if k in cache:
+				hits[i] = True
+			else:
+				cache.add(k)
+				d.appendleft(k)
+				if len(cache) > maxlen:
+					evicted[i] = d.pop()
+					cache.remove(evicted[i])
+		return _batch_result(hits, evicted)
+
+	def _victim(self):
+		"""Return the item that would be evicted if a new item was inserted,
+		without changing the internal state of the cache
+
+		Returns
+		-------
+		victim : any hashable type
+			The item to be evicted or *None* if the cache is not full
+		"""
+		return self._d[-1] if len(self._cache) >= self._maxlen else None
+
 	@inheritdoc(Cache)
 	def remove(self, k, *args, **kwargs):
 		if k in self._cache:
@@ -1363,9 +2223,19 @@ class ClimbCache(Cache):
 	at the bottom of the list.
 	"""
 
-	@inheritdoc(Cache)
-	def __init__(self, maxlen, *args, **kwargs):
-		self._cache = LinkedSet()
+	def __init__(self, maxlen, array_backed=False, *args, **kwargs):
+		"""Constructor
+
+		Parameters
+		----------
+		maxlen : int
+			The maximum number of items the cache can store
+		array_backed : bool, optional
+			If *True*, store the items in an `ArrayLinkedSet`, which has a
+			smaller memory footprint if items are integers
+		"""
+		self._cache = ArrayLinkedSet(capacity=int(maxlen)) if array_backed \
+					  else LinkedSet()
 		self._maxlen = int(maxlen)
 		if self._maxlen <= 0:
 			raise ValueError('maxlen must be positive')
@@ -1450,6 +2320,17 @@ class ClimbCache(Cache):
 		self._cache.append_bottom(k)
 		return evicted
 
+	def _victim(self):
+		"""Return the item that would be evicted if a new item was inserted,
+		without changing the internal state of the cache
+
+		Returns
+		-------
+		victim : any hashable type
+			The item to be evicted or *None* if the cache is not full
+		"""
+		return self._cache.bottom if len(self._cache) >= self._maxlen else None
+
 	@inheritdoc(Cache)
 	def remove(self, k, *args, **kwargs):
 		if k not in self._cache:
@@ -1517,6 +2398,31 @@ class RandEvictionCache(Cache):
 			self._cache.add(k)
 		return evicted
 
+	@inheritdoc(Cache)
+	def process_batch(self, keys, weights=None, times=None):
+		if _is_wrapped(self):
+			return Cache.process_batch(self, keys, weights, times)
+		keys = _batch_args(keys, weights, times)[0]
+		hits = [False] * len(keys)
+		evicted = [None] * len(keys)
+		cache = self._cache
+		a = self._a
+		maxlen = self._maxlen
+		randint = random.randint
+		for i, k in enumerate(keys):
+			if k in cache:
+				hits[i] = True
+			elif len(cache) == maxlen:
+				evicted_index = randint(0, maxlen - 1)
+				evicted[i] = a[evicted_index]
+				a[evicted_index] = k
+				cache.remove(evicted[i])
+				cache.add(k)
+			else:
+				a[len(cache)] = k
+				cache.add(k)
+		return _batch_result(hits, evicted)
+
 	@inheritdoc(Cache)
 	def remove(self, k, *args, **kwargs):
 		if k not in self._cache:
@@ -1533,28 +2439,48 @@ class RandEvictionCache(Cache):
 
 @register_cache_policy('GRD')
 class GreedyCache(Cache):
-	"""Least Recently Used (LRU) cache eviction policy.
-
-	According to this policy, When a new item needs to inserted into the cache,
-	it evicts the least recently requested one.
-	This eviction policy is efficient for line speed operations because both
-	search and replacement tasks can be performed in constant time (*O(1)*).
-
-	This policy has been shown to perform well in the presence of temporal
-	locality in the request pattern. However, its performance drops under the
-	Independent Reference Model (IRM) assumption (i.e. the probability that an
-	item is requested is not dependent on previous requests).
-	"""
+	"""Greedy weighted cache eviction policy.
+
+	Each item is associated with a weight accumulated every time the item is
+	inserted into the cache, e.g. the cost of the path it traversed to reach
+	this node, scaled by an exponential factor of the time elapsed since the
+	previous insertion. When a new item needs to be inserted into a full
+	cache, the item with the smallest weight is evicted.
+
+	Items in the cache are kept in a binary min-heap keyed by weight, so that
+	both insertion and replacement are performed in *O(log n)* time. Ties
+	between items with identical weight are broken in favour of evicting the
+	item inserted first.
+
+	Weights are stored as a mantissa and an integer binary exponent relative
+	to a global power-of-two scale shared by all items. Halving all weights
+	once any of them exceeds *W* is then a constant-time update of the scale
+	exponent, which is exact, so items are evicted in the same order as if
+	all weights were halved one by one. Since exponents are unbounded
+	integers, weights cannot overflow however long the simulation runs.
+	Weights must be non-negative.
+	"""
 
 	@inheritdoc(Cache)
 	def __init__(self, maxlen, beta=0.5, W=10**200, **kwargs):
 
 		self._cache = set()
 		self._maxlen = int(maxlen)
-		self._weight = defaultdict(float)
+		# (exponent, mantissa) of the weights of all items ever inserted, as
+		# returned by _frexp. The weight of item k is
+		# ldexp(mantissa, exponent - self._halvings)
+		self._weight = {}
+		self._halvings = 0
 		self._last = 0.0
 		self._beta = beta
 		self._W = W
+		self._frexp_W = _frexp(W)
+		# Min-heap of [exponent, mantissa, insertion order, item] entries.
+		# Entries of items removed from the cache are invalidated lazily and
+		# discarded when they reach the top of the heap
+		self._heap = []
+		self._entry = {}
+		self.t = 0
 		if self._maxlen <= 0:
 			raise ValueError('maxlen must be positive')
 
@@ -1585,47 +2511,487 @@ class GreedyCache(Cache):
 	def put(self, k, *args, **kwargs):
 		"""Insert an item in the cache if not already inserted.
 
-		If the element is already present in the cache, it will pushed to the
-		top of the cache.
+		If the element is already present in the cache, no action is taken.
 
 		Parameters
 		----------
 		k : any hashable type
 			The item to be inserted
+		weight : float
+			The weight contributed by this insertion
+		t : float
+			The time of the insertion
 
 		Returns
 		-------
 		evicted : any hashable type
 			The evicted object or *None* if no contents were evicted.
 		"""
-		# if content in cache, push it on top, no eviction
 		if self.has(k):
 			return None
-		weight = kwargs['weight']
-		t = kwargs['t']
-		factor = math.exp(self._beta*(t-self._last))
+		return self._insert(k, kwargs['weight'], kwargs['t'])
+
+	@inheritdoc(Cache)
+	def process_batch(self, keys, weights=None, times=None):
+		if _is_wrapped(self):
+			return Cache.process_batch(self, keys, weights, times)
+		if weights is None or times is None:
+			raise ValueError('weights and times are required by GRD')
+		keys, weights, times = _batch_args(keys, weights, times)
+		hits = [False] * len(keys)
+		evicted = [None] * len(keys)
+		cache = self._cache
+		insert = self._insert
+		for i, k in enumerate(keys):
+			if k in cache:
+				hits[i] = True
+			else:
+				evicted[i] = insert(k, weights[i], times[i])
+		return _batch_result(hits, evicted)
+
+	def _insert(self, k, weight, t):
+		"""Insert an item not in the cache, evicting the item with the lowest
+		weight if the cache is full, and return the evicted item or *None*"""
+		try:
+			exp, mant = _frexp(math.exp(self._beta*(t-self._last))*weight)
+		except OverflowError:
+			# The factor exp(beta*(t - last)) overflows a float, split it
+			# into a power of two and a remainder
+			x = self._beta*(t-self._last)
+			n = int(x // _LN2)
+			exp, mant = _frexp(math.exp(x - n*_LN2)*weight)
+			exp += n
 		self._last = t
-		self._weight[k] += factor*weight
-		if self._weight[k]>self._W:
-			for content in self._weight:
-				self._weight[content] /= 2
+		exp, mant = _fradd(self._weight.get(k, _ZERO), (exp + self._halvings, mant))
+		self._weight[k] = (exp, mant)
+		if (exp - self._halvings, mant) > self._frexp_W:
+			# Halve all weights. Weights are relative to the global scale,
+			# so they do not need to be updated
+			self._halvings += 1
 		self._cache.add(k)
+		self.t += 1
+		entry = [exp, mant, self.t, k]
+		self._entry[k] = entry
+		heapq.heappush(self._heap, entry)
 		if len(self._cache) > self._maxlen:
-			evicted = min(self._cache, key=lambda x: self._weight[x])
+			evicted = self._pop_min()
 			self._cache.remove(evicted)
 			return evicted
 		return None
 
+	def _pop_min(self):
+		"""Pop the item with the smallest weight from the heap, discarding
+		invalidated entries
+
+		Returns
+		-------
+		k : any hashable type
+			The item with the smallest weight
+		"""
+		while True:
+			entry = heapq.heappop(self._heap)
+			k = entry[3]
+			if self._entry.get(k) is entry:
+				del self._entry[k]
+				return k
+
+	def _victim(self):
+		"""Return the item that would be evicted if a new item was inserted,
+		without changing the internal state of the cache
+
+		Returns
+		-------
+		victim : any hashable type
+			The item to be evicted or *None* if the cache is not full
+		"""
+		if len(self._cache) < self._maxlen:
+			return None
+		heap = self._heap
+		while self._entry.get(heap[0][3]) is not heap[0]:
+			heapq.heappop(heap)
+		return heap[0][3]
+
 	@inheritdoc(Cache)
 	def remove(self, k, *args, **kwargs):
 		if k not in self._cache:
 			return False
 		self._cache.remove(k)
+		del self._entry[k]
+		# Compact the heap if invalidated entries dominate
+		if len(self._heap) > 2*len(self._entry) + 1:
+			self._heap = [e for e in self._heap if self._entry.get(e[3]) is e]
+			heapq.heapify(self._heap)
 		return True
 
 	@inheritdoc(Cache)
 	def clear(self):
 		self._cache.clear()
+		self._heap = []
+		self._entry.clear()
+
+
+_LN2 = math.log(2)
+
+# Representation of a zero weight by _frexp, lower than any other
+_ZERO = (-np.inf, 0.0)
+
+
+def _frexp(x):
+	"""Return a non-negative number as an (exponent, mantissa) pair, such
+	that pairs compare in the same order as numbers
+
+	Parameters
+	----------
+	x : float
+		The number
+
+	Returns
+	-------
+	exponent, mantissa : tuple
+		The integer exponent and the mantissa in [0.5, 1) such that
+		x = ldexp(mantissa, exponent)
+	"""
+	if x == 0:
+		return _ZERO
+	mant, exp = math.frexp(x)
+	return exp, mant
+
+
+def _fradd(a, b):
+	"""Add two numbers represented as (exponent, mantissa) pairs by _frexp
+
+	The sum is computed on mantissas scaled to the larger exponent, so it is
+	rounded as the sum of the represented numbers.
+
+	Parameters
+	----------
+	a, b : tuple
+		The two addends
+
+	Returns
+	-------
+	sum : tuple
+		The sum
+	"""
+	if a[0] < b[0]:
+		a, b = b, a
+	if b[0] == -np.inf:
+		return a
+	mant, exp = math.frexp(a[1] + math.ldexp(b[1], b[0] - a[0]))
+	return exp + a[0], mant
+
+class _GreedyDualCache(Cache):
+	"""Base implementation of GreedyDual cache replacement policies.
+
+	Each item in the cache has a priority *H = L + U*, where *U* is the
+	utility of the item as defined by the specific policy, e.g. a function of
+	its weight and of its past references, and *L* is an inflation value,
+	set to the priority of the last evicted item. When a new item is inserted
+	in a full cache, the item with the lowest priority is evicted. The
+	priority of an item is updated only when it is referenced, hence items
+	which are no longer referenced are eventually evicted because of the
+	increase of *L*.
+
+	Items are kept in a min-heap of priorities, hence all operations have
+	O(log n) time complexity. Entries of items whose priority changed are
+	invalidated and discarded lazily when they reach the top of the heap.
+
+	Subclasses must implement the *_reference* and *_utility* methods.
+	"""
+
+	@inheritdoc(Cache)
+	def __init__(self, maxlen, *args, **kwargs):
+		self._maxlen = int(maxlen)
+		if self._maxlen <= 0:
+			raise ValueError('maxlen must be positive')
+		# Map item -> [priority, seq, item] entry of the heap
+		self._cache = {}
+		self._heap = []
+		# Weight of the items in the cache
+		self._weight = {}
+		self._L = 0.0
+		self._seq = 0
+
+	@inheritdoc(Cache)
+	def __len__(self):
+		return len(self._cache)
+
+	@property
+	@inheritdoc(Cache)
+	def maxlen(self):
+		return self._maxlen
+
+	@inheritdoc(Cache)
+	def dump(self):
+		return [e[2] for e in sorted(self._cache.values(), reverse=True)]
+
+	@inheritdoc(Cache)
+	def has(self, k, *args, **kwargs):
+		return k in self._cache
+
+	def get(self, k, *args, **kwargs):
+		"""Retrieves an item from the cache.
+
+		If the item is in the cache, its priority is updated, using the weight
+		passed as *weight* argument, if any, or the weight it was inserted
+		with otherwise.
+
+		Parameters
+		----------
+		k : any hashable type
+			The item looked up in the cache
+		weight : float, optional
+			The weight of the item
+
+		Returns
+		-------
+		v : bool
+			Boolean value being *True* if the requested item is in the cache
+			or *False* otherwise
+		"""
+		self._reference(k)
+		if k not in self._cache:
+			return False
+		if 'weight' in kwargs:
+			self._weight[k] = kwargs['weight']
+		self._push(k)
+		return True
+
+	def put(self, k, *args, **kwargs):
+		"""Insert an item in the cache if not already inserted.
+
+		If the cache is full, the item with the lowest priority is evicted and
+		*L* is set to its priority.
+
+		Parameters
+		----------
+		k : any hashable type
+			The item to be inserted
+		weight : float, optional
+			The weight of the item, i.e. the cost of a miss. If not
+			specified, it is 1.
+
+		Returns
+		-------
+		evicted : any hashable type
+			The evicted object or *None* if no contents were evicted.
+		"""
+		if k in self._cache:
+			return None
+		evicted = None
+		if len(self._cache) >= self._maxlen:
+			heap = self._heap
+			while True:
+				entry = heapq.heappop(heap)
+				if self._cache.get(entry[2]) is entry:
+					break
+			evicted = entry[2]
+			self._L = entry[0]
+			del self._cache[evicted]
+			del self._weight[evicted]
+			self._evict(evicted)
+		self._weight[k] = kwargs.get('weight', 1)
+		self._push(k)
+		return evicted
+
+	def _push(self, k):
+		"""Compute the priority of an item and push it in the heap,
+		invalidating its previous entry, if any"""
+		self._seq += 1
+		entry = [self._L + self._utility(k), self._seq, k]
+		self._cache[k] = entry
+		heapq.heappush(self._heap, entry)
+		if len(self._heap) > 2 * len(self._cache) + 64:
+			self._heap = list(self._cache.values())
+			heapq.heapify(self._heap)
+
+	def _reference(self, k):
+		"""Record a reference to an item, which may not be in the cache"""
+		raise NotImplementedError('This method is not implemented')
+
+	def _utility(self, k):
+		"""Return the utility of an item in the cache, after its last
+		reference"""
+		raise NotImplementedError('This method is not implemented')
+
+	def _evict(self, k):
+		"""Discard the state of an item leaving the cache"""
+		pass
+
+	def _victim(self):
+		"""Return the item that would be evicted if a new item was inserted,
+		without changing the internal state of the cache
+
+		Returns
+		-------
+		victim : any hashable type
+			The item to be evicted or *None* if the cache is not full
+		"""
+		if len(self._cache) < self._maxlen:
+			return None
+		heap = self._heap
+		while self._cache.get(heap[0][2]) is not heap[0]:
+			heapq.heappop(heap)
+		return heap[0][2]
+
+	@inheritdoc(Cache)
+	def remove(self, k, *args, **kwargs):
+		if k not in self._cache:
+			return False
+		del self._cache[k]
+		del self._weight[k]
+		self._evict(k)
+		return True
+
+	@inheritdoc(Cache)
+	def clear(self):
+		self._cache.clear()
+		self._weight.clear()
+		self._heap = []
+		self._L = 0.0
+
+
+@register_cache_policy('GDSF')
+class GreedyDualSizeFrequencyCache(_GreedyDualCache):
+	"""GreedyDual-Size-Frequency (GDSF) cache replacement policy.
+
+	The utility of an item is the product of its weight, i.e. the cost of a
+	miss, and of the number of times it was requested since it entered the
+	cache. Since all items have unit size, the size term of the original
+	policy is omitted.
+
+	This policy uses the *weight* argument passed to *put*, e.g. by the
+	*GRD* strategy, hence it can be used in place of probabilistic admission
+	(e.g. the *Q* strategy) to make caching decisions aware of weights.
+
+	References
+	----------
+	L. Cherkasova, Improving WWW Proxies Performance with Greedy-Dual-Size-
+	Frequency Caching Policy, HP Technical Report HPL-98-69, 1998.
+	"""
+
+	@inheritdoc(Cache)
+	def __init__(self, maxlen, *args, **kwargs):
+		super(GreedyDualSizeFrequencyCache, self).__init__(maxlen)
+		# Number of requests of the items in the cache since insertion
+		self._freq = {}
+
+	def _reference(self, k):
+		if k in self._freq:
+			self._freq[k] += 1
+
+	def _utility(self, k):
+		return self._freq.setdefault(k, 1) * self._weight[k]
+
+	def _evict(self, k):
+		del self._freq[k]
+
+	@inheritdoc(Cache)
+	def clear(self):
+		super(GreedyDualSizeFrequencyCache, self).clear()
+		self._freq.clear()
+
+
+@register_cache_policy('WEIGHTED_LRU_K')
+class WeightedLruKCache(_GreedyDualCache):
+	"""Weighted LRU-K cache replacement policy.
+
+	LRU-K evicts the item whose K-th most recent reference is the oldest,
+	i.e. the item with the largest backward K-distance *d*, which is an
+	estimate of the inverse of its request rate. This policy weighs that
+	estimate with the weight of the item, i.e. the cost of a miss, and uses
+	*w / d* as utility of a GreedyDual policy. Items referenced less than K
+	times have infinite backward K-distance, hence their priority is *L* and
+	they are evicted first, in LRU order.
+
+	Distances are measured in number of references to the cache. The
+	history of the last K references is kept for all items in the cache and,
+	as the retained information of the original policy, for a bounded number
+	of items not in the cache, so that items requested again shortly after
+	being evicted or missed are not considered as new. The history of the
+	items not in the cache referenced least recently is dropped first.
+
+	References
+	----------
+	E. J. O'Neil, P. E. O'Neil and G. Weikum, The LRU-K page replacement
+	algorithm for database disk buffering, in Proc. of ACM SIGMOD'93.
+	"""
+
+	def __init__(self, maxlen, k=2, memory=None, *args, **kwargs):
+		"""Constructor
+
+		Parameters
+		----------
+		maxlen : int
+			The maximum number of items the cache can store
+		k : int, optional
+			The number of past references used to estimate request rates
+		memory : int, optional
+			The maximum number of items not in the cache whose history is
+			retained. If not specified, it is set to 4 times the size of the
+			cache
+		"""
+		super(WeightedLruKCache, self).__init__(maxlen)
+		self._k = int(k)
+		if self._k <= 0:
+			raise ValueError('k must be positive')
+		self._memory = 4 * self._maxlen if memory is None else int(memory)
+		if self._memory < 0:
+			raise ValueError('memory must be non-negative')
+		# Map item -> deque of times of its last K references
+		self._history = {}
+		# Items not in the cache whose history is retained, the most recently
+		# referenced or evicted at the top
+		self._retained = ArrayLinkedSet(capacity=self._memory + 1)
+		self.t = 0
+
+	def _record(self, k):
+		"""Record the time of a reference to an item"""
+		self.t += 1
+		if k not in self._history:
+			self._history[k] = deque(maxlen=self._k)
+		self._history[k].append(self.t)
+
+	def _retain(self, k):
+		"""Retain the history of an item not in the cache, dropping the
+		history of the least recently retained items beyond *memory*"""
+		if k in self._retained:
+			self._retained.move_to_top(k)
+		else:
+			self._retained.append_top(k)
+		while len(self._retained) > self._memory:
+			del self._history[self._retained.pop_bottom()]
+
+	def _reference(self, k):
+		self._record(k)
+		if k not in self._cache:
+			self._retain(k)
+
+	def _utility(self, k):
+		history = self._history[k]
+		if len(history) < self._k:
+			return 0.0
+		return self._weight[k] / (self.t - history[0] + 1)
+
+	def _evict(self, k):
+		self._retain(k)
+
+	@inheritdoc(_GreedyDualCache)
+	def put(self, k, *args, **kwargs):
+		if k not in self._cache:
+			if k in self._retained:
+				self._retained.remove(k)
+			else:
+				# Put without a previous get, count it as a reference
+				self._record(k)
+		return super(WeightedLruKCache, self).put(k, *args, **kwargs)
+
+	@inheritdoc(Cache)
+	def clear(self):
+		super(WeightedLruKCache, self).clear()
+		self._history.clear()
+		self._retained.clear()
+
 
 def insert_after_k_hits_cache(cache, k=2, memory=None):
 	"""Return a cache inserting items only after k requests.
@@ -1738,6 +3104,212 @@ def rand_insert_cache(cache, p, seed=None):
 	cache.put.__doc__ = c_put.__doc__
 	return cache
 
+
+class _CountMinSketch(object):
+	"""Count-min sketch estimating the number of occurrences of items with
+	counters stored in a fixed-size array.
+
+	All counters are periodically halved, so that estimates reflect recent
+	popularity rather than popularity since the beginning of time.
+	"""
+
+	# Mersenne prime used by the universal hash functions
+	PRIME = 2 ** 31 - 1
+
+	def __init__(self, width, depth=4, sample_size=None, seed=None):
+		"""Constructor
+
+		Parameters
+		----------
+		width : int
+			The number of counters of each row
+		depth : int, optional
+			The number of rows, i.e. of independent hash functions
+		sample_size : int, optional
+			The number of additions after which all counters are halved. If
+			*None*, counters are never halved
+		seed : any hashable type, optional
+			The seed of the random number generator drawing hash functions
+		"""
+		self._width = int(width)
+		self._depth = int(depth)
+		if self._width <= 0 or self._depth <= 0:
+			raise ValueError('width and depth must be positive')
+		rng = np.random.RandomState(seed)
+		# Parameters of the hash function of each row and offset of the row
+		# in the flattened table
+		self._hash = [(int(rng.randint(1, self.PRIME)),
+					   int(rng.randint(0, self.PRIME)), row * self._width)
+					  for row in range(self._depth)]
+		# Counters are read and updated one by one in an array of C unsigned
+		# ints, which is much faster than indexing a NumPy array, while aging
+		# halves them all at once through a NumPy copy of the array
+		self._counters = array('I', [0]) * (self._depth * self._width)
+		self._sample_size = sample_size
+		self._n = 0
+
+	def _index(self, k):
+		"""Return the positions of the counters of an item"""
+		x = int((k if isinstance(k, _INT_TYPES) else hash(k)) % self.PRIME)
+		p = self.PRIME
+		w = self._width
+		return [(a * x + b) % p % w + offset for a, b, offset in self._hash]
+
+	def add(self, k):
+		"""Count an occurrence of an item and age counters if needed
+
+		Parameters
+		----------
+		k : any hashable type
+			The item
+		"""
+		counters = self._counters
+		for i in self._index(k):
+			counters[i] += 1
+		self._n += 1
+		if self._sample_size is not None and self._n >= self._sample_size:
+			halved = np.frombuffer(self._counters, dtype=np.uintc) >> 1
+			self._counters = array('I', halved.tobytes())
+			self._n //= 2
+
+	def estimate(self, k):
+		"""Return an estimate of the number of occurrences of an item
+
+		Parameters
+		----------
+		k : any hashable type
+			The item
+
+		Returns
+		-------
+		count : int
+			The estimated count, which is never lower than the actual one
+		"""
+		counters = self._counters
+		return min(counters[i] for i in self._index(k))
+
+	def clear(self):
+		"""Reset all counters"""
+		self._counters = array('I', [0]) * (self._depth * self._width)
+		self._n = 0
+
+
+def tinylfu_cache(cache, width=None, depth=4, sample_size=None, seed=None):
+	"""Return a cache admitting items according to the TinyLFU policy.
+
+	All requested items are counted by a count-min sketch. When a new item
+	is inserted in a full cache, it is admitted only if its estimated
+	frequency is greater than the one of the item that the cache would evict
+	to make room for it. Otherwise, the cache is left unchanged. This makes
+	any replacement policy retain frequently requested items, similarly to a
+	Perfect-LFU cache, but with a memory footprint fixed by the size of the
+	sketch rather than by the size of the content catalogue. Counters are
+	periodically halved, so that the cache adapts to popularity changes.
+
+	The cache must implement the *_victim* method, returning the item that
+	would be evicted by an insertion, which is the case of LRU, SLRU, FIFO,
+	CLIMB, GRD, GDSF and WEIGHTED_LRU_K caches.
+
+	Parameters
+	----------
+	cache : Cache
+		The instance of a cache to be applied TinyLFU admission
+	width : int, optional
+		The number of counters of each row of the sketch. If not specified,
+		it is set to 4 times the size of the cache
+	depth : int, optional
+		The number of rows of the sketch
+	sample_size : int, optional
+		The number of requests after which all counters are halved. If not
+		specified, it is set to 10 times the size of the cache
+	seed : any hashable type, optional
+		The seed of the random number generator drawing hash functions
+
+	Returns
+	-------
+	cache : Cache
+		The modified cache instance
+
+	References
+	----------
+	G. Einziger, R. Friedman and B. Manes, TinyLFU: A Highly Efficient Cache
+	Admission Policy, ACM Transactions on Storage, 13(4), 2017.
+	"""
+	if not isinstance(cache, Cache):
+		raise TypeError('cache must be an instance of Cache or its subclasses')
+	if not hasattr(cache, '_victim'):
+		raise TypeError('cache policy %s does not support TinyLFU admission'
+						% type(cache).__name__)
+	if width is None:
+		width = 4 * cache.maxlen
+	if sample_size is None:
+		sample_size = 10 * cache.maxlen
+	sketch = _CountMinSketch(width, depth, sample_size, seed)
+	c_get = cache.get
+	c_put = cache.put
+	c_clear = cache.clear
+
+	def get(k, *args, **kwargs):
+		sketch.add(k)
+		return c_get(k, *args, **kwargs)
+
+	def put(k, *args, **kwargs):
+		if not cache.has(k):
+			victim = cache._victim()
+			if victim is not None and \
+					sketch.estimate(k) <= sketch.estimate(victim):
+				return None
+		return c_put(k, *args, **kwargs)
+
+	def clear():
+		c_clear()
+		sketch.clear()
+
+	cache.get = get
+	cache.get.__doc__ = c_get.__doc__
+	cache.put = put
+	cache.put.__doc__ = c_put.__doc__
+	cache.clear = clear
+	cache.clear.__doc__ = c_clear.__doc__
+	cache._sketch = sketch
+	return cache
+
+
+@register_cache_policy('TINY_LFU')
+def tinylfu_cache_policy(maxlen, policy='LRU', width=None, depth=4,
+						 sample_size=None, seed=None, **kwargs):
+	"""Return a cache of a registered policy with TinyLFU admission.
+
+	This allows selecting TinyLFU admission from the *cache_policy* section
+	of the configuration of an experiment, e.g.
+	{'name': 'TINY_LFU', 'policy': 'SLRU'}.
+
+	Parameters
+	----------
+	maxlen : int
+		The maximum number of items the cache can store
+	policy : str, optional
+		The name of the replacement policy of the cache
+	width : int, optional
+		The number of counters of each row of the sketch
+	depth : int, optional
+		The number of rows of the sketch
+	sample_size : int, optional
+		The number of requests after which all counters are halved
+	seed : any hashable type, optional
+		The seed of the random number generator drawing hash functions
+	**kwargs
+		Parameters of the replacement policy
+
+	Returns
+	-------
+	cache : Cache
+		The cache instance
+	"""
+	return tinylfu_cache(CACHE_POLICY[policy](maxlen, **kwargs), width=width,
+						 depth=depth, sample_size=sample_size, seed=seed)
+
+
 def keyval_cache(cache):
 	"""It modifies the instance of a cache object such that items are saved
 	together with a value instead of just a key.
@@ -1927,7 +3499,11 @@ def ttl_cache(cache, f_time):
 	cache.f_time = f_time
 	cache.expiry = {}
 
-	cache._exp_list = LinkedSet()
+	# Min-heap of (expiration time, insertion order, item) entries. Entries of
+	# items removed or whose expiration time changed are discarded lazily,
+	# when they reach the top of the heap or when the heap is compacted
+	cache._exp_heap = []
+	cache._exp_seq = 0
 
 	c_put = cache.put
 	c_get = cache.get
@@ -1944,11 +3520,30 @@ def ttl_cache(cache, f_time):
 		expiry : float
 			Cutoff expiration time
 		"""
-		while cache._exp_list.bottom is not None and \
-			  cache.expiry[cache._exp_list.bottom] < expiry:
-			expired = cache._exp_list.pop_bottom()
-			cache.expiry.pop(expired)
-			c_remove(expired)
+		heap = cache._exp_heap
+		while heap and heap[0][0] < expiry:
+			expires, _, expired = heapq.heappop(heap)
+			if cache.expiry.get(expired) == expires:
+				cache.expiry.pop(expired)
+				c_remove(expired)
+
+	def _push_expiry(k, expires):
+		"""Set the expiration time of an item
+
+		Parameters
+		----------
+		k : any hashable type
+			The item
+		expires : float
+			The absolute expiration time of the item
+		"""
+		cache.expiry[k] = expires
+		cache._exp_seq += 1
+		heapq.heappush(cache._exp_heap, (expires, cache._exp_seq, k))
+		if len(cache._exp_heap) > 2 * len(cache.expiry) + 64:
+			cache._exp_heap = [(e, seq, i) for seq, (i, e)
+							   in enumerate(cache.expiry.items())]
+			heapq.heapify(cache._exp_heap)
 
 	def purge():
 		"""Purge all expired items"""
@@ -1996,7 +3591,7 @@ def ttl_cache(cache, f_time):
 		else:  # case where TTL is None
 			if expires is None:
 				# If both TTL and expire are None, then TTL is infinite
-				expires = np.infty
+				expires = np.inf
 			elif expires <= now:
 				return None
 		# Purge expired items only if cache is full for performance reasons
@@ -2005,20 +3600,8 @@ def ttl_cache(cache, f_time):
 		evicted = c_put(k)
 		if evicted is not None:
 			cache.expiry.pop(evicted)
-			cache._exp_list.remove(evicted)
 		if k not in cache.expiry or cache.expiry[k] < expires:
-			cache.expiry[k] = expires
-			if k in cache._exp_list:
-				cache._exp_list.remove(k)
-			if len(cache._exp_list) == 0:
-				cache._exp_list.append_top(k)
-			else:
-				for i in cache._exp_list:
-					if expires >= cache.expiry[i]:
-						cache._exp_list.insert_above(i, k)
-						break
-				else:
-					cache._exp_list.append_bottom(k)
+			_push_expiry(k, expires)
 		return evicted
 
 	def has(k, *args, **kwargs):
@@ -2027,7 +3610,6 @@ def ttl_cache(cache, f_time):
 	def remove(k, *args, **kwargs):
 		c_remove(k)
 		cache.expiry.pop(k)
-		cache._exp_list.remove(k)
 
 	def dump():
 		"""Return a dump of all the elements currently in the cache possibly
@@ -2046,7 +3628,7 @@ def ttl_cache(cache, f_time):
 	def clear():
 		c_clear()
 		cache.expiry.clear()
-		cache._exp_list.clear()
+		cache._exp_heap = []
 
 	cache._purge_till = _purge_till
 
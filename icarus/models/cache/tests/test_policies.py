@@ -1,10 +1,15 @@
 from __future__ import division
+import math
+import numbers
 import unittest
 import collections
+import random
+import pickle
 
 import numpy as np
 
 import icarus.models as cache
+from icarus.registry import CACHE_POLICY
 
 class TestLinkedSet(unittest.TestCase):
 
@@ -213,6 +218,70 @@ class TestLinkedSet(unittest.TestCase):
         self.assertIsNotNone(cache.LinkedSet(iterable=[1, 0, None]))
 
 
+class TestArrayLinkedSet(unittest.TestCase):
+
+    def assertSameSet(self, expected, actual):
+        self.assertEqual(len(expected), len(actual))
+        self.assertEqual(list(expected), list(actual))
+        self.assertEqual(list(reversed(expected)), list(reversed(actual)))
+        self.assertEqual(expected.top, actual.top)
+        self.assertEqual(expected.bottom, actual.bottom)
+
+    def test_same_as_linked_set(self):
+        rng = np.random.RandomState(0)
+        ops = ['append_top', 'append_bottom', 'move_up', 'move_down',
+               'move_to_top', 'move_to_bottom', 'insert_above',
+               'insert_below', 'remove', 'pop_top', 'pop_bottom']
+        expected = cache.LinkedSet()
+        actual = cache.ArrayLinkedSet(capacity=4)
+        for _ in range(2000):
+            op = ops[rng.randint(len(ops))]
+            k = int(rng.randint(20))
+            i = int(rng.randint(20))
+            args = (i, k) if op.startswith('insert') else (k,)
+            if op.startswith('pop'):
+                args = ()
+            try:
+                res = getattr(expected, op)(*args)
+            except KeyError:
+                self.assertRaises(KeyError, getattr(actual, op), *args)
+            else:
+                self.assertEqual(res, getattr(actual, op)(*args))
+            self.assertSameSet(expected, actual)
+            for j in range(20):
+                self.assertEqual(j in expected, j in actual)
+                if j in expected:
+                    self.assertEqual(expected.index(j), actual.index(j))
+
+    def test_mixed_keys(self):
+        c = cache.ArrayLinkedSet(['a', 2, None, np.int64(3)])
+        self.assertEqual(['a', 2, None, 3], list(c))
+        self.assertIn(3, c)
+        self.assertIn(np.int32(2), c)
+        c.remove(2)
+        c.insert_below('a', 'b')
+        self.assertEqual(['a', 'b', None, 3], list(c))
+        self.assertNotIn(2, c)
+        self.assertRaises(KeyError, c.append_top, 3)
+        c.clear()
+        self.assertEqual(0, len(c))
+        self.assertIsNone(c.top)
+        self.assertIsNone(c.pop_bottom())
+        c.append_top(1)
+        self.assertEqual([1], list(c))
+
+    def test_array_backed_policies(self):
+        trace = np.random.RandomState(1).zipf(1.2, 5000) % 100
+        for policy in (cache.LruCache, cache.SegmentedLruCache,
+                       cache.ClimbCache):
+            expected = policy(10)
+            actual = policy(10, array_backed=True)
+            for k in trace:
+                self.assertEqual(expected.get(k), actual.get(k))
+                self.assertEqual(expected.put(k), actual.put(k))
+            self.assertEqual(expected.dump(), actual.dump())
+
+
 class TestCache(unittest.TestCase):
 
     def test_do(self):
@@ -275,6 +344,131 @@ class TestMinCache(unittest.TestCase):
             self.assertIsNone(c.put(i))
             self.assertEqual(set(range(min(i + 1, size))), set(c.dump()))
 
+    def test_next_use_positions(self):
+        next_use = cache.policies._next_use_positions([1, 2, 1, 3, 2, 1])
+        self.assertEqual([2, 4, 5, 6, 6, 6], list(next_use))
+        next_use = cache.policies._next_use_positions(np.array([4, 4, 4]))
+        self.assertEqual([1, 2, 3], list(next_use))
+        next_use = cache.policies._next_use_positions(['a', 1, '1', 'a'])
+        self.assertEqual([3, 4, 4, 4], list(next_use))
+
+    def test_get_put_remove(self):
+        trace = ['a', 'b', 'c', 'a', 'b', 'c']
+        c = cache.BeladyMinCache(2, trace)
+        for k in trace[:3]:
+            self.assertFalse(c.get(k))
+            c.put(k)
+        self.assertEqual({'a', 'b'}, c.dump())
+        self.assertRaises(ValueError, c.put, 'd')
+        self.assertTrue(c.remove('a'))
+        self.assertFalse(c.get('a'))
+        self.assertIsNone(c.put('a'))
+        self.assertTrue(c.get('b'))
+        self.assertFalse(c.get('c'))
+        # Nothing is requested again, hence nothing is worth replacing
+        self.assertIsNone(c.put('c'))
+        self.assertEqual({'a', 'b'}, c.dump())
+
+
+class TestWeightedMinCache(unittest.TestCase):
+
+    def test_get_put(self):
+        trace = [1, 2, 3, 1, 2, 3]
+        weights = [1, 1, 1, 1, 10, 5]
+        c = cache.WeightedBeladyMinCache(2, trace, weights)
+        self.assertFalse(c.get(1))
+        self.assertIsNone(c.put(1))
+        self.assertFalse(c.get(2))
+        self.assertIsNone(c.put(2))
+        self.assertFalse(c.get(3))
+        # Unlike MIN, 1 is evicted because it saves less weight per request
+        self.assertEqual(1, c.put(3))
+        self.assertEqual({2, 3}, set(c.dump()))
+        self.assertFalse(c.get(1))
+        self.assertIsNone(c.put(1))
+        self.assertTrue(c.get(2))
+        self.assertTrue(c.get(3))
+
+    def test_uniform_weights(self):
+        trace = np.random.RandomState(0).randint(0, 50, 2000)
+        c = cache.WeightedBeladyMinCache(10, trace, np.ones(len(trace)))
+        m = cache.BeladyMinCache(10, trace)
+        for k in trace:
+            self.assertEqual(m.get(k), c.get(k))
+            self.assertEqual(m.put(k), c.put(k))
+            self.assertEqual(m.dump(), c.dump())
+
+    def test_invalid_weights(self):
+        self.assertRaises(ValueError, cache.WeightedBeladyMinCache,
+                          2, [1, 2, 3], [1, 1])
+        self.assertRaises(ValueError, cache.WeightedBeladyMinCache,
+                          2, [1, 2, 3], [1, -1, 1])
+
+
+class TestProcessBatch(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        self.keys = rng.zipf(1.2, 3000) % 200
+        self.weights = rng.uniform(1, 10, 3000)
+        self.times = np.cumsum(rng.exponential(0.1, 3000))
+
+    def replay(self, c, with_kwargs=False):
+        hits = []
+        evicted = []
+        for i, k in enumerate(self.keys.tolist()):
+            kwargs = {'weight': self.weights[i], 't': self.times[i]} \
+                     if with_kwargs else {}
+            hits.append(c.get(k, **kwargs))
+            evicted.append(None if hits[-1] else c.put(k, **kwargs))
+        return hits, evicted
+
+    def assertSameBatch(self, expected, actual, with_kwargs=False):
+        hits, evicted = self.replay(expected, with_kwargs)
+        if with_kwargs:
+            res = actual.process_batch(self.keys, self.weights, self.times)
+        else:
+            res = actual.process_batch(self.keys)
+        self.assertEqual(bool, res[0].dtype)
+        self.assertEqual(hits, res[0].tolist())
+        self.assertEqual(evicted, res[1].tolist())
+        self.assertEqual(expected.dump(), actual.dump())
+
+    def test_policies(self):
+        for policy in (cache.LruCache, cache.FifoCache, cache.PerfectLfuCache,
+                       cache.SegmentedLruCache, cache.InCacheLfuCache):
+            self.assertSameBatch(policy(20), policy(20))
+
+    def test_rand(self):
+        random.seed(0)
+        expected = cache.RandEvictionCache(20)
+        hits, evicted = self.replay(expected)
+        random.seed(0)
+        res = cache.RandEvictionCache(20).process_batch(self.keys)
+        self.assertEqual(hits, res[0].tolist())
+        self.assertEqual(evicted, res[1].tolist())
+
+    def test_grd(self):
+        self.assertSameBatch(cache.GreedyCache(20), cache.GreedyCache(20),
+                             with_kwargs=True)
+        self.assertRaises(ValueError, cache.GreedyCache(20).process_batch,
+                          self.keys)
+
+    def test_wrapped(self):
+        self.assertSameBatch(
+                cache.insert_after_k_hits_cache(cache.LruCache(20), k=2),
+                cache.insert_after_k_hits_cache(cache.LruCache(20), k=2))
+
+    def test_invalid_length(self):
+        c = cache.LruCache(2)
+        self.assertRaises(ValueError, c.process_batch, [1, 2], [1])
+        self.assertRaises(ValueError, c.process_batch, [1, 2], None, [1])
+
+    def test_empty(self):
+        hits, evicted = cache.LruCache(2).process_batch([])
+        self.assertEqual(0, len(hits))
+        self.assertEqual(0, len(evicted))
+
 
 class TestLruCache(unittest.TestCase):
 
@@ -693,6 +887,273 @@ class TestPerfectLfuCache(unittest.TestCase):
         self.assertEquals(len(c), 0)
         self.assertEquals(c.dump(), [])
 
+    def test_tie_breaking(self):
+        c = cache.PerfectLfuCache(2)
+        for k in (1, 2, 3):
+            c.get(k)
+        c.put(1)
+        c.put(2)
+        # All items have equal frequency: the one requested first is evicted
+        self.assertEqual(c.put(3), 1)
+        self.assertEqual(c.dump(), [3, 2])
+        c.get(1)
+        self.assertEqual(c.put(1), 2)
+        self.assertEqual(c.dump(), [1, 3])
+
+    def test_tie_breaking_insertion_order(self):
+        c = cache.PerfectLfuCache(2)
+        # Items put without being requested first have the same frequency
+        # and time of first request
+        c.put(18)
+        c.put(2)
+        self.assertEqual(c.put(3), 3)
+        c.get(7)
+        self.assertEqual(c.put(7), 18)
+        self.assertEqual(c.dump(), [7, 2])
+
+    def test_remove(self):
+        c = cache.PerfectLfuCache(3)
+        for k in (1, 2, 'a'):
+            c.get(k)
+            c.put(k)
+        self.assertTrue(c.remove(1))
+        self.assertFalse(c.remove(1))
+        self.assertEqual(len(c), 2)
+        # Counters are retained after removal
+        c.get(1)
+        self.assertIsNone(c.put(1))
+        self.assertEqual(c.dump(), [1, 'a', 2])
+        c.get('a')
+        c.get('a')
+        self.assertEqual(c.dump(), ['a', 1, 2])
+        c.get(5)
+        self.assertEqual(c.put(5), 2)
+
+
+class BaselineGreedyCache(object):
+    """GreedyCache as originally implemented, with linear weights halved one
+    by one and eviction by linear scan. Items with identical weights, which
+    were evicted in set iteration order, are evicted in insertion order as
+    by GreedyCache"""
+
+    def __init__(self, maxlen, beta=0.5, W=10**200):
+        self.maxlen = maxlen
+        self.beta = beta
+        self.W = W
+        self.cache = set()
+        self.weight = collections.defaultdict(float)
+        self.last = 0.0
+        self.inserted = {}
+        self.n_inserted = 0
+
+    def put(self, k, weight, t):
+        if k in self.cache:
+            return None
+        factor = math.exp(self.beta * (t - self.last))
+        self.last = t
+        self.weight[k] += factor * weight
+        if self.weight[k] > self.W:
+            for content in self.weight:
+                self.weight[content] /= 2
+        self.cache.add(k)
+        self.n_inserted += 1
+        self.inserted[k] = self.n_inserted
+        if len(self.cache) > self.maxlen:
+            evicted = min(self.cache,
+                          key=lambda x: (self.weight[x], self.inserted[x]))
+            self.cache.remove(evicted)
+            return evicted
+        return None
+
+
+class TestGreedyCache(unittest.TestCase):
+
+    def assertSameEvictions(self, maxlen, trace, **kwargs):
+        c = cache.GreedyCache(maxlen, **kwargs)
+        baseline = BaselineGreedyCache(maxlen, **kwargs)
+        for k, weight, t in trace:
+            self.assertEqual(baseline.put(k, weight, t),
+                             c.put(k, weight=weight, t=t))
+
+    def test_same_evictions_near_ties(self):
+        # Weights one ulp apart
+        c = cache.GreedyCache(2, beta=0)
+        c.put(1, t=0, weight=15.01787930151486)
+        c.put(2, t=0, weight=15.017879301514856)
+        self.assertEqual(2, c.put(3, t=0, weight=20))
+        random.seed(1)
+        weights = [15.017879301514856, 15.01787930151486, 7.508939650757428,
+                   30.035758603029712, 1.0]
+        trace = [(random.randint(1, 40), random.choice(weights), 0)
+                 for _ in range(5000)]
+        self.assertSameEvictions(10, trace, beta=0)
+
+    def test_same_evictions(self):
+        random.seed(1)
+        t = 0.0
+        trace = []
+        for _ in range(5000):
+            t += random.expovariate(10)
+            trace.append((random.randint(1, 60), random.uniform(1, 1000), t))
+        self.assertSameEvictions(10, trace, beta=0.5)
+        # Weights halved many times
+        self.assertSameEvictions(10, trace, beta=0.5, W=10**4)
+
+    def test_put_get(self):
+        c = cache.GreedyCache(3, beta=0)
+        self.assertEqual(len(c), 0)
+        self.assertIsNone(c.put(1, t=0, weight=10))
+        self.assertIsNone(c.put(2, t=1, weight=1))
+        self.assertIsNone(c.put(3, t=2, weight=100))
+        self.assertEqual(len(c), 3)
+        self.assertTrue(c.get(2))
+        # 4 is lighter than every cached item, hence evicted immediately
+        self.assertEqual(c.put(4, t=3, weight=0.5), 4)
+        self.assertFalse(c.has(4))
+        # Weight accumulates across insertions: 4 now weighs 2.5
+        self.assertEqual(c.put(4, t=4, weight=2), 2)
+        self.assertEqual(set(c.dump()), {1, 3, 4})
+        self.assertIsNone(c.put(4, t=5, weight=1000))
+        c.clear()
+        self.assertEqual(len(c), 0)
+        self.assertEqual(c.dump(), [])
+
+    def test_remove(self):
+        c = cache.GreedyCache(2, beta=0)
+        c.put(1, t=0, weight=1)
+        c.put(2, t=1, weight=2)
+        self.assertTrue(c.remove(1))
+        self.assertFalse(c.remove(1))
+        self.assertIsNone(c.put(3, t=2, weight=3))
+        self.assertEqual(c.put(4, t=3, weight=4), 2)
+        self.assertEqual(set(c.dump()), {3, 4})
+
+    def test_tie_breaking(self):
+        c = cache.GreedyCache(2, beta=0)
+        c.put(1, t=0, weight=1)
+        c.put(2, t=0, weight=1)
+        self.assertEqual(c.put(3, t=0, weight=1), 1)
+        self.assertEqual(c.put(4, t=0, weight=1), 2)
+
+    def test_rescale(self):
+        c = cache.GreedyCache(2, beta=0, W=100)
+        c.put(1, t=0, weight=60)
+        c.put(2, t=0, weight=40)
+        # All weights are halved when 3 exceeds W
+        self.assertEqual(c.put(3, t=0, weight=120), 2)
+        self.assertEqual(c.put(4, t=0, weight=35), 1)
+        self.assertEqual(set(c.dump()), {3, 4})
+
+    def test_no_overflow(self):
+        c = cache.GreedyCache(2, beta=0.5)
+        c.put(1, t=0, weight=1)
+        # exp(beta*t) would overflow a float at these timestamps
+        c.put(2, t=10 ** 4, weight=1)
+        self.assertEqual(c.put(3, t=2 * 10 ** 4, weight=1), 1)
+        self.assertEqual(c.put(4, t=2 * 10 ** 4, weight=1), 4)
+        self.assertEqual(set(c.dump()), {2, 3})
+
+
+class TestGdsfCache(unittest.TestCase):
+
+    def test_put_get(self):
+        c = cache.GreedyDualSizeFrequencyCache(2)
+        self.assertIsNone(c.put(1, weight=1))
+        self.assertIsNone(c.put(2, weight=5))
+        self.assertEqual([2, 1], c.dump())
+        self.assertTrue(c.get(1))
+        self.assertFalse(c.get(3))
+        self.assertEqual(1, c.put(3, weight=1))
+        self.assertEqual([2, 3], c.dump())
+        self.assertTrue(c.get(3))
+        self.assertEqual(3, c.put(4, weight=1))
+        self.assertEqual([4, 2], c.dump())
+        # Same priority, the item inserted earliest is evicted
+        self.assertEqual(2, c.put(5, weight=1))
+        self.assertEqual([5, 4], c.dump())
+
+    def test_remove(self):
+        c = cache.GreedyDualSizeFrequencyCache(2)
+        c.put(1, weight=1)
+        c.put(2, weight=2)
+        self.assertTrue(c.remove(1))
+        self.assertFalse(c.remove(1))
+        self.assertFalse(c.has(1))
+        self.assertIsNone(c.put(3, weight=3))
+        self.assertEqual([3, 2], c.dump())
+        c.clear()
+        self.assertEqual(0, len(c))
+
+
+class TestWeightedLruKCache(unittest.TestCase):
+
+    def test_put_get(self):
+        c = cache.WeightedLruKCache(2, k=2)
+        self.assertIsNone(c.put(1, weight=1))
+        self.assertFalse(c.get(2))
+        self.assertIsNone(c.put(2, weight=10))
+        self.assertTrue(c.get(1))
+        self.assertFalse(c.get(3))
+        # 2 was referenced only once
+        self.assertEqual(2, c.put(3, weight=1))
+        self.assertFalse(c.get(2))
+        self.assertEqual(3, c.put(2, weight=10))
+        self.assertEqual([2, 1], c.dump())
+        self.assertFalse(c.get(4))
+        self.assertEqual(1, c.put(4, weight=1))
+        self.assertEqual([2, 4], c.dump())
+
+    def test_lru_k(self):
+        # With uniform weights and no hits, the policy evicts in LRU order
+        c = cache.WeightedLruKCache(3, k=2)
+        for i in range(3):
+            c.get(i)
+            c.put(i)
+        for i in range(3, 10):
+            self.assertFalse(c.get(i))
+            self.assertEqual(i - 3, c.put(i))
+
+    def test_history_bounded(self):
+        c = cache.WeightedLruKCache(2, k=2, memory=3)
+        for i in range(100):
+            if not c.get(i):
+                c.put(i)
+        self.assertEqual(2, len(c))
+        # History of the items in the cache and of the last 3 items evicted
+        self.assertEqual(set([99, 98, 97, 96, 95]), set(c._history))
+
+    def test_history_retained(self):
+        c = cache.WeightedLruKCache(2, k=2, memory=1)
+        c.get(1)
+        c.put(1)
+        c.get(2)
+        c.put(2)
+        c.get(3)
+        # 1 is evicted and its history retained, so that its next reference
+        # is its second one
+        self.assertEqual(1, c.put(3))
+        c.get(1)
+        self.assertEqual(2, c.put(1))
+        self.assertEqual(2, len(c._history[1]))
+        # The history of 2, just evicted, is retained until another item not
+        # in the cache is referenced
+        self.assertIn(2, c._history)
+        c.get(4)
+        self.assertEqual(set([1, 3, 4]), set(c._history))
+
+    def test_no_memory(self):
+        c = cache.WeightedLruKCache(2, k=2, memory=0)
+        for i in range(10):
+            if not c.get(i):
+                c.put(i)
+        self.assertEqual(set(c.dump()), set(c._history))
+
+    def test_invalid_k(self):
+        self.assertRaises(ValueError, cache.WeightedLruKCache, 2, k=0)
+
+    def test_invalid_memory(self):
+        self.assertRaises(ValueError, cache.WeightedLruKCache, 2, memory=-1)
+
 
 class TestInsertAfterKHits(unittest.TestCase):
 
@@ -804,6 +1265,67 @@ class TestInsertAfterKHits(unittest.TestCase):
 
 
 
+class TestTinyLfu(unittest.TestCase):
+
+    def test_sketch(self):
+        sketch = cache.policies._CountMinSketch(64, depth=4, seed=0)
+        for k in range(20):
+            for _ in range(k):
+                sketch.add(k)
+        sketch.add('a')
+        for k in range(20):
+            self.assertGreaterEqual(sketch.estimate(k), k)
+        self.assertGreaterEqual(sketch.estimate('a'), 1)
+        # Counters are plain integers, not items of a byte buffer
+        self.assertIsInstance(sketch.estimate(19), numbers.Integral)
+        sketch_copy = pickle.loads(pickle.dumps(sketch))
+        sketch_copy.add(19)
+        self.assertEqual(sketch.estimate(19) + 1, sketch_copy.estimate(19))
+        sketch.clear()
+        self.assertEqual(0, sketch.estimate(10))
+
+    def test_aging(self):
+        sketch = cache.policies._CountMinSketch(64, sample_size=10, seed=0)
+        for _ in range(9):
+            sketch.add(1)
+        self.assertEqual(9, sketch.estimate(1))
+        sketch.add(1)
+        self.assertEqual(5, sketch.estimate(1))
+        for _ in range(5):
+            sketch.add(1)
+        self.assertEqual(5, sketch.estimate(1))
+
+    def test_admission(self):
+        c = cache.tinylfu_cache(cache.LruCache(2), seed=0)
+        for k in (1, 1, 1, 2, 2):
+            if not c.get(k):
+                c.put(k)
+        self.assertEqual([2, 1], c.dump())
+        # 3 was requested less often than 1, the LRU victim
+        self.assertFalse(c.get(3))
+        self.assertIsNone(c.put(3))
+        self.assertEqual([2, 1], c.dump())
+        for _ in range(4):
+            c.get(3)
+        self.assertEqual(1, c.put(3))
+        self.assertEqual([3, 2], c.dump())
+        c.clear()
+        self.assertEqual(0, c._sketch.estimate(3))
+
+    def test_registered_policy(self):
+        c = CACHE_POLICY['TINY_LFU'](10, policy='SLRU', segments=2)
+        self.assertIsInstance(c, cache.SegmentedLruCache)
+        self.assertEqual(10, c.maxlen)
+        trace = np.random.RandomState(0).zipf(1.2, 2000) % 100
+        hits, _ = c.process_batch(trace)
+        self.assertEqual(len(trace), len(hits))
+        self.assertLessEqual(len(c), 10)
+
+    def test_unsupported_policy(self):
+        self.assertRaises(TypeError, cache.tinylfu_cache,
+                          cache.RandEvictionCache(10))
+
+
 class TestRandInsert(unittest.TestCase):
 
     def test_rand_insert(self):
@@ -965,6 +1487,27 @@ class TestTtlCache(unittest.TestCase):
         curr_time = 7
         self.assertIsNone(c.put(5, ttl=12))
 
+    def test_non_monotone_ttl(self):
+        curr_time = 0
+        f_time = lambda: curr_time
+        c = cache.ttl_cache(cache.LruCache(1000), f_time)
+        rng = np.random.RandomState(0)
+        expiry = {}
+        for k in range(500):
+            ttl = float(rng.randint(1, 100))
+            c.put(k, ttl=ttl)
+            expiry[k] = ttl
+        # Refresh some items, extending their expiration time
+        for k in range(0, 500, 7):
+            c.put(k, ttl=150)
+            expiry[k] = 150
+        c.put('a', ttl=150)
+        expiry['a'] = 150
+        for curr_time in range(0, 200, 10):
+            expected = {k for k, e in expiry.items() if e >= curr_time}
+            self.assertEqual(expected, {k for k, _ in c.dump()})
+        self.assertLessEqual(len(c._exp_heap), 2 * len(expiry) + 64)
+
     def test_incorrect_params(self):
         self.assertRaises(TypeError, cache.ttl_cache, 'cache', lambda: 1)
         self.assertRaises(TypeError, cache.ttl_cache, cache.FifoCache(4), 'function')
@@ -987,29 +1530,29 @@ class TestTtlCache(unittest.TestCase):
         c.put(3)
         curr_time = 1000
         dump = c.dump()
-        self.assertIn((1, np.infty), dump)
-        self.assertIn((2, np.infty), dump)
-        self.assertIn((3, np.infty), dump)
+        self.assertIn((1, np.inf), dump)
+        self.assertIn((2, np.inf), dump)
+        self.assertIn((3, np.inf), dump)
         c.put(1, ttl=100)
         curr_time = 2000
         dump = c.dump()
         self.assertEqual(len(dump), 3)
-        self.assertIn((1, np.infty), dump)
-        self.assertIn((2, np.infty), dump)
-        self.assertIn((3, np.infty), dump)
+        self.assertIn((1, np.inf), dump)
+        self.assertIn((2, np.inf), dump)
+        self.assertIn((3, np.inf), dump)
         c.put(4, ttl=200)
         dump = c.dump()
         self.assertEqual(len(dump), 4)
         self.assertEqual(dump[0], (4, 2200))
-        self.assertIn((1, np.infty), dump)
-        self.assertIn((2, np.infty), dump)
-        self.assertIn((3, np.infty), dump)
+        self.assertIn((1, np.inf), dump)
+        self.assertIn((2, np.inf), dump)
+        self.assertIn((3, np.inf), dump)
         curr_time = 3000
         dump = c.dump()
         self.assertEqual(len(dump), 3)
-        self.assertIn((1, np.infty), dump)
-        self.assertIn((2, np.infty), dump)
-        self.assertIn((3, np.infty), dump)
+        self.assertIn((1, np.inf), dump)
+        self.assertIn((2, np.inf), dump)
+        self.assertIn((3, np.inf), dump)
 
     def test_clear(self):
         curr_time = 1
@@ -2,6 +2,7 @@
 from __future__ import division
 import random
 
+import heapq
 import collections
 import numpy as np
 import copy
@@ -16,18 +17,64 @@ __all__ = [
 	   'PopularityDistance',
 		   ]
 
+# Placements whose gain is lower than this are never made
+MIN_GAIN = 10e-6
+
 @register_strategy('PD')
 class PopularityDistance(object):
+	"""Offline placement of contents greedily maximising the product of the
+	popularity of a content at a cache and its distance from the closest
+	copy upstream.
+
+	Popularity, distance and placement are stored in arrays whose rows are
+	caches, ordered as *caches*, and whose columns are contents, ordered as
+	*contents*. Rows and columns of a node or content are looked up in
+	*cache_index* and *content_index*.
+	"""
+
 	def __init__(self, shortest_path, link_weight, cache_size, contents, content_source, popularity):
+		"""Constructor
+
+		Parameters
+		----------
+		shortest_path : dict of dicts
+			Shortest path between any pair of nodes
+		link_weight : dict
+			Weight of each directed link
+		cache_size : dict
+			Size of the cache of each node with a cache
+		contents : iterable
+			All contents
+		content_source : dict
+			Source of each content
+		popularity : dict
+			Popularity of contents at each receiver, either as a dict keyed by
+			content or as an array ordered as *contents*
+		"""
 		self.shortest_path = shortest_path
 		self.link_weight = link_weight
 		self.cache_size = cache_size
-		self.contents = contents
+		self.contents = list(contents)
 		self.content_source = content_source
 		self.popularity = popularity
-		self.receivers = self.popularity.keys()
-		self.caches = self.cache_size.keys()
-		self.cache_disc = {v: collections.defaultdict(bool) for v in self.cache_size.keys()}
+		self.receivers = list(self.popularity.keys())
+		self.caches = list(self.cache_size.keys())
+		self.cache_index = {v: x for x, v in enumerate(self.caches)}
+		self.content_index = {c: y for y, c in enumerate(self.contents)}
+		# Contents share their routes with all other contents of their
+		# source, so routes are walked once per source and route quantities
+		# are mapped to contents through the source index of each content
+		self.sources = list(collections.OrderedDict.fromkeys(
+								content_source[c] for c in self.contents))
+		source_index = {s: i for i, s in enumerate(self.sources)}
+		self.source_of = np.array([source_index[content_source[c]]
+								   for c in self.contents], dtype=int)
+		rows = [popularity[r] for r in self.receivers]
+		self.pop = np.array([[p[c] for c in self.contents]
+							 if isinstance(p, dict) else p for p in rows],
+							dtype=float).reshape(len(rows), len(self.contents))
+		self.cache_disc = np.zeros((len(self.caches), len(self.contents)),
+								   dtype=bool)
 
 		self.init_distance()
 		self.init_popularity()
@@ -35,96 +82,123 @@ class PopularityDistance(object):
 		self.logger = logging.getLogger('offline')
 
 	def init_popularity(self):
-		self.cache_pop = {v:collections.defaultdict(float) for v in self.caches}
-		for r in self.receivers:
-			for content in self.contents:
-				popularity = self.popularity[r][content]
-				path = self.shortest_path[r][self.content_source[content]]
-				for u, v in path_links(path):
-					if v in self.caches:
-						self.cache_pop[v][content] += popularity
-						if self.cache_disc[v][content]:
-							break
+		"""Compute the popularity of each content at each cache, i.e. the sum
+		of its popularity at all receivers whose path to its source traverses
+		the cache, when no content is cached.
+		"""
+		# Route-incidence matrices: incidence[r, x, s] is True if the path
+		# from the r-th receiver to the s-th source traverses the x-th cache
+		incidence = np.zeros((len(self.receivers), len(self.caches),
+							  len(self.sources)), dtype=bool)
+		for r, receiver in enumerate(self.receivers):
+			for s, source in enumerate(self.sources):
+				for u, v in path_links(self.shortest_path[receiver][source]):
+					if v in self.cache_index:
+						incidence[r, self.cache_index[v], s] = True
+		# Receivers are summed in order, as adding zeros leaves sums unchanged
+		self.cache_pop = np.zeros((len(self.caches), len(self.contents)))
+		for r in range(len(self.receivers)):
+			self.cache_pop += incidence[r][:, self.source_of] * self.pop[r]
+
 	def init_distance(self):
-		self.dist = {v:collections.defaultdict(float) for v in self.caches}
-		self.rec_dist = {v:collections.defaultdict(float) for v in self.receivers}
-		for content in self.contents:
-			for receiver in self.receivers:
+		"""Compute the distance of each content from its source at each cache,
+		along the path to the first receiver whose path to the source
+		traverses the cache, and at each receiver, when no content is cached.
+		"""
+		dist = np.zeros((len(self.caches), len(self.sources)))
+		has_dist = np.zeros(dist.shape, dtype=bool)
+		rec_dist = np.zeros((len(self.receivers), len(self.sources)))
+		for s, source in enumerate(self.sources):
+			for r, receiver in enumerate(self.receivers):
 				weight = 0.0
-				path = list(reversed(self.shortest_path[receiver][self.content_source[content]]))
+				path = list(reversed(self.shortest_path[receiver][source]))
 				for u, v in path_links(path):
 					weight += self.link_weight[(u, v)]
-					if v in self.caches:
-						if content not in self.dist[v]:
-							self.dist[v][content] = weight
-						if self.cache_disc[v][content]:
-							weight = 0.0
-				else:
-					self.rec_dist[receiver][content] = weight
-
+					if v in self.cache_index:
+						x = self.cache_index[v]
+						if not has_dist[x, s]:
+							dist[x, s] = weight
+							has_dist[x, s] = True
+				rec_dist[r, s] = weight
+		self.dist = dist[:, self.source_of]
+		self.has_dist = has_dist[:, self.source_of]
+		self.rec_dist = rec_dist[:, self.source_of]
 
 	def update(self, cache, content):
+		"""Update popularity and distances after placing a content in a cache
+		"""
+		x, y = self.cache_index[cache], self.content_index[content]
 		path = self.shortest_path[cache][self.content_source[content]]
 		for u, v in path_links(path):
-			if v in self.caches:
-				# print self.cache_pop[v][content], self.cache_pop[cache][content], old[content]
-				# print self.cache_disc[cache][content]
-				self.cache_pop[v][content] -= self.cache_pop[cache][content]
-				if self.cache_disc[v][content]:
+			if v in self.cache_index:
+				z = self.cache_index[v]
+				self.cache_pop[z, y] -= self.cache_pop[x, y]
+				if self.cache_disc[z, y]:
 					break
-		for receiver in self.receivers:
+		for r, receiver in enumerate(self.receivers):
 			weight = 0.0
 			path = list(reversed(self.shortest_path[receiver][cache]))
 			for u, v in path_links(path):
 				weight += self.link_weight[(u, v)]
-				if v in self.caches:
-					if content not in self.dist[v]:
-						self.dist[v][content] = weight
-					if self.cache_disc[v][content]:
+				if v in self.cache_index:
+					z = self.cache_index[v]
+					if not self.has_dist[z, y]:
+						self.dist[z, y] = weight
+						self.has_dist[z, y] = True
+					if self.cache_disc[z, y]:
 						break
 			else:
-				self.rec_dist[receiver][content] = weight
+				self.rec_dist[r, y] = weight
 
 	def cal_res(self):
-		res = 0.0
-		for content in self.contents:
-			for receiver in self.receivers:
-				res += self.popularity[receiver][content] * self.rec_dist[receiver][content]
-		return res
+		"""Return the popularity-weighted distance of contents from receivers
+		"""
+		return float(np.sum(self.pop * self.rec_dist))
 
 
 	def results(self, precision=0.1):
-		choices = {i:[c for c in self.contents] for i in self.caches}
-		while len(choices)>0:
-			max_val = 0.0
-			choice = None
-			for i in choices:
-				if sum(self.cache_disc[i].values())>=self.cache_size[i]:
-					choices.pop(i)
+		"""Greedily place the content with the greatest gain, i.e. product of
+		popularity and distance, in the cache until no placement has gain.
+
+		Gains never increase as contents are placed, so the lazy greedy
+		(CELF) algorithm is used: candidate placements are taken in
+		decreasing order of the gain they had when last computed and only the
+		gain of the next placement is recomputed. If it has not changed, it
+		is the greatest gain, otherwise the placement is pushed back into a
+		heap of placements to take again.
+		"""
+		n_contents = len(self.contents)
+		gain = self.cache_pop * self.dist
+		gain[self.cache_disc] = 0.0
+		# Initial placements are sorted by decreasing gain rather than pushed
+		# into the heap. Ties are broken in cache and content order.
+		candidates = np.flatnonzero(gain >= MIN_GAIN)
+		candidates = candidates[np.argsort(-gain.flat[candidates],
+										   kind='stable')]
+		n_cached = self.cache_disc.sum(axis=1)
+		heap = []
+		k = 0
+		while k < len(candidates) or heap:
+			if k < len(candidates):
+				x, y = divmod(int(candidates[k]), n_contents)
+				top = (-float(gain[x, y]), x, y)
+				if not heap or top < heap[0]:
+					k += 1
 				else:
-					for c in choices[i]:
-						val = self.cache_pop[i][c]*self.dist[i][c]
-						if abs(val)<10e-6:
-							choices[i].remove(c)
-						elif val > max_val:
-							choice = (i,c)
-							max_val = val
-			if abs(max_val)<10e-6:
-				break
-			self.cache_disc[choice[0]][choice[1]] = 1
-			choices[choice[0]].remove(choice[1])
-			if len(choices[choice[0]])<=0:
-				choices.pop(choice[0])
-			self.update(*choice)
-
-			# self.logger.info(now)
+					top = heapq.heappop(heap)
+			else:
+				top = heapq.heappop(heap)
+			old_gain, x, y = top
+			if n_cached[x] >= self.cache_size[self.caches[x]]:
+				continue
+			new_gain = float(self.cache_pop[x, y] * self.dist[x, y])
+			if new_gain < -old_gain:
+				if new_gain >= MIN_GAIN:
+					heapq.heappush(heap, (-new_gain, x, y))
+				continue
+			self.cache_disc[x, y] = True
+			n_cached[x] += 1
+			self.update(self.caches[x], self.contents[y])
 		return {'WEIGHT':{
 			'MEAN': self.cal_res()
 		}}
-
-
-
-
-
-
-
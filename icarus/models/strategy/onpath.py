@@ -131,23 +131,26 @@ class LeaveCopyEverywhere(Strategy):
     def process_event(self, time, receiver, content, log):
         # get all required data
         source = self.view.content_source(content)
-        path = self.view.shortest_path(receiver, source)
+        route = self.view.route(receiver, source)
+        cache_mask = route.cache_mask
         # Route requests to original source and queries caches on the path
         self.controller.start_session(time, receiver, content, log)
-        for u, v in path_links(path):
+        for u, v, i in route.hops:
             self.controller.forward_request_hop(u, v)
-            if self.view.has_cache(v):
+            if cache_mask[i]:
                 if self.controller.get_content(v):
                     serving_node = v
                     break
+        else:
             # No cache hits, get content from source
             self.controller.get_content(v)
             serving_node = v
         # Return content
-        path = list(reversed(self.view.shortest_path(receiver, serving_node)))
-        for u, v in path_links(path):
+        route = self.view.route(receiver, serving_node)
+        cache_mask = route.cache_mask
+        for u, v, i in route.return_hops:
             self.controller.forward_content_hop(u, v)
-            if self.view.has_cache(v):
+            if cache_mask[i]:
                 # insert content
                 self.controller.put_content(v)
         self.controller.end_session()
@@ -176,12 +179,13 @@ class LeaveCopyDown(Strategy):
     def process_event(self, time, receiver, content, log):
         # get all required data
         source = self.view.content_source(content)
-        path = self.view.shortest_path(receiver, source)
+        route = self.view.route(receiver, source)
+        cache_mask = route.cache_mask
         # Route requests to original source and queries caches on the path
         self.controller.start_session(time, receiver, content, log)
-        for u, v in path_links(path):
+        for u, v, i in route.hops:
             self.controller.forward_request_hop(u, v)
-            if self.view.has_cache(v):
+            if cache_mask[i]:
                 if self.controller.get_content(v):
                     serving_node = v
                     break
@@ -190,13 +194,14 @@ class LeaveCopyDown(Strategy):
             self.controller.get_content(v)
             serving_node = v
         # Return content
-        path = list(reversed(self.view.shortest_path(receiver, serving_node)))
+        route = self.view.route(receiver, serving_node)
+        cache_mask = route.cache_mask
         # Leave a copy of the content only in the cache one level down the hit
         # caching node
         copied = False
-        for u, v in path_links(path):
+        for u, v, i in route.return_hops:
             self.controller.forward_content_hop(u, v)
-            if not copied and v != receiver and self.view.has_cache(v):
+            if not copied and i > 0 and cache_mask[i]:
                 self.controller.put_content(v)
                 copied = True
         self.controller.end_session()
@@ -303,12 +308,13 @@ class CacheLessForMore(Strategy):
     def process_event(self, time, receiver, content, log):
         # get all required data
         source = self.view.content_source(content)
-        path = self.view.shortest_path(receiver, source)
+        route = self.view.route(receiver, source)
+        cache_mask = route.cache_mask
         # Route requests to original source and queries caches on the path
         self.controller.start_session(time, receiver, content, log)
-        for u, v in path_links(path):
+        for u, v, i in route.hops:
             self.controller.forward_request_hop(u, v)
-            if self.view.has_cache(v):
+            if cache_mask[i]:
                 if self.controller.get_content(v):
                     serving_node = v
                     break
@@ -317,19 +323,19 @@ class CacheLessForMore(Strategy):
             self.controller.get_content(v)
             serving_node = v
         # Return content
-        path = list(reversed(self.view.shortest_path(receiver, serving_node)))
+        route = self.view.route(receiver, serving_node)
+        nodes = route.nodes
         # get the cache with maximum betweenness centrality
         # if there are more than one cache with max betw then pick the one
         # closer to the receiver
         max_betw = -1
         designated_cache = None
-        for v in path[1:]:
-            if self.view.has_cache(v):
-                if self.betw[v] >= max_betw:
-                    max_betw = self.betw[v]
-                    designated_cache = v
+        for i in reversed(route.cache_positions):
+            if i < len(nodes) - 1 and self.betw[nodes[i]] >= max_betw:
+                max_betw = self.betw[nodes[i]]
+                designated_cache = nodes[i]
         # Forward content
-        for u, v in path_links(path):
+        for u, v, _ in route.return_hops:
             self.controller.forward_content_hop(u, v)
             if v == designated_cache:
                 self.controller.put_content(v)
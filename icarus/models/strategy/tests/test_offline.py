@@ -0,0 +1,78 @@
+import unittest
+
+import networkx as nx
+import numpy as np
+
+import icarus.models as strategy
+from icarus.execution.network import symmetrify_paths
+
+
+class TestPopularityDistance(unittest.TestCase):
+
+    def pd(self, cache_size, popularity):
+        # Topology sketch
+        #
+        # RECEIVER 0 ---- 1 ---- 2 ---- 3 SOURCE
+        #
+        # with caches at nodes 1 and 2 and all links of weight 1
+        topology = nx.path_graph(4)
+        shortest_path = symmetrify_paths(nx.all_pairs_dijkstra_path(topology))
+        link_weight = {}
+        for u, v in topology.edges():
+            link_weight[(u, v)] = link_weight[(v, u)] = 1
+        contents = [1, 2]
+        content_source = {1: 3, 2: 3}
+        return strategy.PopularityDistance(shortest_path, link_weight,
+                                           cache_size, contents,
+                                           content_source, {0: popularity})
+
+    def cached(self, pd):
+        return {v: [c for c, cached in zip(pd.contents, pd.cache_disc[x])
+                    if cached]
+                for v, x in pd.cache_index.items()}
+
+    def test_results(self):
+        pd = self.pd({1: 1, 2: 1}, {1: 0.7, 2: 0.3})
+        x, y = pd.cache_index[1], pd.content_index[1]
+        self.assertAlmostEqual(0.7 * 2 * 1, pd.cache_pop[x, y] * pd.dist[x, y])
+        results = pd.results()
+        self.assertEqual({1: [1], 2: [2]}, self.cached(pd))
+        self.assertAlmostEqual(0.7 * 1 + 0.3 * 2, results['WEIGHT']['MEAN'])
+
+    def test_results_large_caches(self):
+        pd = self.pd({1: 2, 2: 2}, {1: 0.7, 2: 0.3})
+        results = pd.results()
+        # Contents cached at node 1 never reach node 2
+        self.assertEqual({1: [1, 2], 2: []}, self.cached(pd))
+        self.assertAlmostEqual(0.7 * 1 + 0.3 * 1, results['WEIGHT']['MEAN'])
+
+    def test_results_no_gain(self):
+        pd = self.pd({1: 1, 2: 1}, {1: 0.0, 2: 0.0})
+        pd.results()
+        self.assertEqual({1: [], 2: []}, self.cached(pd))
+
+    def test_init(self):
+        # Topology sketch
+        #
+        # RECEIVER 0 ---- 1 ---- 2 SOURCE (content 1)
+        #                 |
+        # RECEIVER 4 ---- 3 SOURCE (content 2)
+        #
+        # with caches at nodes 1 and 3 and links of weight 1 except 1-3
+        topology = nx.Graph([(0, 1), (1, 2), (1, 3), (3, 4)])
+        shortest_path = symmetrify_paths(nx.all_pairs_dijkstra_path(topology))
+        link_weight = {}
+        for u, v in topology.edges():
+            link_weight[(u, v)] = link_weight[(v, u)] = 1
+        link_weight[(1, 3)] = link_weight[(3, 1)] = 10
+        pd = strategy.PopularityDistance(shortest_path, link_weight,
+                                         {1: 1, 3: 1}, [1, 2], {1: 2, 2: 3},
+                                         {0: {1: 0.1, 2: 0.2},
+                                          4: np.array([0.3, 0.4])})
+        x, z = pd.cache_index[1], pd.cache_index[3]
+        np.testing.assert_allclose(pd.cache_pop[[x, z]],
+                                   [[0.4, 0.2], [0.3, 0.6]])
+        np.testing.assert_allclose(pd.dist[[x, z]], [[1, 10], [11, 0]])
+        np.testing.assert_allclose(pd.rec_dist[[pd.receivers.index(0),
+                                                pd.receivers.index(4)]],
+                                   [[2, 11], [12, 1]])
@@ -1,3 +1,4 @@
+import collections
 import unittest
 
 import fnss
@@ -36,6 +37,7 @@ class TestOnPath(unittest.TestCase):
     def setUp(self):
         topology = self.on_path_topology()
         model = NetworkModel(topology, cache_policy={'name': 'FIFO'})
+        self.model = model
         self.view = NetworkView(model)
         self.controller = NetworkController(model)
         self.collector = DummyCollector(self.view)
@@ -74,6 +76,25 @@ class TestOnPath(unittest.TestCase):
         self.assertSetEqual(exp_req_hops, set(req_hops))
         self.assertSetEqual(exp_cont_hops, set(cont_hops))
 
+    def test_lce_get_once_per_cache(self):
+        gets = collections.Counter()
+
+        def counted_get(v, get):
+            def f(*args, **kwargs):
+                gets[v] += 1
+                return get(*args, **kwargs)
+            return f
+        for v, cache in self.model.cache.items():
+            cache.get = counted_get(v, cache.get)
+        hr = strategy.LeaveCopyEverywhere(self.view, self.controller)
+        # receiver 0 requests 2, expect miss at all caches on the path
+        hr.process_event(1, 0, 2, True)
+        self.assertEqual({1: 1, 2: 1, 3: 1}, gets)
+        # receiver 5 requests 2, expect hit at the first cache
+        gets.clear()
+        hr.process_event(1, 5, 2, True)
+        self.assertEqual({2: 1}, gets)
+
     def test_lce_different_content(self):
         hr = strategy.LeaveCopyEverywhere(self.view, self.controller)
         # receiver 0 requests 2, expect miss
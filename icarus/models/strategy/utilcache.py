@@ -7,7 +7,7 @@ import numpy as np
 # import logging
 
 from icarus.registry import register_strategy
-from icarus.util import inheritdoc, path_links
+from icarus.util import inheritdoc
 
 from .base import Strategy
 
@@ -56,13 +56,14 @@ class QStrategy(Strategy):
 	def process_event(self, time, receiver, content, log):
 		# get all required data
 		source = self.view.content_source(content)
-		path = self.view.shortest_path(receiver, source)
+		route = self.view.route(receiver, source)
+		cache_mask = route.cache_mask
 		record = collections.defaultdict(bool)
 		# Route requests to original source and queries caches on the path
 		self.controller.start_session(time, receiver, content, log)
-		for u, v in path_links(path):
+		for u, v, i in route.hops:
 			self.controller.forward_request_hop(u, v)
-			if self.view.has_cache(v):
+			if cache_mask[i]:
 				if random.random() < self._qs[v].q(content):
 					record[v]=True
 					if self.controller.get_content(v):
@@ -76,14 +77,14 @@ class QStrategy(Strategy):
 			self.controller.get_content(v)
 			serving_node = v
 		# Return content
-		path = list(reversed(self.view.shortest_path(receiver, serving_node)))
-		weight = 0
-		for u, v in path_links(path):
+		route = self.view.route(receiver, serving_node)
+		cache_mask = route.cache_mask
+		return_weight = route.return_weight
+		for u, v, i in route.return_hops:
 			self.controller.forward_content_hop(u, v)
-			weight += self.view.link_weight(u,v)
-			if self.view.has_cache(v):
+			if cache_mask[i]:
 				# insert content
-				self._qs[v].update(content, weight)
+				self._qs[v].update(content, return_weight[i])
 				if record[v]:
 					content = self.controller.put_content(v)
 					# if content!=None:
@@ -107,12 +108,13 @@ class GreedyStrategy(Strategy):
 	def process_event(self, time, receiver, content, log):
 		# get all required data
 		source = self.view.content_source(content)
-		path = self.view.shortest_path(receiver, source)
+		route = self.view.route(receiver, source)
+		cache_mask = route.cache_mask
 		# Route requests to original source and queries caches on the path
 		self.controller.start_session(time, receiver, content, log)
-		for u, v in path_links(path):
+		for u, v, i in route.hops:
 			self.controller.forward_request_hop(u, v)
-			if self.view.has_cache(v):
+			if cache_mask[i]:
 				if self.controller.get_content(v):
 					serving_node = v
 					break
@@ -121,12 +123,12 @@ class GreedyStrategy(Strategy):
 			self.controller.get_content(v)
 			serving_node = v
 		# Return content
-		path = list(reversed(self.view.shortest_path(receiver, serving_node)))
-		weight = 0
-		for u, v in path_links(path):
+		route = self.view.route(receiver, serving_node)
+		cache_mask = route.cache_mask
+		return_weight = route.return_weight
+		for u, v, i in route.return_hops:
 			self.controller.forward_content_hop(u, v)
-			weight += self.view.link_weight(u, v)
-			if self.view.has_cache(v):
+			if cache_mask[i]:
 				# insert content
-				self.controller.put_content(v, t=time, weight=weight)
+				self.controller.put_content(v, t=time, weight=return_weight[i])
 		self.controller.end_session()
@@ -4,7 +4,12 @@ The orchestrator is responsible for scheduling experiments specified in the
 user-provided settings.
 """
 from __future__ import division
+import os
+import re
+import math
 import time
+import hashlib
+import threading
 import collections
 import multiprocessing as mp
 import logging
@@ -16,17 +21,49 @@ import networkx as nx
 import random
 
 from icarus.execution import exec_experiment, exec_offline_experiment
+from icarus.execution.network import symmetrify_paths
 from icarus.registry import TOPOLOGY_FACTORY, CACHE_PLACEMENT, CONTENT_PLACEMENT, \
-							CACHE_POLICY, WORKLOAD, DATA_COLLECTOR, STRATEGY
+							CACHE_POLICY, WORKLOAD, DATA_COLLECTOR, STRATEGY, \
+							PROFILER
 from icarus.results import ResultSet
-from icarus.util import SequenceNumber, timestr
+from icarus.scenarios import MemmapWorkload
+from icarus.util import SequenceNumber, Tree, PhaseTimer, timestr
 
 
-__all__ = ['Orchestrator', 'run_scenario']
+__all__ = ['Orchestrator', 'run_scenario', 'warmup_key', 'workload_key',
+		   'scenario_key', 'TIMING']
 
 
 logger = logging.getLogger('orchestration')
 
+# Key of the results tree of each experiment under which run_scenario stores
+# the measures of the phases of the experiment. No data collector can have
+# this name
+TIMING = 'TIMING'
+
+# Relative cost of processing a request with each cache replacement policy,
+# with respect to LRU, used to estimate the cost of experiments. Policies not
+# listed here are assumed to cost as much as LRU
+POLICY_COST = {
+	'PERFECT_LFU': 1.5,
+	'GRD': 1.5,
+	'GDSF': 1.5,
+	'SLRU': 1.5,
+	'WEIGHTED_LRU_K': 2.0,
+	'IN_CACHE_LFU': 10.0,
+}
+
+# Number of nodes of the topologies generated by each topology factory, as a
+# function of its parameters, used to estimate the cost of experiments without
+# building their topologies. The size of topologies not listed here is not
+# taken into account
+TOPOLOGY_NODES = {
+	'PATH': lambda n, **kwargs: n,
+	'TREE': lambda k, h, **kwargs: sum(k ** d for d in range(h + 1)),
+	'RING': lambda n, **kwargs: 2 * n + 1,
+	'MESH': lambda n, m, **kwargs: 2 * n + m,
+}
+
 
 class Orchestrator(object):
 	"""Orchestrator.
@@ -35,7 +72,7 @@ class Orchestrator(object):
 	aggregate results.
 	"""
 
-	def __init__(self, settings, summary_freq=4):
+	def __init__(self, settings, summary_freq=4, results_log=None):
 		"""Constructor
 
 		Parameters
@@ -45,15 +82,29 @@ class Orchestrator(object):
 		summary_freq : int
 			Frequency (in number of experiment) at which summary messages
 			are displayed
+		results_log : ResultLog, optional
+			Log to which the results of each experiment are appended as soon
+			as it completes. Results already in the log, e.g. written by an
+			interrupted run, are loaded and their experiments are not run again
 		"""
 		self.settings = settings
 		self.results = ResultSet()
+		self.results_log = results_log
+		if results_log is not None:
+			for params, results in results_log:
+				self.results.add(params, results)
 		self.seq = SequenceNumber()
 		self.exp_durations = collections.deque(maxlen=30)
+		# Measures of the phases of all completed experiments, summed by phase
+		self.phase_times = collections.OrderedDict()
+		self.peak_rss = None
 		self.n_success = 0
 		self.n_fail = 0
 		self.summary_freq = summary_freq
 		self._stop = False
+		# Set when all experiments scheduled on the pool have completed
+		self._done = threading.Event()
+		self._n_pending = 0
 		if self.settings.PARALLEL_EXECUTION:
 			self.pool = mp.Pool(settings.N_PROCESSES)
 
@@ -66,19 +117,128 @@ class Orchestrator(object):
 			self.pool.terminate()
 			self.pool.join()
 
+	def estimate_cost(self, experiment):
+		"""Estimate the relative cost of running an experiment
+
+		The cost is estimated as the product of the number of requests of the
+		workload, the logarithm of the number of nodes of the topology, which
+		approximates the length of paths, and the relative cost of the cache
+		replacement policy. It is computed from the experiment parameters
+		only, without building the topology.
+
+		Parameters
+		----------
+		experiment : Tree
+			experiment parameters tree
+
+		Returns
+		-------
+		cost : float
+			The estimated cost, only meaningful compared to the costs of other
+			experiments
+		"""
+		workload = experiment['workload'] if 'workload' in experiment else {}
+		n_events = workload.get('n_warmup', 0) + workload.get('n_measured', 0)
+		cost = max(n_events, 1)
+		n_nodes = self._topology_nodes(experiment)
+		if n_nodes is not None:
+			cost *= math.log(n_nodes + 1)
+		if 'cache_policy' in experiment:
+			cost *= POLICY_COST.get(experiment['cache_policy'].get('name'), 1.0)
+		return cost
+
+	def _topology_nodes(self, experiment):
+		"""Return the number of nodes of the topology of an experiment, or
+		None if it cannot be inferred from the topology parameters"""
+		if 'topology' not in experiment:
+			return None
+		topology_spec = dict(experiment['topology'])
+		topology_name = topology_spec.pop('name', None)
+		if topology_name not in TOPOLOGY_NODES:
+			return None
+		try:
+			return TOPOLOGY_NODES[topology_name](**topology_spec)
+		except TypeError as e:
+			logger.debug('Cannot estimate the size of topology %s: %s',
+						 topology_name, e)
+			return None
+
+	def _add_timing(self, timing):
+		"""Add the measures of the phases of a completed experiment to those
+		of all completed experiments"""
+		timing = dict(timing)
+		rss = timing.pop('PROCESS_PEAK_RSS', None)
+		if rss is not None:
+			self.peak_rss = max(self.peak_rss, rss) \
+							if self.peak_rss is not None else rss
+		for name, phase in timing.items():
+			total = self.phase_times.setdefault(name, collections.Counter())
+			total['WALL_TIME'] += phase.get('WALL_TIME', 0)
+			total['CPU_TIME'] += phase.get('CPU_TIME', 0)
+			if 'EVENTS' in phase:
+				total['EVENTS'] += phase['EVENTS']
+				total['EVENTS_WALL_TIME'] += phase['WALL_TIME']
+
+	def _timing_summary(self):
+		"""Return a summary of the measures of the phases of all completed
+		experiments"""
+		wall_time = sum(p['WALL_TIME'] for p in self.phase_times.values())
+		cpu_time = sum(p['CPU_TIME'] for p in self.phase_times.values())
+		if wall_time <= 0:
+			return 'N/A'
+		summary = 'Time: %s | CPU/wall: %.0f%%' % (', '.join(
+				'%s %.1fs (%.0f%%)' % (name, p['WALL_TIME'],
+									   100 * p['WALL_TIME'] / wall_time)
+				for name, p in self.phase_times.items()),
+				100 * cpu_time / wall_time)
+		throughput = ['%s %.0f' % (name, p['EVENTS'] / p['EVENTS_WALL_TIME'])
+					  for name, p in self.phase_times.items()
+					  if p['EVENTS_WALL_TIME'] > 0]
+		if throughput:
+			summary += ' | Events/s: %s' % ', '.join(throughput)
+		if self.peak_rss is not None:
+			summary += ' | Peak RSS: %.0f MB' % (self.peak_rss / 2**20)
+		return summary
+
+	def _job_done(self):
+		"""Record the completion of an experiment scheduled on the pool"""
+		self._n_pending -= 1
+		if self._n_pending <= 0:
+			self._done.set()
+
 	def run(self):
 		"""Run the orchestrator.
 
 		This call is blocking, whether multiple processes are used or not. This
 		methods returns only after all experiments are executed.
+
+		Experiments are dispatched in decreasing order of estimated cost, so
+		that the longest experiments do not start last and leave the other
+		processes idle at the end of the campaign.
 		"""
-		# Create queue of experiment configurations
-		queue = collections.deque(self.settings.EXPERIMENT_QUEUE)
+		# Experiments whose results are already available, e.g. loaded from
+		# the log of an interrupted run, are not run again
+		completed = collections.Counter(_params_key(params, lambda path: True)
+										for params, _ in self.results)
+		n_completed = sum(completed.values())
+		# Create queue of experiment configurations, longest first
+		queue = collections.deque()
+		for experiment in sorted(self.settings.EXPERIMENT_QUEUE,
+								 key=self.estimate_cost, reverse=True):
+			key = _params_key(experiment, lambda path: True)
+			for _ in range(self.settings.N_REPLICATIONS):
+				if completed[key] > 0:
+					completed[key] -= 1
+				else:
+					queue.append(experiment)
 		# Calculate number of experiments and number of processes
-		self.n_exp = len(queue) * self.settings.N_REPLICATIONS
+		self.n_exp = len(queue)
 		self.n_proc = self.settings.N_PROCESSES \
 					  if self.settings.PARALLEL_EXECUTION \
 					  else 1
+		if n_completed > 0:
+			logger.info('Resuming simulations: %d experiments already completed'
+						% n_completed)
 		logger.info('Starting simulations: %d experiments, %d process(es)'
 					% (self.n_exp, self.n_proc))
 
@@ -90,31 +250,25 @@ class Orchestrator(object):
 			callbacks = {"callback": self.experiment_callback}
 			if sys.version_info > (3, 2):
 				callbacks["error_callback"] = self.error_callback
-			# This job queue is used only to keep track of which jobs have
-			# finished and which are still running. Currently this information
-			# is used only to handle keyboard interrupts correctly
-			job_queue = collections.deque()
-			# Schedule experiments from the queue
+			self._n_pending = self.n_exp
+			if self._n_pending == 0:
+				self._done.set()
+			# Schedule experiments from the queue. Workers take jobs in the
+			# order in which they are submitted
 			while queue:
 				experiment = queue.popleft()
-				for _ in range(self.settings.N_REPLICATIONS):
-					job_queue.append(self.pool.apply_async(run_scenario,
-							args=(self.settings, experiment,
-								  self.seq.assign(), self.n_exp),
-							**callbacks))
+				self.pool.apply_async(run_scenario,
+						args=(self.settings, experiment,
+							  self.seq.assign(), self.n_exp),
+						**callbacks)
 			self.pool.close()
-			# This solution is probably not optimal, but at least makes
-			# KeyboardInterrupt work fine, which is crucial if launching the
-			# simulation remotely via screen.
-			# What happens here is that we keep waiting for possible
-			# KeyboardInterrupts till the last process terminates successfully.
-			# We may have to wait up to 5 seconds after the last process
-			# terminates before exiting, which is really negligible
+			# Callbacks set the event as soon as the last experiment completes.
+			# Waiting with a timeout only keeps KeyboardInterrupt working on
+			# Python 2, where waiting on an event without a timeout cannot be
+			# interrupted
 			try:
-				while job_queue:
-					job = job_queue.popleft()
-					while not job.ready():
-						time.sleep(5)
+				while not self._done.wait(60):
+					pass
 			except KeyboardInterrupt:
 				self.pool.terminate()
 			self.pool.join()
@@ -122,15 +276,16 @@ class Orchestrator(object):
 		else:  # Single-process execution
 			while queue:
 				experiment = queue.popleft()
-				for _ in range(self.settings.N_REPLICATIONS):
-					self.experiment_callback(run_scenario(self.settings,
-											experiment, self.seq.assign(),
-											self.n_exp))
-					if self._stop:
-						self.stop()
+				self.experiment_callback(run_scenario(self.settings,
+										experiment, self.seq.assign(),
+										self.n_exp))
+				if self._stop:
+					self.stop()
 
 		logger.info('END | Planned: %d, Completed: %d, Succeeded: %d, Failed: %d',
 					self.n_exp, self.n_fail + self.n_success, self.n_success, self.n_fail)
+		if self.phase_times:
+			logger.info('END | %s', self._timing_summary())
 
 	def error_callback(self, msg):
 		"""Callback method called in case of error in Python > 3.2
@@ -142,6 +297,7 @@ class Orchestrator(object):
 		"""
 		logger.error("FAILURE | Experiment failed: {}".format(msg))
 		self.n_fail += 1
+		self._job_done()
 
 	def experiment_callback(self, args):
 		"""Callback method called by run_scenario
@@ -151,27 +307,143 @@ class Orchestrator(object):
 		args : tuple
 			Tuple of arguments
 		"""
-		# If args is None, that means that an exception was raised during the
-		# execution of the experiment. In such case, ignore it
-		if not args:
-			self.n_fail += 1
-			return
-		# Extract parameters
-		params, results, duration = args
-		self.n_success += 1
-		# Store results
-		self.results.add(params, results)
-		self.exp_durations.append(duration)
-		if self.n_success % self.summary_freq == 0:
-			# Number of experiments scheduled to be executed
-			n_scheduled = self.n_exp - (self.n_fail + self.n_success)
-			# Compute ETA
-			n_cores = min(mp.cpu_count(), self.n_proc)
-			mean_duration = sum(self.exp_durations) / len(self.exp_durations)
-			eta = timestr(n_scheduled * mean_duration / n_cores, False)
-			# Print summary
-			logger.info('SUMMARY | Completed: %d, Failed: %d, Scheduled: %d, ETA: %s',
-						self.n_success, self.n_fail, n_scheduled, eta)
+		try:
+			# If args is None, that means that an exception was raised during the
+			# execution of the experiment. In such case, ignore it
+			if not args:
+				self.n_fail += 1
+				return
+			# Extract parameters
+			params, results, duration = args
+			self.n_success += 1
+			# Store results
+			self.results.add(params, results)
+			if TIMING in results:
+				self._add_timing(results[TIMING])
+			if self.results_log is not None:
+				try:
+					self.results_log.append(params, results)
+				except (IOError, OSError) as e:
+					logger.error('Cannot append results to log %s: %s',
+								 self.results_log.path, e)
+			self.exp_durations.append(duration)
+			if self.n_success % self.summary_freq == 0:
+				# Number of experiments scheduled to be executed
+				n_scheduled = self.n_exp - (self.n_fail + self.n_success)
+				# Compute ETA
+				n_cores = min(mp.cpu_count(), self.n_proc)
+				mean_duration = sum(self.exp_durations) / len(self.exp_durations)
+				eta = timestr(n_scheduled * mean_duration / n_cores, False)
+				# Print summary
+				logger.info('SUMMARY | Completed: %d, Failed: %d, Scheduled: %d, ETA: %s',
+							self.n_success, self.n_fail, n_scheduled, eta)
+				logger.info('SUMMARY | %s', self._timing_summary())
+		finally:
+			self._job_done()
+
+def _params_key(params, select):
+	"""Return the hexadecimal digest of the selected parameters of an
+	experiment
+
+	Parameters
+	----------
+	params : Tree
+		experiment parameters tree
+	select : callable
+		Function taking the path of a parameter and returning whether the
+		parameter is selected
+
+	Returns
+	-------
+	key : str
+		Hexadecimal digest of the selected parameters
+	"""
+	paths = sorted((path, repr(val)) for path, val in Tree(params).paths().items()
+				   if select(path))
+	return hashlib.sha1(repr(paths).encode('utf-8')).hexdigest()
+
+def warmup_key(params):
+	"""Return a key identifying the warmup phase of an experiment
+
+	Two experiments have the same key if they only differ in the parameters
+	that do not affect the state of the network at the end of the warmup
+	phase, i.e. description, label and number of measured requests.
+
+	Parameters
+	----------
+	params : Tree
+		experiment parameters tree
+
+	Returns
+	-------
+	key : str
+		Hexadecimal digest of the parameters affecting the warmup phase
+	"""
+	return _params_key(params, lambda path: path[0] not in ('desc', 'label')
+					   and path != ('workload', 'n_measured'))
+
+def _is_seeded(params):
+	"""Return whether the workload of an experiment has an explicit seed, i.e.
+	whether all replications of the experiment draw the same events"""
+	return 'workload' in params and \
+		   params['workload'].get('seed') is not None
+
+def workload_key(params):
+	"""Return a key identifying the workload of an experiment
+
+	Two experiments have the same key if they have the same topology and
+	workload parameters.
+
+	Parameters
+	----------
+	params : Tree
+		experiment parameters tree
+
+	Returns
+	-------
+	key : str
+		Hexadecimal digest of the parameters affecting the workload
+	"""
+	return _params_key(params, lambda path: path[0] in ('topology', 'workload'))
+
+def scenario_key(params):
+	"""Return a key identifying the network of an experiment
+
+	Two experiments have the same key if they have the same topology, cache
+	placement, content placement and workload parameters, except for the
+	number of warmup and measured requests.
+
+	Parameters
+	----------
+	params : Tree
+		experiment parameters tree
+
+	Returns
+	-------
+	key : str
+		Hexadecimal digest of the parameters affecting the network
+	"""
+	return _params_key(params, lambda path: path[0] in ('topology',
+					   'cache_placement', 'content_placement') or
+					   (path[0] == 'workload' and
+						path[1] not in ('n_warmup', 'n_measured')))
+
+# Networks built by this process, i.e. topologies with caches and contents
+# placed, their shortest paths and the state of the random number generator
+# after building them, keyed by scenario key. They are shared by all the
+# experiments run by this process on the same network, with least recently
+# used networks discarded first
+_scenario_cache = collections.OrderedDict()
+
+def _makedirs(path):
+	"""Create a directory, with all intermediate ones, if it does not exist"""
+	if not os.path.isdir(path):
+		try:
+			os.makedirs(path)
+		except OSError:
+			# Another process may have just created it
+			if not os.path.isdir(path):
+				raise
 
 def run_scenario(settings, params, curr_exp, n_exp):
 	"""Run a single scenario experiment
@@ -198,6 +470,7 @@ def run_scenario(settings, params, curr_exp, n_exp):
 	"""
 	try:
 		start_time = time.time()
+		timer = PhaseTimer()
 		proc_name = mp.current_process().name
 		logger = logging.getLogger('runner-%s' % proc_name)
 
@@ -207,20 +480,30 @@ def run_scenario(settings, params, curr_exp, n_exp):
 		# Copy parameters so that they can be manipulated
 		tree = copy.deepcopy(params)
 
-		# Set topology
-		topology_spec = tree['topology']
-		topology_name = topology_spec.pop('name')
-		if topology_name not in TOPOLOGY_FACTORY:
-			logger.error('No topology factory implementation for %s was found.'
-						 % topology_name)
-			return None
-		topology = TOPOLOGY_FACTORY[topology_name](**topology_spec)
-		if 'edge_weight' in topology_spec:
-			random.seed(topology_spec['seed'])
-			attr = {}
-			for u, v in topology.edges_iter():
-				attr[(u,v)] = random.choice(topology_spec['edge_weight'])
-			nx.set_edge_attributes(topology, 'util', attr)
+		# Reuse the network built by a previous experiment, if any
+		scenario_cache_size = settings.SCENARIO_CACHE_SIZE \
+							  if 'SCENARIO_CACHE_SIZE' in settings else 4
+		network_key = scenario_key(params)
+		network = _scenario_cache.pop(network_key, None)
+		if network is not None:
+			_scenario_cache[network_key] = network
+			topology, shortest_path, random_state = network
+		else:
+			# Set topology
+			topology_spec = tree['topology']
+			topology_name = topology_spec.pop('name')
+			if topology_name not in TOPOLOGY_FACTORY:
+				logger.error('No topology factory implementation for %s was found.'
+							 % topology_name)
+				return None
+			with timer.phase('TOPOLOGY'):
+				topology = TOPOLOGY_FACTORY[topology_name](**topology_spec)
+				if 'edge_weight' in topology_spec:
+					random.seed(topology_spec['seed'])
+					attr = {}
+					for u, v in topology.edges_iter():
+						attr[(u,v)] = random.choice(topology_spec['edge_weight'])
+					nx.set_edge_attributes(topology, 'util', attr)
 
 		workload_spec = tree['workload']
 		workload_name = workload_spec.pop('name')
@@ -228,33 +511,57 @@ def run_scenario(settings, params, curr_exp, n_exp):
 			logger.error('No workload implementation named %s was found.'
 						 % workload_name)
 			return None
-		workload = WORKLOAD[workload_name](topology, **workload_spec)
-
-		# Assign caches to nodes
-		if 'cache_placement' in tree:
-			cachepl_spec = tree['cache_placement']
-			cachepl_name = cachepl_spec.pop('name')
-			if cachepl_name not in CACHE_PLACEMENT:
-				logger.error('No cache placement named %s was found.'
-							 % cachepl_name)
+		with timer.phase('WORKLOAD'):
+			workload = WORKLOAD[workload_name](topology, **workload_spec)
+		# Workloads generating events in chunks of arrays are written once to
+		# disk and then replayed by all experiments with the same topology and
+		# workload. Unseeded workloads are not cached, otherwise all their
+		# replications would replay the same events
+		if 'WORKLOAD_CACHE_DIR' in settings and hasattr(workload, 'chunks') \
+				and _is_seeded(params):
+			workload = MemmapWorkload(workload, os.path.join(
+					settings.WORKLOAD_CACHE_DIR,
+					'workload-%s' % workload_key(params)))
+
+		if network is not None:
+			# Leave the random number generator as the placement would have
+			random.setstate(random_state)
+		else:
+			# Assign caches to nodes
+			if 'cache_placement' in tree:
+				cachepl_spec = tree['cache_placement']
+				cachepl_name = cachepl_spec.pop('name')
+				if cachepl_name not in CACHE_PLACEMENT:
+					logger.error('No cache placement named %s was found.'
+								 % cachepl_name)
+					return None
+				network_cache = cachepl_spec.pop('network_cache')
+				# Cache budget is the cumulative number of cache entries across
+				# the whole network
+				cachepl_spec['cache_budget'] = workload.n_contents * network_cache
+				with timer.phase('CACHE_PLACEMENT'):
+					CACHE_PLACEMENT[cachepl_name](topology, **cachepl_spec)
+
+			# Assign contents to sources
+			# If there are many contents, after doing this, performing operations
+			# requiring a topology deep copy, i.e. to_directed/undirected, will
+			# take long.
+			contpl_spec = tree['content_placement']
+			contpl_name = contpl_spec.pop('name')
+			if contpl_name not in CONTENT_PLACEMENT:
+				logger.error('No content placement implementation named %s was found.'
+							 % contpl_name)
 				return None
-			network_cache = cachepl_spec.pop('network_cache')
-			# Cache budget is the cumulative number of cache entries across
-			# the whole network
-			cachepl_spec['cache_budget'] = workload.n_contents * network_cache
-			CACHE_PLACEMENT[cachepl_name](topology, **cachepl_spec)
-
-		# Assign contents to sources
-		# If there are many contents, after doing this, performing operations
-		# requiring a topology deep copy, i.e. to_directed/undirected, will
-		# take long.
-		contpl_spec = tree['content_placement']
-		contpl_name = contpl_spec.pop('name')
-		if contpl_name not in CONTENT_PLACEMENT:
-			logger.error('No content placement implementation named %s was found.'
-						 % contpl_name)
-			return None
-		CONTENT_PLACEMENT[contpl_name](topology, workload.contents, **contpl_spec)
+			with timer.phase('CONTENT_PLACEMENT'):
+				CONTENT_PLACEMENT[contpl_name](topology, workload.contents, **contpl_spec)
+			random_state = random.getstate()
+			with timer.phase('SHORTEST_PATHS'):
+				shortest_path = symmetrify_paths(nx.all_pairs_dijkstra_path(topology))
+			if scenario_cache_size > 0:
+				_scenario_cache[network_key] = (topology, shortest_path,
+												random_state)
+				while len(_scenario_cache) > scenario_cache_size:
+					_scenario_cache.popitem(last=False)
 
 		# caching and routing strategy definition
 		strategy = tree['strategy']
@@ -272,8 +579,12 @@ def run_scenario(settings, params, curr_exp, n_exp):
 			logger.error('No implementation of cache policy %s was found.' % cache_policy['name'])
 			return None
 
-		# Configuration parameters of network model
-		netconf = tree['netconf']
+		# Configuration parameters of network model. The topology and its
+		# shortest paths may be shared with other experiments, so the network
+		# model copies the topology before modifying it
+		netconf = dict(tree['netconf'])
+		netconf['shortest_path'] = shortest_path
+		netconf['shared_topology'] = True
 
 		# Text description of the scenario run to print on screen
 		scenario = tree['desc'] if 'desc' in tree else "Description N/A"
@@ -286,12 +597,51 @@ def run_scenario(settings, params, curr_exp, n_exp):
 
 		collectors = {m: {} for m in metrics}
 
+		# Warmup snapshots are shared by all experiments with the same warmup
+		# phase. Unseeded workloads do not use snapshots, otherwise all their
+		# replications would start from the same state
+		warmup_snapshot = None
+		if 'WARMUP_SNAPSHOT_DIR' in settings and not is_offline \
+				and _is_seeded(params):
+			snapshot_dir = settings.WARMUP_SNAPSHOT_DIR
+			_makedirs(snapshot_dir)
+			warmup_snapshot = os.path.join(snapshot_dir, 'warmup-%s.pkl.gz'
+										   % warmup_key(params))
+
+		# Profile the simulation, if requested. Profiles are written to files
+		# named after the sequence number and description of the experiment
+		profiler = None
+		if 'PROFILE' in settings and settings.PROFILE:
+			if settings.PROFILE not in PROFILER:
+				logger.error('No profiler named %s was found.' % settings.PROFILE)
+				return None
+			profiler = PROFILER[settings.PROFILE]()
+			profile_dir = settings.PROFILE_DIR if 'PROFILE_DIR' in settings \
+						  else 'profiles'
+			_makedirs(profile_dir)
+			profile_path = os.path.join(profile_dir, '%d-%s' % (curr_exp,
+										re.sub(r'[^\w.=-]+', '_', scenario)[:128]))
+
 		logger.info('Experiment %d/%d | Start simulation', curr_exp, n_exp)
 
-		if not is_offline:
-			results = exec_experiment(topology, workload, netconf, strategy, cache_policy, collectors)
-		else:
-			results = exec_offline_experiment(topology, workload, netconf, strategy)
+		if profiler is not None:
+			profiler.start()
+		try:
+			if not is_offline:
+				results = exec_experiment(topology, workload, netconf, strategy,
+										  cache_policy, collectors,
+										  warmup_snapshot=warmup_snapshot,
+										  timer=timer)
+			else:
+				with timer.phase('OFFLINE'):
+					results = exec_offline_experiment(topology, workload, netconf,
+													  strategy)
+		finally:
+			if profiler is not None:
+				profiler.stop()
+				logger.info('Experiment %d/%d | Saved profile to %s', curr_exp,
+							n_exp, profiler.write(profile_path))
+		results[TIMING] = timer.results()
 
 		duration = time.time() - start_time
 		logger.info('Experiment %d/%d | End simulation | Duration %s.',
@@ -0,0 +1,5 @@
+"""This package contains functions for reading, writing and processing
+experiment results.
+"""
+from .readwrite import *
+from .columnar import *
@@ -0,0 +1,433 @@
+"""Functions for reading and writing results in columnar formats
+
+A resultset is stored as a table with one row per experiment and one column
+per parameter or result. Columns are named by joining with dots the path of
+the parameter (or result) in the experiment parameters (or results) tree,
+prefixed by *params* (or *results*), e.g. *params.workload.alpha* or
+*results.CACHE_HIT_RATIO.MEAN*.
+
+Results are stored in NumPy *.npz* archives or, if pyarrow is installed, in
+Parquet files. Columns of numbers, booleans and strings are stored as arrays
+of these types, all other values as arrays of objects. Single columns can be
+read without reading, or converting to trees, the rest of the results, which
+makes analysing large campaigns much faster.
+"""
+from __future__ import division
+import io
+import ast
+import json
+import zipfile
+import numbers
+import collections
+
+import numpy as np
+
+from icarus.util import Tree
+from icarus.registry import register_results_reader, register_results_writer
+from icarus.results.readwrite import ResultSet
+
+
+__all__ = [
+    'write_results_npz',
+    'read_results_npz',
+    'write_results_parquet',
+    'read_results_parquet',
+    'read_results_columns',
+    'merge_results_npz',
+           ]
+
+
+# Sections of the tuple of each experiment stored in a resultset
+_SECTIONS = ('params', 'results')
+
+# Marker of values missing from an experiment
+_MISSING = object()
+
+# Reserved names of the members of a npz archive storing a resultset: the
+# number of experiments, the path of each column and the prefix of the masks
+# of the experiments in which columns have a value
+_LEN = '__len__'
+_COLUMNS = '__columns__'
+_PRESENT = '__present__.'
+
+
+def _column_name(path):
+    """Return the name of the column storing a parameter or result"""
+    return '.'.join(str(k) for k in path)
+
+
+def _flatten(resultset):
+    """Return the columns of a resultset
+
+    Parameters
+    ----------
+    resultset : ResultSet
+        The resultset
+
+    Returns
+    -------
+    paths : OrderedDict
+        Path of each column, prefixed by its section, keyed by column name
+    values : dict
+        Values of each column, keyed by column name, with _MISSING for the
+        experiments not having it
+    """
+    paths = collections.OrderedDict()
+    values = {}
+    for i, experiment in enumerate(resultset):
+        for section, tree in zip(_SECTIONS, experiment):
+            for path, val in sorted(Tree(tree).paths().items(), key=str):
+                path = (section,) + tuple(path)
+                name = _column_name(path)
+                if name not in paths:
+                    paths[name] = path
+                    values[name] = [_MISSING] * len(resultset)
+                elif paths[name] != path:
+                    raise ValueError('Paths %s and %s are both stored in '
+                                     'column %s' % (paths[name], path, name))
+                values[name][i] = val
+    return paths, values
+
+
+def _column_array(values):
+    """Return an array storing the values of a column and, if some values are
+    missing, a boolean array marking the present ones"""
+    present = np.array([v is not _MISSING for v in values], dtype=bool)
+    data = [v for v in values if v is not _MISSING]
+    if all(isinstance(v, (bool, np.bool_)) for v in data):
+        dtype, fill = bool, False
+    elif all(isinstance(v, numbers.Integral) and not isinstance(v, bool)
+             for v in data):
+        dtype, fill = np.int64, 0
+    elif all(isinstance(v, numbers.Real) and not isinstance(v, bool)
+             for v in data):
+        dtype, fill = np.float64, np.nan
+    elif all(isinstance(v, str) for v in data):
+        dtype, fill = str, ''
+    else:
+        dtype, fill = object, None
+    values = [fill if v is _MISSING else v for v in values]
+    if dtype is object:
+        array = np.empty(len(values), dtype=object)
+        array[:] = values
+    else:
+        try:
+            array = np.array(values, dtype=dtype)
+        except OverflowError:
+            array = np.empty(len(values), dtype=object)
+            array[:] = values
+    return array, (None if present.all() else present)
+
+
+def _unflatten(paths, columns, n):
+    """Return the resultset stored in a set of columns
+
+    Parameters
+    ----------
+    paths : dict
+        Path of each column, prefixed by its section, keyed by column name
+    columns : dict
+        (values, present) tuple of each column, keyed by column name, where
+        present is None if all experiments have a value
+    n : int
+        The number of experiments
+    """
+    experiments = [(Tree(), Tree()) for _ in range(n)]
+    for name, path in paths.items():
+        section = _SECTIONS.index(path[0])
+        values, present = columns[name]
+        if values.dtype != object:
+            values = values.tolist()
+        for i in range(n):
+            if present is None or present[i]:
+                experiments[i][section].setval(path[1:], values[i])
+    resultset = ResultSet()
+    for params, results in experiments:
+        resultset.add(params, results)
+    return resultset
+
+
+def _write_npz_member(archive, name, array):
+    """Write an array as a member of an open npz archive"""
+    buf = io.BytesIO()
+    np.lib.format.write_array(buf, np.asanyarray(array), allow_pickle=True)
+    archive.writestr(name + '.npy', buf.getvalue())
+
+
+def _write_npz(path, n, paths, columns):
+    """Write columns to a npz archive
+
+    Parameters
+    ----------
+    path : str
+        The path of the archive
+    n : int
+        The number of experiments
+    paths : dict
+        Path of each column, prefixed by its section, keyed by column name
+    columns : iterable
+        (name, values, present) tuples of columns, which are written as they
+        are produced
+    """
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED,
+                         allowZip64=True) as archive:
+        _write_npz_member(archive, _LEN, np.array(n))
+        _write_npz_member(archive, _COLUMNS,
+                          np.array([[name, repr(path)]
+                                    for name, path in paths.items()],
+                                   dtype=str).reshape(-1, 2))
+        for name, values, present in columns:
+            _write_npz_member(archive, name, values)
+            if present is not None:
+                _write_npz_member(archive, _PRESENT + name, present)
+
+
+def _npz_paths(archive):
+    """Return the path of each column of an open npz archive"""
+    return collections.OrderedDict((name, ast.literal_eval(path))
+                                   for name, path in archive[_COLUMNS])
+
+
+def _npz_column(archive, name, n):
+    """Return the values of a column of an open npz archive and the mask of
+    the experiments having them, None if all of them have"""
+    if name not in archive.files:
+        return None, np.zeros(n, dtype=bool)
+    present = archive[_PRESENT + name] if _PRESENT + name in archive.files \
+              else None
+    return archive[name], present
+
+
+@register_results_writer('NPZ')
+def write_results_npz(results, path):
+    """Write a resultset to a NumPy npz archive
+
+    Parameters
+    ----------
+    results : ResultSet
+        The set of results
+    path : str
+        The path of the file to which write
+    """
+    paths, values = _flatten(results)
+    columns = ((name,) + _column_array(values.pop(name)) for name in paths)
+    _write_npz(path, len(results), paths, columns)
+
+
+@register_results_reader('NPZ')
+def read_results_npz(path):
+    """Reads a resultset from a NumPy npz archive
+
+    Parameters
+    ----------
+    path : str
+        The file path from which results are read
+
+    Returns
+    -------
+    results : ResultSet
+        The read result set
+    """
+    with np.load(path, allow_pickle=True) as archive:
+        n = int(archive[_LEN])
+        paths = _npz_paths(archive)
+        columns = {name: _npz_column(archive, name, n) for name in paths}
+    return _unflatten(paths, columns, n)
+
+
+def _import_parquet():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError('Cannot import pyarrow. Reading and writing '
+                          'results in Parquet format requires pyarrow')
+    return pyarrow, pyarrow.parquet
+
+
+@register_results_writer('PARQUET')
+def write_results_parquet(results, path):
+    """Write a resultset to a Parquet file
+
+    Columns of values other than numbers, booleans and strings are stored as
+    their *repr* strings, which are evaluated when reading them back.
+
+    Parameters
+    ----------
+    results : ResultSet
+        The set of results
+    path : str
+        The path of the file to which write
+    """
+    pa, pq = _import_parquet()
+    paths, values = _flatten(results)
+    arrays = []
+    encoded = []
+    for name in paths:
+        array, present = _column_array(values.pop(name))
+        if array.dtype == object:
+            array = [repr(v) for v in array]
+            encoded.append(name)
+        else:
+            array = array.tolist()
+        if present is not None:
+            array = [v if p else None for v, p in zip(array, present)]
+        arrays.append(pa.array(array))
+    table = pa.Table.from_arrays(arrays, names=list(paths))
+    metadata = {'icarus.columns': json.dumps([[name, repr(path)] for name, path
+                                              in paths.items()]),
+                'icarus.encoded': json.dumps(encoded)}
+    pq.write_table(table.replace_schema_metadata(metadata), path)
+
+
+def _parquet_columns(path, columns=None):
+    """Read columns of a Parquet file
+
+    Returns the path and the (values, present) tuple of each column, keyed by
+    column name, and the number of experiments
+    """
+    _, pq = _import_parquet()
+    table = pq.read_table(path, columns=columns)
+    metadata = pq.read_schema(path).metadata
+    paths = collections.OrderedDict(
+        (name, ast.literal_eval(p)) for name, p
+        in json.loads(metadata[b'icarus.columns'].decode('utf-8')))
+    encoded = set(json.loads(metadata[b'icarus.encoded'].decode('utf-8')))
+    data = {}
+    for name in table.column_names:
+        values = table.column(name).to_pylist()
+        present = np.array([v is not None for v in values], dtype=bool)
+        if name in encoded:
+            values = [ast.literal_eval(v) if v is not None else None
+                      for v in values]
+        array = np.empty(len(values), dtype=object)
+        array[:] = values
+        data[name] = (array, None if present.all() else present)
+    return paths, data, table.num_rows
+
+
+@register_results_reader('PARQUET')
+def read_results_parquet(path):
+    """Reads a resultset from a Parquet file
+
+    Parameters
+    ----------
+    path : str
+        The file path from which results are read
+
+    Returns
+    -------
+    results : ResultSet
+        The read result set
+    """
+    paths, columns, n = _parquet_columns(path)
+    return _unflatten(paths, columns, n)
+
+
+def read_results_columns(path, columns=None):
+    """Read selected columns of a resultset stored in a npz archive or in a
+    Parquet file, without reading the other columns.
+
+    Files whose name ends in *.parquet* are read as Parquet files, all other
+    files as npz archives.
+
+    Parameters
+    ----------
+    path : str
+        The file path from which results are read
+    columns : list, optional
+        The names of the columns to read, e.g. *params.workload.alpha*. If
+        not specified, all columns are read
+
+    Returns
+    -------
+    columns : OrderedDict
+        Arrays of the values of each column, with one entry per experiment,
+        keyed by column name. Arrays of columns whose values are missing in
+        some experiments are masked arrays, with missing values masked.
+
+    Examples
+    --------
+    Columns can be directly loaded into a pandas DataFrame:
+
+    >>> data = pd.DataFrame(read_results_columns('results.npz',
+    ...                     ['params.workload.alpha', 'results.WEIGHT.MEAN']))
+    """
+    if path.endswith('.parquet'):
+        paths, data, _ = _parquet_columns(path, columns)
+        if columns is None:
+            columns = list(paths)
+    else:
+        with np.load(path, allow_pickle=True) as archive:
+            n = int(archive[_LEN])
+            paths = _npz_paths(archive)
+            if columns is None:
+                columns = list(paths)
+            data = {}
+            for name in columns:
+                if name not in paths:
+                    raise KeyError('No column named %s in %s' % (name, path))
+                data[name] = _npz_column(archive, name, n)
+    result = collections.OrderedDict()
+    for name in columns:
+        values, present = data[name]
+        result[name] = values if present is None \
+                       else np.ma.masked_array(values, mask=~present)
+    return result
+
+
+def _merge_values(parts, lengths):
+    """Concatenate the arrays storing a column in different resultsets, where
+    a part is None if its resultset does not have the column"""
+    dtypes = set(p.dtype for p in parts if p is not None)
+    if len(dtypes) == 1:
+        dtype = dtypes.pop()
+    elif all(d.kind in 'iuf' for d in dtypes):
+        dtype = np.result_type(*dtypes)
+    else:
+        dtype = np.dtype(object)
+    return np.concatenate([p.astype(dtype, copy=False) if p is not None
+                           else np.zeros(n, dtype=dtype)
+                           for p, n in zip(parts, lengths)])
+
+
+def merge_results_npz(inputs, output):
+    """Merge resultsets stored in npz archives into a single npz archive.
+
+    Archives are merged one column at a time, so that at most one column of
+    all resultsets is loaded into memory.
+
+    Parameters
+    ----------
+    inputs : list
+        The paths of the archives to merge
+    output : str
+        The path of the merged archive
+    """
+    archives = [np.load(path, allow_pickle=True) for path in inputs]
+    try:
+        lengths = [int(archive[_LEN]) for archive in archives]
+        paths = collections.OrderedDict()
+        for archive in archives:
+            for name, path in _npz_paths(archive).items():
+                if paths.setdefault(name, path) != path:
+                    raise ValueError('Paths %s and %s are both stored in '
+                                     'column %s' % (paths[name], path, name))
+
+        def merged_columns():
+            for name in paths:
+                values = []
+                present = []
+                for archive, n in zip(archives, lengths):
+                    v, p = _npz_column(archive, name, n)
+                    values.append(v)
+                    present.append(p if p is not None
+                                   else np.ones(n, dtype=bool))
+                present = np.concatenate(present)
+                yield (name, _merge_values(values, lengths),
+                       None if present.all() else present)
+
+        _write_npz(output, sum(lengths), paths, merged_columns())
+    finally:
+        for archive in archives:
+            archive.close()
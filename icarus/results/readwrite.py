@@ -0,0 +1,373 @@
+"""Functions for reading and writing results
+"""
+from __future__ import division
+import os
+import copy
+import json
+import zlib
+import struct
+import logging
+import collections
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+from icarus.util import Tree
+from icarus.registry import register_results_reader, register_results_writer
+
+
+__all__ = [
+    'ResultSet',
+    'ResultLog',
+    'write_results_pickle',
+    'read_results_pickle',
+    'write_results_log',
+    'read_results_log',
+           ]
+
+
+logger = logging.getLogger('results')
+
+
+class ResultSet(object):
+    """This class can be used to store results from different experiments,
+    accessed and filtered.
+
+    A result set is basically a list of results, one per each experiment. Each
+    entry of the resultset is a 2-tuple referring to a single experiment.
+    In this 2-tuple:
+     * the first element is a tree with all parameters of the experiment
+     * the second element is a tree with all results of the experiment
+    """
+
+    def __init__(self, attr=None):
+        """Constructor
+
+        Parameters
+        ----------
+        attr : dict, optional
+            Dictionary of common attributes to all experiments
+        """
+        self._results = collections.deque()
+        # Dict of global attributes common to all experiments
+        self.attr = attr if attr is not None else {}
+
+    def __len__(self):
+        """Returns the number of results in the resultset
+
+        Returns
+        -------
+        len : int
+            The length of the resultset
+        """
+        return len(self._results)
+
+    def __iter__(self):
+        """Returns iterator over the resultset
+        """
+        return iter(self._results)
+
+    def __getitem__(self, i):
+        """Returns a specified item of the resultset
+
+        Parameters
+        ----------
+        i : int
+            The index of the result
+
+        Returns
+        -------
+        result : tuple
+            Result
+        """
+        return self._results[i]
+
+    def __add__(self, resultset):
+        """Merges two resultsets.
+
+        Parameters
+        ----------
+        resultset : ResultSet
+            The result set to merge
+
+        Returns
+        -------
+        resultset : ResultSet
+            The resultset containing results from this resultset and the one
+            passed as argument
+        """
+        if self.attr != resultset.attr:
+            raise ValueError('The resultsets cannot be merged because '
+                             'they have different global attributes')
+        rs = copy.deepcopy(self)
+        for i in iter(resultset):
+            rs.add(*i)
+        return rs
+
+    def add(self, parameters, results):
+        """Add a result to the result set.
+
+        Parameters
+        ----------
+        parameters : Tree
+            Tree of experiment parameters
+        results : Tree
+            Tree of experiment results
+
+        Notes
+        -----
+        If parameters and results are dictionaries, this method will attempt to
+        convert them to trees and storing them anyway. It is necessary that
+        parameters and results are saved as trees so that plotting functions
+        can search correctly in them.
+        """
+        if not isinstance(parameters, Tree):
+            parameters = Tree(parameters)
+        if not isinstance(results, Tree):
+            results = Tree(results)
+        self._results.append((parameters, results))
+
+    def dump(self):
+        """Dump all results.
+
+        Returns
+        -------
+        results : list
+            A list of 2-value tuples where the first value is the dictionary
+            of experiment parameters and the second value is the dictionary
+            of experiment results.
+        """
+        return list(self._results)
+
+    def json(self, indent=None):
+        """Return a JSON representation of the resultset
+
+        Parameters
+        ----------
+        indent : int, optional
+            If non-negative integer, then JSON array elements and object
+            members will be pretty-printed with that indent level.
+
+        Returns
+        -------
+        json : str
+            String containing the JSON representation of the object
+        """
+        d = [(params.dict(str_keys=True), results.dict(str_keys=True))
+             for params, results in self]
+        return json.dumps(d, indent=indent)
+
+    def prettyprint(self):
+        """Return a human-readable text representation of the resultset.
+
+        Return
+        ------
+        prettyprint : str
+            Human-readable string representation of the resultset
+        """
+        output = ""
+        n = len(self)
+        for i, (experiment, results) in enumerate(self):
+            output += "EXPERIMENT %d/%d:\n" % (i + 1, n)
+            output += "  CONFIGURATION:\n"
+            for path, val in sorted(experiment.paths().items(), key=str):
+                output += "   * %s -> %s\n" % (".".join(str(k) for k in path), val)
+            output += "  RESULTS:\n"
+            for path, val in sorted(results.paths().items(), key=str):
+                output += "   * %s -> %s\n" % (".".join(str(k) for k in path), val)
+            output += "\n"
+        return output
+
+    def filter(self, condition):
+        """Return subset of results matching specific conditions
+
+        Parameters
+        ----------
+        condition : dict
+            Dictionary listing all parameters and values to be matched in the
+            results set. Each parameter, i.e., each key of the dictionary must
+            be an iterable object containing the path in the parameters tree
+            to the required parameter
+
+        Returns
+        -------
+        filtered_results : ResultSet
+            List of 2-tuples of filtered results, where the first element is a
+            tree of all experiment parameters and the second value is
+            a tree with experiment results.
+        """
+        filtered_resultset = ResultSet(self.attr)
+        for parameters, results in self._results:
+            if parameters.match(condition):
+                filtered_resultset.add(parameters, results)
+        return filtered_resultset
+
+
+# Header of each record of a result log: size and CRC32 of the payload
+_RECORD_HEADER = struct.Struct('<II')
+
+
+def _log_record(parameters, results):
+    """Return a record of a result log storing the results of an experiment
+    """
+    payload = pickle.dumps((parameters, results), pickle.HIGHEST_PROTOCOL)
+    header = _RECORD_HEADER.pack(len(payload), zlib.crc32(payload) & 0xffffffff)
+    return header + payload
+
+
+class ResultLog(object):
+    """Append-only log of experiment results stored on a file.
+
+    Each experiment is appended as a separate record as soon as it completes
+    and the file is synced to disk before returning, so that the results of
+    all completed experiments survive a crash of the simulator. Records are
+    checksummed: a record partially written when the simulator crashed is
+    ignored when reading the log and overwritten by the next append.
+    """
+
+    def __init__(self, path):
+        """Constructor
+
+        Parameters
+        ----------
+        path : str
+            The path of the log file. It is created on the first append if it
+            does not exist.
+        """
+        self.path = path
+        # Offset of the end of the last valid record, if known
+        self._end = None
+
+    def __iter__(self):
+        """Iterate over the (parameters, results) records of the log
+        """
+        end = 0
+        if os.path.exists(self.path):
+            with open(self.path, 'rb') as f:
+                while True:
+                    header = f.read(_RECORD_HEADER.size)
+                    if not header:
+                        break
+                    if len(header) == _RECORD_HEADER.size:
+                        size, checksum = _RECORD_HEADER.unpack(header)
+                        payload = f.read(size)
+                        if len(payload) == size and \
+                                zlib.crc32(payload) & 0xffffffff == checksum:
+                            end = f.tell()
+                            yield pickle.loads(payload)
+                            continue
+                    logger.warning('Ignoring incomplete record at the end of '
+                                   'results log %s', self.path)
+                    break
+        self._end = end
+
+    def __len__(self):
+        """Return the number of valid records in the log
+        """
+        return sum(1 for _ in self)
+
+    def append(self, parameters, results):
+        """Append the results of an experiment to the log.
+
+        Parameters
+        ----------
+        parameters : Tree
+            Tree of experiment parameters
+        results : Tree
+            Tree of experiment results
+        """
+        record = _log_record(parameters, results)
+        if self._end is None:
+            # Find the end of the last valid record
+            for _ in self:
+                pass
+        with open(self.path, 'ab') as f:
+            f.truncate(self._end)
+            f.write(record)
+            f.flush()
+            os.fsync(f.fileno())
+        self._end += len(record)
+
+    def read(self):
+        """Read all results of the log.
+
+        Returns
+        -------
+        resultset : ResultSet
+            The resultset containing all results of the log
+        """
+        resultset = ResultSet()
+        for parameters, results in self:
+            resultset.add(parameters, results)
+        return resultset
+
+
+@register_results_writer('PICKLE')
+def write_results_pickle(results, path):
+    """Write a resultset to a pickle file
+
+    Parameters
+    ----------
+    results : ResultSet
+        The set of results
+    path : str
+        The path of the file to which write
+    """
+    with open(path, 'wb') as pickle_file:
+        pickle.dump(results, pickle_file)
+
+
+@register_results_reader('PICKLE')
+def read_results_pickle(path):
+    """Reads a resultset from a pickle file.
+
+    Parameters
+    ----------
+    path : str
+        The file path from which results are read
+
+    Returns
+    -------
+    results : ResultSet
+        The read result set
+    """
+    with open(path, 'rb') as pickle_file:
+        return pickle.load(pickle_file)
+
+
+@register_results_writer('LOG')
+def write_results_log(results, path):
+    """Write a resultset to a results log file
+
+    Parameters
+    ----------
+    results : ResultSet
+        The set of results
+    path : str
+        The path of the file to which write. If it exists, it is replaced.
+    """
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        for parameters, experiment_results in results:
+            f.write(_log_record(parameters, experiment_results))
+        f.flush()
+        os.fsync(f.fileno())
+    os.rename(tmp_path, path)
+
+
+@register_results_reader('LOG')
+def read_results_log(path):
+    """Reads a resultset from a results log file.
+
+    Parameters
+    ----------
+    path : str
+        The file path from which results are read
+
+    Returns
+    -------
+    results : ResultSet
+        The read result set
+    """
+    return ResultLog(path).read()
@@ -0,0 +1,99 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from icarus.util import Tree, can_import
+from icarus.results import ResultSet, write_results_npz, read_results_npz, \
+    write_results_parquet, read_results_parquet, read_results_columns, \
+    merge_results_npz
+
+
+class TestColumnar(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.rs = ResultSet()
+        self.rs.add({'workload': {'alpha': 0.8, 'seed': None},
+                     'topology': {'name': 'GEANT', 'edge_weight': [10, 100]},
+                     'strategy': {'name': 'LCE'}},
+                    {'CACHE_HIT_RATIO': {'MEAN': 0.3,
+                                         'PER_NODE_CACHE_HIT_RATIO': {1: 0.1}},
+                     'LINK_LOAD': {'PER_LINK': {(1, 2): 3.5}}})
+        self.rs.add({'workload': {'alpha': 1.0, 'seed': 2},
+                     'topology': {'name': 'TISCALI', 'edge_weight': [10, 100]},
+                     'strategy': {'name': 'LCD', 'offline': True}},
+                    {'CACHE_HIT_RATIO': {'MEAN': 0.4,
+                                         'PER_NODE_CACHE_HIT_RATIO': {1: 0.2}}})
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def assertResultSetEqual(self, expected, actual):
+        self.assertEqual(len(expected), len(actual))
+        for (p1, r1), (p2, r2) in zip(expected, actual):
+            self.assertEqual(p1, p2)
+            self.assertEqual(r1, r2)
+
+    def test_read_write_npz(self):
+        path = os.path.join(self.tmp_dir, 'results.npz')
+        write_results_npz(self.rs, path)
+        rs = read_results_npz(path)
+        self.assertResultSetEqual(self.rs, rs)
+        self.assertIsInstance(rs[0][0], Tree)
+        self.assertIsInstance(rs[1][0].getval(('workload', 'alpha')), float)
+
+    def test_read_columns(self):
+        path = os.path.join(self.tmp_dir, 'results.npz')
+        write_results_npz(self.rs, path)
+        columns = read_results_columns(path, ['params.workload.alpha',
+                                              'params.strategy.offline',
+                                              'results.LINK_LOAD.PER_LINK.(1, 2)'])
+        self.assertEqual(['params.workload.alpha', 'params.strategy.offline',
+                          'results.LINK_LOAD.PER_LINK.(1, 2)'], list(columns))
+        np.testing.assert_array_equal([0.8, 1.0], columns['params.workload.alpha'])
+        offline = columns['params.strategy.offline']
+        self.assertEqual([True, False], list(offline.mask))
+        self.assertTrue(offline[1])
+        link_load = columns['results.LINK_LOAD.PER_LINK.(1, 2)']
+        self.assertEqual(3.5, link_load[0])
+        self.assertIs(np.ma.masked, link_load[1])
+
+    def test_read_all_columns(self):
+        path = os.path.join(self.tmp_dir, 'results.npz')
+        write_results_npz(self.rs, path)
+        columns = read_results_columns(path)
+        self.assertIn('params.topology.name', columns)
+        self.assertEqual(['GEANT', 'TISCALI'],
+                         list(columns['params.topology.name']))
+
+    def test_read_missing_column(self):
+        path = os.path.join(self.tmp_dir, 'results.npz')
+        write_results_npz(self.rs, path)
+        self.assertRaises(KeyError, read_results_columns, path, ['params.x'])
+
+    def test_merge_npz(self):
+        other = ResultSet()
+        other.add({'workload': {'alpha': 2}, 'desc': 'other'},
+                  {'CACHE_HIT_RATIO': {'MEAN': 'n/a'}})
+        path_1 = os.path.join(self.tmp_dir, 'results-1.npz')
+        path_2 = os.path.join(self.tmp_dir, 'results-2.npz')
+        path = os.path.join(self.tmp_dir, 'results.npz')
+        write_results_npz(self.rs, path_1)
+        write_results_npz(other, path_2)
+        merge_results_npz([path_1, path_2], path)
+        self.assertResultSetEqual(self.rs + other, read_results_npz(path))
+        alpha = read_results_columns(path, ['params.workload.alpha'])
+        np.testing.assert_array_equal([0.8, 1.0, 2.0],
+                                      alpha['params.workload.alpha'])
+
+    @unittest.skipIf(not can_import("import pyarrow.parquet"),
+                     "pyarrow not available")
+    def test_read_write_parquet(self):
+        path = os.path.join(self.tmp_dir, 'results.parquet')
+        write_results_parquet(self.rs, path)
+        self.assertResultSetEqual(self.rs, read_results_parquet(path))
+        columns = read_results_columns(path, ['params.workload.alpha'])
+        self.assertEqual([0.8, 1.0], list(columns['params.workload.alpha']))
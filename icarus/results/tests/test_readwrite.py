@@ -0,0 +1,93 @@
+from __future__ import division
+import os
+import shutil
+import tempfile
+import unittest
+
+from icarus.util import Tree
+from icarus.results import ResultSet, ResultLog, read_results_pickle, \
+    write_results_pickle, read_results_log, write_results_log
+
+
+class TestResultSet(unittest.TestCase):
+
+    def setUp(self):
+        self.rs = ResultSet()
+        self.rs.add({'strategy': {'name': 'LCE'}, 'alpha': 0.8},
+                    {'CACHE_HIT_RATIO': {'MEAN': 0.3}})
+        self.rs.add({'strategy': {'name': 'LCD'}, 'alpha': 0.8},
+                    {'CACHE_HIT_RATIO': {'MEAN': 0.4}})
+
+    def test_add(self):
+        self.assertEqual(2, len(self.rs))
+        params, results = self.rs[1]
+        self.assertIsInstance(params, Tree)
+        self.assertIsInstance(results, Tree)
+        self.assertEqual('LCD', params['strategy']['name'])
+        self.assertEqual(0.4, results['CACHE_HIT_RATIO']['MEAN'])
+
+    def test_filter(self):
+        filtered = self.rs.filter({'strategy': {'name': 'LCD'}})
+        self.assertEqual(1, len(filtered))
+        self.assertEqual(0.4, filtered[0][1]['CACHE_HIT_RATIO']['MEAN'])
+
+    def test_merge(self):
+        merged = self.rs + self.rs
+        self.assertEqual(4, len(merged))
+        self.assertEqual(2, len(self.rs))
+
+    def test_merge_different_attr(self):
+        self.assertRaises(ValueError, self.rs.__add__, ResultSet({'a': 1}))
+
+
+class TestReadWrite(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.rs = ResultSet()
+        for i in range(3):
+            self.rs.add({'seed': i}, {'CACHE_HIT_RATIO': {'MEAN': i / 10}})
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def assertResultSetEqual(self, expected, actual):
+        self.assertEqual(len(expected), len(actual))
+        for (p1, r1), (p2, r2) in zip(expected, actual):
+            self.assertEqual(p1, p2)
+            self.assertEqual(r1, r2)
+
+    def test_pickle(self):
+        path = os.path.join(self.tmp_dir, 'results.pickle')
+        write_results_pickle(self.rs, path)
+        self.assertResultSetEqual(self.rs, read_results_pickle(path))
+
+    def test_log(self):
+        path = os.path.join(self.tmp_dir, 'results.log')
+        write_results_log(self.rs, path)
+        self.assertResultSetEqual(self.rs, read_results_log(path))
+
+    def test_log_append(self):
+        path = os.path.join(self.tmp_dir, 'results.log')
+        log = ResultLog(path)
+        self.assertEqual(0, len(log))
+        for params, results in self.rs:
+            log.append(params, results)
+        self.assertEqual(3, len(log))
+        self.assertResultSetEqual(self.rs, ResultLog(path).read())
+
+    def test_log_incomplete_record(self):
+        path = os.path.join(self.tmp_dir, 'results.log')
+        log = ResultLog(path)
+        for params, results in self.rs:
+            log.append(params, results)
+        # Simulate a crash while appending the last record
+        size = os.path.getsize(path)
+        with open(path, 'ab') as f:
+            f.truncate(size - 5)
+        log = ResultLog(path)
+        self.assertEqual(2, len(log))
+        # The incomplete record is overwritten by the next append
+        params, results = self.rs[2]
+        log.append(params, results)
+        self.assertResultSetEqual(self.rs, ResultLog(path).read())
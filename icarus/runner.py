@@ -10,6 +10,7 @@ import multiprocessing as mp
 
 from icarus.util import Settings, config_logging
 from icarus.registry import RESULTS_WRITER
+from icarus.results import ResultLog
 from icarus.orchestration import Orchestrator
 
 
@@ -76,11 +77,15 @@ def _validate_settings(settings, freeze=True):
         settings.freeze()
 
 
-def run(config_file, output, config_override):
+def run(config_file, output, config_override, resume=False):
     """
     Run function. It starts the simulator.
     experiments
 
+    While running, the results of each completed experiment are appended to
+    a log file named as the output file with a *.log* suffix, which is
+    removed once all results are saved to the output file.
+
     Parameters
     ----------
     config : str
@@ -89,6 +94,9 @@ def run(config_file, output, config_override):
         The file name where results will be saved
     config_override : dict, optional
         Configuration parameters overriding parameters in the file
+    resume : bool, optional
+        If True, resume an interrupted run with the same output file, running
+        only the experiments whose results are not in its log
     """
     # Read settings from file and save them in icarus.conf.settings
     settings = Settings()
@@ -97,15 +105,23 @@ def run(config_file, output, config_override):
         for k, v in config_override.items():
             try:
                 v = eval(v)
-            except NameError:
+            except (NameError, SyntaxError):
                 pass
             settings.set(k, v)
     # Config logger
     config_logging(settings.LOG_LEVEL if 'LOG_LEVEL' in settings else 'INFO')
     # Validate settings
     _validate_settings(settings, freeze=True)
+    # Log of results of completed experiments
+    log_path = output + '.log'
+    if os.path.exists(log_path) and not resume:
+        logger.error('Results log %s of an interrupted run found. Resume the '
+                     'run or remove the log. Exiting'
+                     % os.path.abspath(log_path))
+        sys.exit(-1)
+    results_log = ResultLog(log_path)
     # set up orchestration
-    orch = Orchestrator(settings)
+    orch = Orchestrator(settings, results_log=results_log)
     for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP, signal.SIGQUIT, signal.SIGABRT):
         signal.signal(sig, functools.partial(handler, settings, orch, output))
     logger.info('Launching orchestrator')
@@ -114,3 +130,5 @@ def run(config_file, output, config_override):
     results = orch.results
     RESULTS_WRITER[settings.RESULTS_FORMAT](results, output)
     logger.info('Saved results to file %s' % os.path.abspath(output))
+    if os.path.exists(log_path):
+        os.remove(log_path)
@@ -1,5 +1,11 @@
+import os
+import shutil
+import tempfile
 import unittest
 
+import fnss
+import numpy as np
+
 import icarus.scenarios as workload
 
 
@@ -69,3 +75,108 @@ class TestYCBS(unittest.TestCase):
         self.assertTrue(ev_3['log'])
         self.assertIn(ev_3['item'], range(1, n_items + 1))
         self.assertEqual(ev_3['op'], "READ")
+
+
+class TestStationaryWorkload(unittest.TestCase):
+
+    def setUp(self):
+        self.topology = workload.IcnTopology()
+        self.topology.add_path([0, 1, 2])
+        fnss.add_stack(self.topology, 0, 'receiver', {})
+        fnss.add_stack(self.topology, 1, 'router', {})
+        fnss.add_stack(self.topology, 2, 'source', {})
+
+    def test_events(self):
+        events = list(workload.StationaryWorkload(self.topology, 10, 0.8,
+                                                  n_warmup=5, n_measured=20,
+                                                  chunk_size=7))
+        self.assertEqual(25, len(events))
+        self.assertEqual([False] * 5 + [True] * 20,
+                         [event['log'] for _, event in events])
+        times = [t for t, _ in events]
+        self.assertEqual(sorted(times), times)
+        for _, event in events:
+            self.assertEqual(0, event['receiver'])
+            self.assertIn(event['content'], range(1, 11))
+
+    def test_seed(self):
+        w_1 = workload.StationaryWorkload(self.topology, 100, 0.8, n_warmup=50,
+                                          n_measured=50, seed=1, chunk_size=30)
+        w_2 = workload.StationaryWorkload(self.topology, 100, 0.8, n_warmup=50,
+                                          n_measured=50, seed=1, chunk_size=30)
+        self.assertEqual(list(w_1), list(w_1))
+        self.assertEqual(list(w_1), list(w_2))
+
+    def test_popularity_matrix(self):
+        w = workload.StationaryWorkload(self.topology, 10, 0.8)
+        popularity = w.get_popularity_matrix()
+        self.assertEqual((1, 10), popularity.shape)
+        self.assertAlmostEqual(1.0, popularity.sum())
+        for j, content in enumerate(w.contents):
+            self.assertEqual(w.get_popularity(0, content), popularity[0, j])
+
+    def test_popularity_matrix_beta(self):
+        # Topology sketch
+        #
+        # RECEIVER 3 ---- 0 ---- 1 ---- 2 SOURCE
+        #                 |      |
+        #     RECEIVER 4 -+      +- RECEIVER 5
+        #
+        topology = workload.IcnTopology()
+        topology.add_path([0, 1, 2])
+        topology.add_edges_from([(3, 0), (4, 0), (5, 1)])
+        fnss.add_stack(topology, 2, 'source', {})
+        for v in (0, 1):
+            fnss.add_stack(topology, v, 'router', {})
+        for v in (3, 4, 5):
+            fnss.add_stack(topology, v, 'receiver', {})
+        w = workload.StationaryWorkload(topology, 10, 0.8, beta=1.2)
+        popularity = w.get_popularity_matrix()
+        self.assertEqual((3, 10), popularity.shape)
+        np.testing.assert_allclose(popularity.sum(axis=1), w.receiver_dist.pdf)
+        self.assertAlmostEqual(1.0, popularity.sum())
+        for i, receiver in enumerate(w.receivers):
+            for j, content in enumerate(w.contents):
+                self.assertEqual(w.get_popularity(receiver, content),
+                                 popularity[i, j])
+
+
+class TestMemmapWorkload(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'workload')
+        self.topology = workload.IcnTopology()
+        self.topology.add_path([0, 1, 2, 3])
+        fnss.add_stack(self.topology, 0, 'receiver', {})
+        fnss.add_stack(self.topology, 3, 'receiver', {})
+        fnss.add_stack(self.topology, 1, 'router', {})
+        fnss.add_stack(self.topology, 2, 'source', {})
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_stationary(self):
+        w = workload.StationaryWorkload(self.topology, 20, 0.8, n_warmup=10,
+                                        n_measured=30, seed=1, chunk_size=15)
+        m = workload.MemmapWorkload(w, self.path, chunk_size=7)
+        self.assertEqual(40, len(m))
+        self.assertEqual(10, m.n_warmup)
+        self.assertEqual(list(w), list(m))
+        # Events are replayed from disk without generating them again
+        w.seed = 2
+        self.assertEqual(list(m), list(workload.MemmapWorkload(w, self.path)))
+        self.assertNotEqual(list(w), list(m))
+
+    def test_iterable(self):
+        class ListWorkload(object):
+            receivers = ['a', 'b']
+            events = [(0.5, {'receiver': 'b', 'content': 3, 'log': False}),
+                      (1.5, {'receiver': 'a', 'content': 1, 'log': True})]
+
+            def __iter__(self):
+                return iter(self.events)
+
+        w = ListWorkload()
+        self.assertEqual(w.events, list(workload.MemmapWorkload(w, self.path)))
+        self.assertEqual(w.events, list(workload.MemmapWorkload(w, self.path)))
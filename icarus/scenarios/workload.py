@@ -17,9 +17,13 @@ following attributes:
 Each workload must expose the `contents` attribute which is an iterable of
 all content identifiers. This is needed for content placement.
 """
+import os
 import random
+import shutil
+import tempfile
 import csv
 
+import numpy as np
 import networkx as nx
 
 from icarus.tools import TruncatedZipfDist
@@ -29,7 +33,8 @@ __all__ = [
 		'StationaryWorkload',
 		'GlobetraffWorkload',
 		'TraceDrivenWorkload',
-		'YCSBWorkload'
+		'YCSBWorkload',
+		'MemmapWorkload',
 		   ]
 
 
@@ -74,6 +79,11 @@ class StationaryWorkload(object):
 		not logged)
 	n_measured : int, optional
 		The number of logged requests after the warmup
+	seed : int, optional
+		The seed of the random number generator. If specified, all iterations
+		over the workload generate the same sequence of events
+	chunk_size : int, optional
+		The number of events whose attributes are drawn at once
 
 	Returns
 	-------
@@ -83,7 +93,8 @@ class StationaryWorkload(object):
 		dictionary of event attributes.
 	"""
 	def __init__(self, topology, n_contents, alpha, beta=0, rate=1.0,
-					n_warmup=10 ** 5, n_measured=4 * 10 ** 5, seed=None, **kwargs):
+					n_warmup=10 ** 5, n_measured=4 * 10 ** 5, seed=None,
+					chunk_size=10 ** 6, **kwargs):
 		if alpha < 0:
 			raise ValueError('alpha must be positive')
 		if beta < 0:
@@ -97,36 +108,71 @@ class StationaryWorkload(object):
 		self.rate = rate
 		self.n_warmup = n_warmup
 		self.n_measured = n_measured
+		self.seed = seed
+		self.chunk_size = chunk_size
 		random.seed(seed)
 		self.beta = beta
 		if beta != 0:
-			degree = nx.degree(self.topology)
-			self.receivers = sorted(self.receivers, key=lambda x: degree[iter(topology.edge[x]).next()], reverse=True)
+			degree = nx.degree(topology)
+			self.receivers = sorted(self.receivers, key=lambda x: degree[next(iter(topology.edge[x]))], reverse=True)
 			self.receiver_dist = TruncatedZipfDist(beta, len(self.receivers))
 
 	def get_popularity(self, receiver, content):
 		if self.beta == 0:
 			return self.zipf.pdf[content-1]/len(self.receivers)
-		return self.zipf.pdf[content-1]*self.receiver_dist[self.receivers.index(receiver)]
+		return self.zipf.pdf[content-1]*self.receiver_dist.pdf[self.receivers.index(receiver)]
 
 	def get_popularity_all(self):
 		return {v: {content: self.get_popularity(v, content) for content in self.contents} for v in self.receivers}
 
-	def __iter__(self):
+	def get_popularity_matrix(self):
+		"""Return the popularity of all contents at all receivers.
+
+		Returns
+		-------
+		popularity : np.ndarray
+			Array whose element (i, j) is the probability that a request for
+			the j-th content of *contents* is issued by the i-th receiver of
+			*receivers*
+		"""
+		if self.beta == 0:
+			return np.tile(self.zipf.pdf / len(self.receivers),
+						   (len(self.receivers), 1))
+		return np.outer(self.receiver_dist.pdf, self.zipf.pdf)
+
+	def chunks(self):
+		"""Generate the attributes of all events in chunks of arrays.
+
+		Returns
+		-------
+		chunks : iterator
+			Iterator of (time, receiver, content, log) 4-tuples of arrays of
+			up to *chunk_size* elements, where receiver holds indices of
+			*receivers*
+		"""
+		rng = np.random.RandomState(self.seed)
+		n_events = self.n_warmup + self.n_measured
 		req_counter = 0
 		t_event = 0.0
-		while req_counter < self.n_warmup + self.n_measured:
-			t_event += (random.expovariate(self.rate))
+		while req_counter < n_events:
+			n = int(min(self.chunk_size, n_events - req_counter))
+			time = t_event + np.cumsum(rng.exponential(1.0 / self.rate, n))
 			if self.beta == 0:
-				receiver = random.choice(self.receivers)
+				receiver = rng.randint(len(self.receivers), size=n)
 			else:
-				receiver = self.receivers[self.receiver_dist.rv() - 1]
-			content = int(self.zipf.rv())
-			log = (req_counter >= self.n_warmup)
-			event = {'receiver': receiver, 'content': content, 'log': log}
-			yield (t_event, event)
-			req_counter += 1
-		raise StopIteration()
+				receiver = self.receiver_dist.rv_many(n, rng) - 1
+			content = self.zipf.rv_many(n, rng)
+			log = np.arange(req_counter, req_counter + n) >= self.n_warmup
+			yield time, receiver, content, log
+			req_counter += n
+			t_event = time[-1]
+
+	def __iter__(self):
+		receivers = self.receivers
+		for time, receiver, content, log in self.chunks():
+			for t, r, c, l in zip(time.tolist(), receiver.tolist(),
+								  content.tolist(), log.tolist()):
+				yield (t, {'receiver': receivers[r], 'content': c, 'log': l})
 
 
 @register_workload('GLOBETRAFF')
@@ -196,7 +242,6 @@ class GlobetraffWorkload(object):
 					receiver = self.receivers[self.receiver_dist.rv() - 1]
 				event = {'receiver': receiver, 'content': content, 'size': size}
 				yield (timestamp, event)
-		raise StopIteration()
 
 
 @register_workload('TRACE_DRIVEN')
@@ -291,7 +336,7 @@ class TraceDrivenWorkload(object):
 				yield (t_event, event)
 				req_counter += 1
 				if(req_counter >= self.n_warmup + self.n_measured):
-					raise StopIteration()
+					return
 			raise ValueError("Trace did not contain enough requests")
 
 
@@ -345,7 +390,7 @@ class YCSBWorkload(object):
 		self.workload = workload
 		if seed is not None:
 			random.seed(seed)
-		self.zipf = TruncatedZipfDist(alpha, n_contents)
+		self.zipf = TruncatedZipfDist(alpha, n_contents, seed)
 		self.n_warmup = n_warmup
 		self.n_measured = n_measured
 
@@ -364,4 +409,116 @@ class YCSBWorkload(object):
 			event = {'op': op, 'item': item, 'log': log}
 			yield event
 			req_counter += 1
-		raise StopIteration()
+
+
+class MemmapWorkload(object):
+	"""Workload replaying the events of another workload from columnar arrays
+	stored on disk.
+
+	The first time a workload is wrapped for a given path, its events are
+	generated and written to a directory at that path, as four raw arrays of
+	event times (float64), receiver indices (int32), contents (int32) and log
+	flags (bool). After that, events are read from memory-mapped arrays, so
+	replaying a workload requires no generation or parsing and, when several
+	processes replay the same workload, its pages are shared by the operating
+	system.
+
+	The wrapped workload must have a *receivers* attribute and its events must
+	only have *receiver*, *content* and *log* attributes, with integer
+	contents. All other attributes are those of the wrapped workload.
+
+	Parameters
+	----------
+	workload : iterable
+		The wrapped workload
+	path : str
+		The directory where the events of the workload are stored
+	chunk_size : int, optional
+		The number of events read from disk at once
+	"""
+
+	COLUMNS = (('time', np.float64), ('receiver', np.int32),
+			   ('content', np.int32), ('log', np.bool_))
+
+	def __init__(self, workload, path, chunk_size=2 ** 16):
+		self.workload = workload
+		self.path = path
+		self.chunk_size = chunk_size
+		if not os.path.isdir(path):
+			self._write()
+		self.columns = [self._read(name, dtype) for name, dtype in self.COLUMNS]
+
+	def __getattr__(self, name):
+		# Only called for attributes not found on this object
+		if name == 'workload':
+			raise AttributeError(name)
+		return getattr(self.workload, name)
+
+	def _chunks(self):
+		"""Generate the attributes of all events of the wrapped workload in
+		chunks of arrays"""
+		if hasattr(self.workload, 'chunks'):
+			for chunk in self.workload.chunks():
+				yield chunk
+			return
+		receiver_index = {v: i for i, v in enumerate(self.workload.receivers)}
+		columns = [[] for _ in self.COLUMNS]
+		for time, event in self.workload:
+			columns[0].append(time)
+			columns[1].append(receiver_index[event['receiver']])
+			columns[2].append(event['content'])
+			columns[3].append(event['log'])
+			if len(columns[0]) == self.chunk_size:
+				yield columns
+				columns = [[] for _ in self.COLUMNS]
+		if columns[0]:
+			yield columns
+
+	def _write(self):
+		"""Write the events of the wrapped workload to disk
+
+		Arrays are written to a temporary directory which is then renamed, so
+		that processes never see an incomplete workload. If another process
+		wrote the same workload in the meantime, its arrays are kept.
+		"""
+		parent = os.path.dirname(os.path.abspath(self.path))
+		if not os.path.isdir(parent):
+			os.makedirs(parent)
+		tmp_path = tempfile.mkdtemp(dir=parent)
+		try:
+			files = [open(os.path.join(tmp_path, '%s.bin' % name), 'wb')
+					 for name, _ in self.COLUMNS]
+			try:
+				for chunk in self._chunks():
+					for f, col, (_, dtype) in zip(files, chunk, self.COLUMNS):
+						np.asarray(col, dtype=dtype).tofile(f)
+			finally:
+				for f in files:
+					f.close()
+			os.rename(tmp_path, self.path)
+		except OSError:
+			if not os.path.isdir(self.path):
+				raise
+		finally:
+			if os.path.isdir(tmp_path):
+				shutil.rmtree(tmp_path)
+
+	def _read(self, name, dtype):
+		"""Memory-map the array of an event attribute"""
+		path = os.path.join(self.path, '%s.bin' % name)
+		if os.path.getsize(path) == 0:
+			# Empty files cannot be memory-mapped
+			return np.empty(0, dtype=dtype)
+		return np.memmap(path, dtype=dtype, mode='r')
+
+	def __len__(self):
+		return len(self.columns[0])
+
+	def __iter__(self):
+		receivers = self.workload.receivers
+		time, receiver, content, log = self.columns
+		for i in range(0, len(time), self.chunk_size):
+			j = i + self.chunk_size
+			for t, r, c, l in zip(time[i:j].tolist(), receiver[i:j].tolist(),
+								  content[i:j].tolist(), log[i:j].tolist()):
+				yield (t, {'receiver': receivers[r], 'content': c, 'log': l})
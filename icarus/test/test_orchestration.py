@@ -0,0 +1,180 @@
+import math
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+import icarus.orchestration as orchestration
+from icarus.models import LeaveCopyEverywhere
+from icarus.registry import STRATEGY
+from icarus.util import Settings, Tree
+
+
+class RecordingStrategy(LeaveCopyEverywhere):
+    """LCE strategy recording the network and the random state it is run
+    with, and the first events of the workload"""
+
+    runs = []
+
+    def __init__(self, view, controller, **kwargs):
+        super(RecordingStrategy, self).__init__(view, controller)
+        self.runs.append({
+            'random': random.getstate(),
+            'caches': view.cache_nodes(size=True),
+            'sources': {k: view.content_source(k) for k in range(1, 51)},
+            'events': []})
+
+    def process_event(self, time, receiver, content, log):
+        events = self.runs[-1]['events']
+        if len(events) < 10:
+            events.append((time, receiver, content, log))
+        super(RecordingStrategy, self).process_event(time, receiver, content,
+                                                     log)
+
+
+class TestRunScenario(unittest.TestCase):
+
+    @classmethod
+    def experiment(cls, seed=None):
+        experiment = Tree()
+        experiment['topology'] = {'name': 'PATH', 'n': 5}
+        experiment['workload'] = {'name': 'STATIONARY', 'n_contents': 50,
+                                  'alpha': 0.8, 'n_warmup': 200,
+                                  'n_measured': 300, 'seed': seed}
+        experiment['cache_placement'] = {'name': 'UNIFORM',
+                                         'network_cache': 0.1}
+        experiment['content_placement'] = {'name': 'UNIFORM'}
+        experiment['strategy'] = {'name': 'LCE'}
+        experiment['cache_policy'] = {'name': 'LRU'}
+        experiment['netconf'] = {}
+        return experiment
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.settings = Settings()
+        self.settings.DATA_COLLECTORS = ['CACHE_HIT_RATIO']
+        orchestration._scenario_cache.clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+        orchestration._scenario_cache.clear()
+
+    def run_scenario(self, experiment):
+        _, results, _ = orchestration.run_scenario(self.settings, experiment,
+                                                   1, 1)
+        return results
+
+    def test_warmup_snapshot_seeded(self):
+        self.settings.WARMUP_SNAPSHOT_DIR = self.tmp_dir
+        saved = self.run_scenario(self.experiment(seed=1))
+        loaded = self.run_scenario(self.experiment(seed=1))
+        self.assertEqual(1, len(os.listdir(self.tmp_dir)))
+        self.assertEqual(200, saved[orchestration.TIMING]['WARMUP']['EVENTS'])
+        self.assertEqual(200, loaded[orchestration.TIMING]['WARMUP']['SKIPPED_EVENTS'])
+        self.assertEqual(saved['CACHE_HIT_RATIO'], loaded['CACHE_HIT_RATIO'])
+
+    def test_warmup_snapshot_unseeded(self):
+        self.settings.WARMUP_SNAPSHOT_DIR = self.tmp_dir
+        for _ in range(2):
+            results = self.run_scenario(self.experiment())
+            self.assertEqual(200, results[orchestration.TIMING]['WARMUP']['EVENTS'])
+        self.assertEqual([], os.listdir(self.tmp_dir))
+
+    def test_scenario_cache(self):
+        STRATEGY['RECORDING'] = RecordingStrategy
+        del RecordingStrategy.runs[:]
+        try:
+            for cached in (False, True, True, False):
+                if not cached:
+                    orchestration._scenario_cache.clear()
+                experiment = self.experiment(seed=1)
+                experiment['strategy'] = {'name': 'RECORDING'}
+                experiment['topology'] = {'name': 'MESH', 'n': 4, 'm': 3}
+                experiment['content_placement']['seed'] = 2
+                self.run_scenario(experiment)
+                self.assertEqual(1, len(orchestration._scenario_cache))
+        finally:
+            del STRATEGY['RECORDING']
+        fresh, cached, cached_again, fresh_again = RecordingStrategy.runs
+        self.assertEqual(3, len(set(fresh['sources'].values())))
+        self.assertEqual(10, len(fresh['events']))
+        self.assertEqual(fresh, cached)
+        self.assertEqual(fresh, cached_again)
+        self.assertEqual(fresh, fresh_again)
+
+    def test_workload_cache_unseeded(self):
+        self.settings.WORKLOAD_CACHE_DIR = self.tmp_dir
+        self.run_scenario(self.experiment())
+        self.assertEqual([], os.listdir(self.tmp_dir))
+        self.run_scenario(self.experiment(seed=1))
+        self.assertEqual(1, len(os.listdir(self.tmp_dir)))
+
+
+class TestOrchestrator(unittest.TestCase):
+
+    def setUp(self):
+        self.settings = Settings()
+        self.settings.DATA_COLLECTORS = ['CACHE_HIT_RATIO']
+        self.settings.PARALLEL_EXECUTION = False
+        self.settings.N_PROCESSES = 1
+        self.settings.N_REPLICATIONS = 1
+        orchestration._scenario_cache.clear()
+
+    def tearDown(self):
+        orchestration._scenario_cache.clear()
+
+    def test_estimate_cost(self):
+        orch = orchestration.Orchestrator(self.settings)
+        base = TestRunScenario.experiment()
+        self.assertAlmostEqual(500 * math.log(6), orch.estimate_cost(base))
+        longer = TestRunScenario.experiment()
+        longer['workload']['n_measured'] = 800
+        self.assertGreater(orch.estimate_cost(longer), orch.estimate_cost(base))
+        larger = TestRunScenario.experiment()
+        larger['topology'] = {'name': 'TREE', 'k': 2, 'h': 3}
+        self.assertAlmostEqual(500 * math.log(16), orch.estimate_cost(larger))
+        costlier = TestRunScenario.experiment()
+        costlier['cache_policy']['name'] = 'IN_CACHE_LFU'
+        self.assertAlmostEqual(10 * orch.estimate_cost(base),
+                               orch.estimate_cost(costlier))
+
+    def test_estimate_cost_unknown_topology(self):
+        orch = orchestration.Orchestrator(self.settings)
+        experiment = TestRunScenario.experiment()
+        experiment['topology'] = {'name': 'ROCKET_FUEL', 'asn': -1}
+        self.assertEqual(500, orch.estimate_cost(experiment))
+
+    def test_longest_first(self):
+        queue = []
+        for n_measured in (100, 400, 200):
+            experiment = TestRunScenario.experiment()
+            experiment['workload']['n_measured'] = n_measured
+            queue.append(experiment)
+        self.settings.EXPERIMENT_QUEUE = queue
+        self.settings.N_REPLICATIONS = 2
+        orch = orchestration.Orchestrator(self.settings)
+        orch.run()
+        self.assertEqual([400, 400, 200, 200, 100, 100],
+                         [params['workload']['n_measured']
+                          for params, _ in orch.results])
+
+    def test_run_parallel(self):
+        self.settings.EXPERIMENT_QUEUE = [TestRunScenario.experiment(seed=i)
+                                          for i in range(3)]
+        self.settings.PARALLEL_EXECUTION = True
+        self.settings.N_PROCESSES = 2
+        orch = orchestration.Orchestrator(self.settings)
+        orch.run()
+        self.assertTrue(orch._done.is_set())
+        self.assertEqual(3, orch.n_success)
+        self.assertEqual(0, orch.n_fail)
+        self.assertEqual(3, len(orch.results))
+
+    def test_run_parallel_empty(self):
+        self.settings.EXPERIMENT_QUEUE = []
+        self.settings.PARALLEL_EXECUTION = True
+        orch = orchestration.Orchestrator(self.settings)
+        orch.run()
+        self.assertTrue(orch._done.is_set())
+        self.assertEqual(0, len(orch.results))
@@ -55,6 +55,26 @@ class TestUtil(unittest.TestCase):
         self.assertEqual(util.apportionment(100, [0.4, 0.21, 0.39]), [40, 21, 39])
         self.assertEqual(util.apportionment(99, [0.2, 0.7, 0.1]), [20, 69, 10])
 
+    def test_phase_timer(self):
+        timer = util.PhaseTimer()
+        with timer.phase('A') as phase:
+            phase['EVENTS'] = 10
+        with timer.phase('B'):
+            pass
+        results = timer.results()
+        self.assertEqual(['A', 'B'], [k for k in results.keys()
+                                      if k != 'PROCESS_PEAK_RSS'])
+        self.assertEqual(10, results['A']['EVENTS'])
+        self.assertGreaterEqual(results['A']['WALL_TIME'], 0)
+        self.assertGreaterEqual(results['A']['CPU_TIME'], 0)
+        self.assertNotIn('EVENTS_PER_SECOND', results['B'])
+        if util.peak_rss() is not None:
+            for name in ('A', 'B'):
+                self.assertGreaterEqual(results[name]['PEAK_RSS_INCREASE'], 0)
+            self.assertGreaterEqual(results['PROCESS_PEAK_RSS'],
+                                    results['A']['PEAK_RSS_INCREASE'] +
+                                    results['B']['PEAK_RSS_INCREASE'])
+
 class TestSettings(unittest.TestCase):
 
     def test_get_set(self):
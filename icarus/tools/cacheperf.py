@@ -621,18 +621,9 @@ def numeric_cache_hit_ratio(pdf, cache, warmup=None, measure=None, seed=None):
     if warmup is None: warmup = 10 * len(pdf)
     if measure is None: measure = 30 * len(pdf)
     z = DiscreteDist(pdf, seed)
-    for _ in range(warmup):
-        content = z.rv()
-        if not cache.get(content):
-            cache.put(content)
-    cache_hits = 0
-    for _ in range(measure):
-        content = z.rv()
-        if cache.get(content):
-            cache_hits += 1
-        else:
-            cache.put(content)
-    return cache_hits / measure
+    cache.process_batch(z.rv_many(warmup).tolist())
+    hits = cache.process_batch(z.rv_many(measure).tolist())[0]
+    return np.count_nonzero(hits) / measure
 
 
 def numeric_cache_hit_ratio_2_layers(pdf, l1_cache, l2_cache,
@@ -717,14 +708,6 @@ def trace_driven_cache_hit_ratio(workload, cache, warmup_ratio=0.25):
     if warmup_ratio < 0 or warmup_ratio > 1:
         raise ValueError("warmup_ratio must be comprised between 0 and 1")
     n = len(workload)
-    cache_hits = 0
     n_warmup = int(warmup_ratio * n)
-    n_req = 0
-    for content in workload:
-        if cache.get(content):
-            if n_req >= n_warmup:
-                cache_hits += 1
-        else:
-            cache.put(content)
-        n_req += 1
-    return cache_hits / (n - n_warmup)
+    hits = cache.process_batch(workload)[0]
+    return np.count_nonzero(hits[n_warmup:]) / (n - n_warmup)
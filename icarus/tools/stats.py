@@ -25,8 +25,22 @@ class DiscreteDist(object):
 
     The support must be a finite discrete set of contiguous integers
     {1, ..., N}. This definition of discrete distribution.
+
+    Random values are drawn in constant time using the alias method [1]_, from
+    a random number generator owned by the distribution, so that drawing
+    values does not affect, and is not affected by, the state of the `random`
+    and `numpy.random` modules.
+
+    References
+    ----------
+    .. [1] M. D. Vose, A linear algorithm for generating random numbers with a
+           given distribution, IEEE Transactions on Software Engineering, 17(9),
+           1991
     """
 
+    # Number of values drawn at once to serve calls to rv()
+    _BUFFER_SIZE = 1024
+
     def __init__(self, pdf, seed=None):
         """
         Constructor
@@ -40,11 +54,17 @@ class DiscreteDist(object):
         """
         if np.abs(sum(pdf) - 1.0) > 0.001:
             raise ValueError('The sum of pdf values must be equal to 1')
-        random.seed(seed)
+        if seed is not None and not isinstance(seed, (int, np.integer)):
+            seed = random.Random(seed).getrandbits(32)
+        self._rng = np.random.RandomState(seed)
         self._pdf = np.asarray(pdf)
         self._cdf = np.cumsum(self._pdf)
         # set last element of the CDF to 1.0 to avoid rounding errors
         self._cdf[-1] = 1.0
+        # The alias table is built the first time values are drawn
+        self._prob = None
+        self._alias = None
+        self._buffer = []
 
     def __len__(self):
         """Return the cardinality of the support
@@ -81,13 +101,63 @@ class DiscreteDist(object):
         """
         return self._cdf
 
+    def _build_alias_table(self):
+        """Build the probability and alias tables of the alias method"""
+        n = len(self._pdf)
+        prob = (self._pdf * n).tolist()
+        alias = list(range(n))
+        small = [i for i in range(n) if prob[i] < 1.0]
+        large = [i for i in range(n) if prob[i] >= 1.0]
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            alias[s] = l
+            prob[l] = (prob[l] + prob[s]) - 1.0
+            if prob[l] < 1.0:
+                small.append(l)
+            else:
+                large.append(l)
+        # Because of rounding errors, either list may not be empty
+        for i in small + large:
+            prob[i] = 1.0
+        self._prob = np.array(prob)
+        self._alias = np.array(alias, dtype=np.intp)
+
     def rv(self):
         """Get rand value from the distribution
         """
-        rv = random.random()
-        # This operation performs binary search over the CDF to return the
-        # random value. Worst case time complexity is O(log2(n))
-        return int(np.searchsorted(self._cdf, rv) + 1)
+        if not self._buffer:
+            self._buffer = self.rv_many(self._BUFFER_SIZE).tolist()
+            self._buffer.reverse()
+        return self._buffer.pop()
+
+    def rv_many(self, n, rng=None):
+        """Get an array of independent random values from the distribution
+
+        Parameters
+        ----------
+        n : int
+            The number of values
+        rng : numpy.random.RandomState, optional
+            The random number generator to use instead of the one of the
+            distribution
+
+        Returns
+        -------
+        rv : Numpy array
+            Array of *n* random values
+        """
+        if self._prob is None:
+            self._build_alias_table()
+        if rng is None:
+            rng = self._rng
+        size = len(self._pdf)
+        # A single uniform value selects both the column of the table (its
+        # integer part) and whether to take it or its alias (its fractional
+        # part)
+        u = rng.random_sample(n) * size
+        i = np.minimum(u.astype(np.intp), size - 1)
+        return np.where(u - i < self._prob[i], i, self._alias[i]) + 1
 
 
 class TruncatedZipfDist(DiscreteDist):
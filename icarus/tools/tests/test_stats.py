@@ -1,3 +1,4 @@
+from __future__ import division
 import unittest
 import collections
 
@@ -24,6 +25,35 @@ class TestDiscreteDist(unittest.TestCase):
         pdf_2 = stats.DiscreteDist(pdf_1).pdf
         self.assertTrue(all(pdf_1[i] == pdf_2[i] for i in range(len(pdf_1))))
 
+    def test_rv_many(self):
+        pdf = np.array([0.1, 0.2, 0.3, 0.4])
+        dist = stats.DiscreteDist(pdf, seed=1)
+        rv = dist.rv_many(100000)
+        self.assertEqual(100000, len(rv))
+        self.assertEqual(1, rv.min())
+        self.assertEqual(4, rv.max())
+        freq = np.bincount(rv, minlength=5)[1:] / len(rv)
+        self.assertTrue(np.allclose(pdf, freq, atol=0.01))
+
+    def test_rv(self):
+        dist = stats.DiscreteDist(np.array([0.0, 0.5, 0.0, 0.5]))
+        for _ in range(2000):
+            self.assertIn(dist.rv(), (2, 4))
+
+    def test_seed(self):
+        pdf = np.array([0.4, 0.6])
+        self.assertEqual(list(stats.DiscreteDist(pdf, seed=5).rv_many(100)),
+                         list(stats.DiscreteDist(pdf, seed=5).rv_many(100)))
+        dist_1 = stats.DiscreteDist(pdf, seed='a')
+        dist_2 = stats.DiscreteDist(pdf, seed='a')
+        self.assertEqual([dist_1.rv() for _ in range(100)],
+                         [dist_2.rv() for _ in range(100)])
+
+    def test_rv_many_rng(self):
+        dist = stats.DiscreteDist(np.array([0.4, 0.6]))
+        self.assertEqual(list(dist.rv_many(50, np.random.RandomState(3))),
+                         list(dist.rv_many(50, np.random.RandomState(3))))
+
 class TestTruncatedZipfDist(unittest.TestCase):
 
     def test_pdf_sum(self):
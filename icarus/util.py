@@ -1,11 +1,19 @@
 """Utility functions
 """
 from __future__ import division
+import os
+import sys
 import time
 import logging
+import contextlib
 import collections
 import copy
 import heapq
+try:
+	import resource
+except ImportError:
+	# Not available on Windows
+	resource = None
 
 import numpy as np
 import networkx as nx
@@ -14,6 +22,8 @@ __all__ = [
 		'Settings',
 		'AnyValue',
 		'SequenceNumber',
+		'PhaseTimer',
+		'peak_rss',
 		'config_logging',
 		'inheritdoc',
 		'timestr',
@@ -487,6 +497,100 @@ class SequenceNumber(object):
 		return self.__seq
 
 
+def peak_rss():
+	"""Return the peak resident set size of the current process
+
+	The peak is the high-water mark over the whole lifetime of the process,
+	so it never decreases. In a process running several experiments, such as
+	a worker of a process pool, it includes the peaks of all experiments run
+	so far.
+
+	Returns
+	-------
+	peak_rss : int
+		The peak resident set size in bytes, or None if it cannot be measured
+		on this platform
+	"""
+	if resource is None:
+		return None
+	rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	# ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+	return rss if sys.platform == 'darwin' else rss * 1024
+
+
+class PhaseTimer(object):
+	"""This class measures the wall-clock time, the CPU time, the event
+	throughput and the memory usage of the phases of an experiment.
+
+	Memory usage is measured from the peak resident set size of the process,
+	which is cumulative (see `peak_rss`). Each phase records, under
+	*PEAK_RSS_INCREASE*, by how much it raised the peak, which is zero if the
+	memory used by the phase stayed below an earlier peak of the process. The
+	peak of the process at the end of the last phase is recorded once, under
+	*PROCESS_PEAK_RSS*.
+
+	Examples
+	--------
+	>>> timer = PhaseTimer()
+	>>> with timer.phase('WARMUP') as phase:
+	...     phase['EVENTS'] = process(events)
+	>>> timer.results()['WARMUP']['EVENTS_PER_SECOND']
+	"""
+
+	def __init__(self):
+		"""Constructor"""
+		self.phases = collections.OrderedDict()
+		self.process_peak_rss = None
+
+	@contextlib.contextmanager
+	def phase(self, name):
+		"""Measure a phase executed in the body of a with statement
+
+		Parameters
+		----------
+		name : str
+			The name of the phase
+
+		Returns
+		-------
+		phase : dict
+			Measures of the phase. The number of events processed in the
+			phase, if any, can be stored under the *EVENTS* key to compute
+			the throughput of the phase.
+		"""
+		phase = {}
+		start_rss = peak_rss()
+		start_wall = time.time()
+		start_cpu = sum(os.times()[:2])
+		try:
+			yield phase
+		finally:
+			phase['WALL_TIME'] = time.time() - start_wall
+			phase['CPU_TIME'] = sum(os.times()[:2]) - start_cpu
+			if 'EVENTS' in phase and phase['WALL_TIME'] > 0:
+				phase['EVENTS_PER_SECOND'] = phase['EVENTS'] / phase['WALL_TIME']
+			rss = peak_rss()
+			if rss is not None:
+				phase['PEAK_RSS_INCREASE'] = max(0, rss - start_rss)
+				self.process_peak_rss = rss
+			self.phases[name] = phase
+
+	def results(self):
+		"""Return the measures of all phases
+
+		Returns
+		-------
+		results : Tree
+			Tree of the measures of each phase, keyed by phase name, and of
+			the peak resident set size of the process, keyed by
+			*PROCESS_PEAK_RSS*, if it can be measured
+		"""
+		results = Tree({name: dict(phase) for name, phase in self.phases.items()})
+		if self.process_peak_rss is not None:
+			results['PROCESS_PEAK_RSS'] = self.process_peak_rss
+		return results
+
+
 def config_logging(log_level='INFO'):
 	"""Configure logging level
 